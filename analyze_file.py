@@ -6,7 +6,7 @@ Usage: python analyze_file.py <filename>
 
 import sys
 import os
-from simple_pr_review import analyze_file, calculate_score, generate_feedback, SimplePRInfo, display_results
+from simple_pr_review import analyze_file, read_source, count_lines, calculate_score, generate_feedback, SimplePRInfo, display_results
 
 def main():
     if len(sys.argv) != 2:
@@ -28,11 +28,11 @@ def main():
     
     try:
         # Read the file
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = read_source(filename)
         
         # Analyze the file
         issues = analyze_file(filename, content)
+        total_lines, non_empty_lines = count_lines(content)
         
         # Create mock PR info
         pr_info = SimplePRInfo(
@@ -40,7 +40,7 @@ def main():
             title=f"Analysis of {filename}",
             author="local_user",
             files_changed=[filename],
-            additions=len(content.split('\n')),
+            additions=total_lines,
             deletions=0
         )
         
@@ -51,10 +51,9 @@ def main():
         display_results(feedback)
         
         # Show file statistics
-        lines = content.split('\n')
         print(f"📊 File Statistics:")
-        print(f"   • Total lines: {len(lines)}")
-        print(f"   • Non-empty lines: {len([l for l in lines if l.strip()])}")
+        print(f"   • Total lines: {total_lines}")
+        print(f"   • Non-empty lines: {non_empty_lines}")
         print(f"   • Issues found: {len(issues)}")
         print(f"   • Quality score: {feedback.overall_score:.1f}/10")
         
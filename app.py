@@ -4,19 +4,132 @@ PR Review Agent - Web Application
 A beautiful web-based code review tool that can be hosted online
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 import os
 import json
+from collections import deque
 from datetime import datetime
-from simple_pr_review import analyze_file, calculate_score, generate_feedback, SimplePRInfo, display_results
-import tempfile
+from functools import lru_cache
+from itertools import islice
+from simple_pr_review import analyze_file, analyze_files, calculate_score, generate_feedback, SimplePRInfo, display_results
+import time
 import uuid
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, jsonify falls back to the stdlib encoder
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes responses with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
 app.secret_key = 'pr-review-agent-secret-key'
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Store analysis history in memory (in production, use a database).
+# The deque drops the oldest analyses once full; the index gives exports an
+# O(1) lookup by id and is kept in step with the deque.
+MAX_HISTORY = 1000
+analysis_history = deque(maxlen=MAX_HISTORY)
+_history_index = {}
+
+def record_analysis(analysis_data):
+    """Append an analysis to the history, evicting the oldest when full"""
+    if len(analysis_history) == analysis_history.maxlen:
+        _history_index.pop(analysis_history[0]['id'], None)
+    analysis_history.append(analysis_data)
+    _history_index[analysis_data['id']] = analysis_data
+
+@lru_cache(maxsize=64)
+def _iso_second(seconds):
+    return datetime.fromtimestamp(seconds).isoformat()
+
+def current_timestamp():
+    """Same string as datetime.now().isoformat(), formatting each second only once"""
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    micros = nanos // 1000
+    prefix = _iso_second(seconds)
+    return f"{prefix}.{micros:06d}" if micros else prefix
+
+def issue_dicts(issues):
+    """Serialize issues to the dicts stored in history and sent to clients"""
+    return [
+        {
+            'file_path': issue.file_path,
+            'line_number': issue.line_number,
+            'severity': issue.severity,
+            'category': issue.category,
+            'message': issue.message,
+            'suggestion': issue.suggestion
+        } for issue in issues
+    ]
+
+# The demo input never changes, so analyze it once at import and only stamp
+# a fresh id and timestamp per request
+DEMO_CODE = '''def authenticate_user(username, password):
+    # TODO: Add rate limiting
+    print(f"Authenticating user: {username}")
+    user_password = "admin123"  # Hardcoded password
+    if password == user_password:
+        return True
+    return False
+
+def create_session(user_id):
+    # This is a very long line that exceeds the recommended line length
+    session = Session(user_id=user_id, created_at=datetime.now())
+    return session
+
+def process_payment(amount):
+    try:
+        # Process payment
+        result = payment_gateway.charge(amount)
+        return result
+    except:  # Bare except clause
+        return None'''
+
+def _build_demo_payload():
+    issues = analyze_file("demo.py", DEMO_CODE)
+    line_count = DEMO_CODE.count('\n') + 1
+    pr_info = SimplePRInfo(
+        number=123,
+        title="Demo: Add user authentication feature",
+        author="demo_user",
+        files_changed=["demo.py"],
+        additions=line_count,
+        deletions=0
+    )
+    feedback = generate_feedback(issues, pr_info)
+    
+    analysis = {
+        'score': feedback.overall_score,
+        'issues_count': len(feedback.issues),
+        'issues': issue_dicts(feedback.issues),
+        'suggestions': feedback.suggestions,
+        'strengths': feedback.strengths,
+        'summary': feedback.summary
+    }
+    response = {
+        **analysis,
+        'file_stats': {
+            'lines': line_count,
+            'filename': 'demo.py'
+        }
+    }
+    return analysis, response
 
-# Store analysis history in memory (in production, use a database)
-analysis_history = []
+_DEMO_ANALYSIS, _DEMO_RESPONSE = _build_demo_payload()
 
 @app.route('/')
 def index():
@@ -27,15 +140,20 @@ def index():
 def analyze_code():
     """API endpoint to analyze code"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Expected a JSON object'}), 400
         code = data.get('code', '')
         filename = data.get('filename', 'main.py')
         
-        if not code.strip():
+        if not isinstance(code, str) or not code or code.isspace():
             return jsonify({'error': 'No code provided'}), 400
+        if not isinstance(filename, str):
+            return jsonify({'error': 'filename must be a string'}), 400
         
         # Analyze the code
-        issues = analyze_file(filename, content)
+        issues = analyze_file(filename, code)
+        line_count = code.count('\n') + 1
         
         # Create PR info
         pr_info = SimplePRInfo(
@@ -43,7 +161,7 @@ def analyze_code():
             title=f"Analysis of {filename}",
             author="web_user",
             files_changed=[filename],
-            additions=len(code.split('\n')),
+            additions=line_count,
             deletions=0
         )
         
@@ -54,26 +172,17 @@ def analyze_code():
         analysis_id = str(uuid.uuid4())
         analysis_data = {
             'id': analysis_id,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': current_timestamp(),
             'filename': filename,
             'score': feedback.overall_score,
             'issues_count': len(feedback.issues),
-            'issues': [
-                {
-                    'file_path': issue.file_path,
-                    'line_number': issue.line_number,
-                    'severity': issue.severity,
-                    'category': issue.category,
-                    'message': issue.message,
-                    'suggestion': issue.suggestion
-                } for issue in feedback.issues
-            ],
+            'issues': issue_dicts(feedback.issues),
             'suggestions': feedback.suggestions,
             'strengths': feedback.strengths,
             'summary': feedback.summary
         }
         
-        analysis_history.append(analysis_data)
+        record_analysis(analysis_data)
         
         return jsonify({
             'success': True,
@@ -85,7 +194,7 @@ def analyze_code():
             'strengths': feedback.strengths,
             'summary': feedback.summary,
             'file_stats': {
-                'lines': len(code.split('\n')),
+                'lines': line_count,
                 'filename': filename
             }
         })
@@ -93,42 +202,36 @@ def analyze_code():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/demo', methods=['POST'])
-def run_demo():
-    """API endpoint to run demo analysis"""
+@app.route('/api/analyze_batch', methods=['POST'])
+def analyze_batch():
+    """API endpoint to analyze several files as one change set"""
     try:
-        # Demo code
-        demo_code = '''def authenticate_user(username, password):
-    # TODO: Add rate limiting
-    print(f"Authenticating user: {username}")
-    user_password = "admin123"  # Hardcoded password
-    if password == user_password:
-        return True
-    return False
-
-def create_session(user_id):
-    # This is a very long line that exceeds the recommended line length
-    session = Session(user_id=user_id, created_at=datetime.now())
-    return session
-
-def process_payment(amount):
-    try:
-        # Process payment
-        result = payment_gateway.charge(amount)
-        return result
-    except:  # Bare except clause
-        return None'''
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Expected a JSON object'}), 400
+        files = data.get('files') or {}
+        if not isinstance(files, dict):
+            return jsonify({'error': 'files must map file names to code'}), 400
+        files = {
+            filename: code for filename, code in files.items()
+            if isinstance(code, str) and code and not code.isspace()
+        }
+        
+        if not files:
+            return jsonify({'error': 'No code provided'}), 400
         
-        # Analyze demo code
-        issues = analyze_file("demo.py", demo_code)
+        # Analyze the files, in parallel when the batch is large enough
+        results = analyze_files(files)
+        issues = [issue for file_issues in results.values() for issue in file_issues]
+        line_count = sum(code.count('\n') + 1 for code in files.values())
         
         # Create PR info
         pr_info = SimplePRInfo(
-            number=123,
-            title="Demo: Add user authentication feature",
-            author="demo_user",
-            files_changed=["demo.py"],
-            additions=len(demo_code.split('\n')),
+            number=1,
+            title=f"Analysis of {len(files)} files",
+            author="web_user",
+            files_changed=list(files),
+            additions=line_count,
             deletions=0
         )
         
@@ -139,26 +242,17 @@ def process_payment(amount):
         analysis_id = str(uuid.uuid4())
         analysis_data = {
             'id': analysis_id,
-            'timestamp': datetime.now().isoformat(),
-            'filename': 'demo.py',
+            'timestamp': current_timestamp(),
+            'filename': ', '.join(files),
             'score': feedback.overall_score,
             'issues_count': len(feedback.issues),
-            'issues': [
-                {
-                    'file_path': issue.file_path,
-                    'line_number': issue.line_number,
-                    'severity': issue.severity,
-                    'category': issue.category,
-                    'message': issue.message,
-                    'suggestion': issue.suggestion
-                } for issue in feedback.issues
-            ],
+            'issues': issue_dicts(feedback.issues),
             'suggestions': feedback.suggestions,
             'strengths': feedback.strengths,
             'summary': feedback.summary
         }
         
-        analysis_history.append(analysis_data)
+        record_analysis(analysis_data)
         
         return jsonify({
             'success': True,
@@ -170,33 +264,49 @@ def process_payment(amount):
             'strengths': feedback.strengths,
             'summary': feedback.summary,
             'file_stats': {
-                'lines': len(demo_code.split('\n')),
-                'filename': 'demo.py'
+                'lines': line_count,
+                'files': len(files)
             }
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/demo', methods=['POST'])
+def run_demo():
+    """API endpoint to run demo analysis"""
+    try:
+        # Store in history
+        analysis_id = str(uuid.uuid4())
+        analysis_data = {
+            'id': analysis_id,
+            'timestamp': current_timestamp(),
+            'filename': 'demo.py',
+            **_DEMO_ANALYSIS
+        }
+        
+        record_analysis(analysis_data)
+        
+        return jsonify({
+            'success': True,
+            'analysis_id': analysis_id,
+            **_DEMO_RESPONSE
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/history')
 def get_history():
     """Get analysis history"""
     return jsonify({
         'success': True,
-        'history': analysis_history[-10:]  # Last 10 analyses
+        'history': list(islice(analysis_history, max(len(analysis_history) - 10, 0), None))  # Last 10 analyses
     })
 
-@app.route('/api/export/<analysis_id>')
-def export_analysis(analysis_id):
-    """Export analysis as text file"""
-    try:
-        # Find analysis
-        analysis = next((a for a in analysis_history if a['id'] == analysis_id), None)
-        if not analysis:
-            return jsonify({'error': 'Analysis not found'}), 404
-        
-        # Create report content
-        report = f"""PR Review Agent - Analysis Report
+def render_report(analysis):
+    """Yield the text export of an analysis chunk by chunk"""
+    yield f"""PR Review Agent - Analysis Report
 {'='*50}
 
 Generated: {analysis['timestamp']}
@@ -208,30 +318,39 @@ SUMMARY:
 
 ISSUES FOUND ({analysis['issues_count']}):
 """
+    
+    for i, issue in enumerate(analysis['issues'], 1):
+        yield f"{i}. {issue['severity'].upper()} - {issue['file_path']}:{issue['line_number']}\n"
+        yield f"   {issue['message']}\n"
+        if issue['suggestion']:
+            yield f"   Suggestion: {issue['suggestion']}\n"
+        yield "\n"
+    
+    if analysis['suggestions']:
+        yield "SUGGESTIONS:\n"
+        for i, suggestion in enumerate(analysis['suggestions'], 1):
+            yield f"{i}. {suggestion}\n"
+    
+    if analysis['strengths']:
+        yield "\nSTRENGTHS:\n"
+        for strength in analysis['strengths']:
+            yield f"• {strength}\n"
+
+@app.route('/api/export/<analysis_id>')
+def export_analysis(analysis_id):
+    """Export analysis as text file"""
+    try:
+        # Find analysis
+        analysis = _history_index.get(analysis_id)
+        if not analysis:
+            return jsonify({'error': 'Analysis not found'}), 404
         
-        for i, issue in enumerate(analysis['issues'], 1):
-            report += f"{i}. {issue['severity'].upper()} - {issue['file_path']}:{issue['line_number']}\n"
-            report += f"   {issue['message']}\n"
-            if issue['suggestion']:
-                report += f"   Suggestion: {issue['suggestion']}\n"
-            report += "\n"
-        
-        if analysis['suggestions']:
-            report += "SUGGESTIONS:\n"
-            for i, suggestion in enumerate(analysis['suggestions'], 1):
-                report += f"{i}. {suggestion}\n"
-        
-        if analysis['strengths']:
-            report += "\nSTRENGTHS:\n"
-            for strength in analysis['strengths']:
-                report += f"• {strength}\n"
-        
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write(report)
-            temp_path = f.name
-        
-        return send_file(temp_path, as_attachment=True, download_name=f"analysis_{analysis_id}.txt")
+        # Sent as it is rendered, so a long report is never held whole in memory
+        return Response(
+            stream_with_context(render_report(analysis)),
+            mimetype='text/plain',
+            headers={'Content-Disposition': f'attachment; filename=analysis_{analysis_id}.txt'}
+        )
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
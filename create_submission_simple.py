@@ -6,7 +6,33 @@ Simple version without emoji characters
 
 import os
 import zipfile
-import shutil
+
+# Files/folders to exclude, matched against every name in the tree
+EXCLUDE_NAMES = frozenset({
+    '__pycache__',
+    '.pytest_cache',
+    '.coverage',
+    'htmlcov',
+    '.tox',
+    '.venv',
+    'venv',
+    'env',
+    '.env',
+    'node_modules',
+    '.git',
+    '.gitignore',
+    '.DS_Store',
+    'Thumbs.db',
+    '.vscode',
+    '.idea',
+    'dist',
+    'build'
+})
+EXCLUDE_SUFFIXES = ('.pyc', '.pyo', '.pyd', '.log', '.tmp', '.temp', '.egg-info')
+
+def is_excluded(name):
+    """Check a file or directory name against the exclusion lists"""
+    return name in EXCLUDE_NAMES or name.endswith(EXCLUDE_SUFFIXES)
 
 def create_submission():
     """Create a clean submission package"""
@@ -48,61 +74,33 @@ def create_submission():
         'env.example'
     ]
     
-    # Files/folders to exclude
-    exclude_patterns = [
-        '__pycache__',
-        '*.pyc',
-        '*.pyo',
-        '*.pyd',
-        '.pytest_cache',
-        '.coverage',
-        'htmlcov',
-        '.tox',
-        '.venv',
-        'venv',
-        'env',
-        '.env',
-        'node_modules',
-        '.git',
-        '.gitignore',
-        '.DS_Store',
-        'Thumbs.db',
-        '*.log',
-        '*.tmp',
-        '*.temp',
-        '.vscode',
-        '.idea',
-        '*.egg-info',
-        'dist',
-        'build'
-    ]
-    
-    # Create submission directory
-    submission_dir = 'pr_review_agent_submission'
-    if os.path.exists(submission_dir):
-        shutil.rmtree(submission_dir)
-    os.makedirs(submission_dir)
-    
-    print(f"Creating submission directory: {submission_dir}")
+    # Create the zip file directly from the source tree
+    zip_filename = 'pr_review_agent_submission.zip'
+    print(f"Creating zip file: {zip_filename}")
     
-    # Copy files
     copied_files = []
-    for item in include_files:
-        if os.path.exists(item):
-            if os.path.isfile(item):
-                shutil.copy2(item, submission_dir)
-                copied_files.append(item)
-                print(f"Copied file: {item}")
-            elif os.path.isdir(item):
-                dest_dir = os.path.join(submission_dir, item)
-                shutil.copytree(item, dest_dir, ignore=shutil.ignore_patterns(*exclude_patterns))
-                copied_files.append(item)
-                print(f"Copied directory: {item}")
-        else:
-            print(f"File not found: {item}")
-    
-    # Create a simple README for submission
-    submission_readme = """# PR Review Agent - CodeMate Submission
+    with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for item in include_files:
+            if os.path.exists(item):
+                if os.path.isfile(item):
+                    zipf.write(item, os.path.basename(item))
+                    copied_files.append(item)
+                    print(f"Copied file: {item}")
+                elif os.path.isdir(item):
+                    for root, dirs, files in os.walk(item, followlinks=True):
+                        # Prune excluded directories so they are never descended into
+                        dirs[:] = [d for d in dirs if not is_excluded(d)]
+                        for file in files:
+                            if not is_excluded(file):
+                                file_path = os.path.join(root, file)
+                                zipf.write(file_path, os.path.normpath(file_path))
+                    copied_files.append(item)
+                    print(f"Copied directory: {item}")
+            else:
+                print(f"File not found: {item}")
+        
+        # Create a simple README for submission
+        submission_readme = """# PR Review Agent - CodeMate Submission
 
 ## Quick Start
 
@@ -160,27 +158,12 @@ This is a complete PR Review Agent implementation with web interface,
 desktop GUI, and comprehensive code analysis capabilities.
 """
     
-    with open(os.path.join(submission_dir, 'SUBMISSION_README.md'), 'w', encoding='utf-8') as f:
-        f.write(submission_readme)
-    
-    # Create zip file
-    zip_filename = 'pr_review_agent_submission.zip'
-    print(f"Creating zip file: {zip_filename}")
-    
-    with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(submission_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, submission_dir)
-                zipf.write(file_path, arcname)
+        zipf.writestr('SUBMISSION_README.md', submission_readme)
     
     print(f"Submission package created: {zip_filename}")
     print(f"Total files included: {len(copied_files)}")
     print(f"Package size: {os.path.getsize(zip_filename) / 1024:.1f} KB")
     
-    # Clean up
-    shutil.rmtree(submission_dir)
-    
     print("\nReady for CodeMate IDE submission!")
     print(f"Upload: {zip_filename}")
 
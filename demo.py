@@ -6,14 +6,26 @@ This shows how the system works without requiring external API tokens
 
 import os
 import sys
+from bisect import bisect_right
+from collections import Counter
 from datetime import datetime
+from itertools import accumulate, compress, count
 from typing import List, Dict, Any
 
 # Add the current directory to Python path so we can import our modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Substrings the per-line rules look for, lowercased. Finding them in the
+# lowercased buffer gives a superset of the lines the rules can fire on.
+_RULE_TRIGGERS = ("print(", "password", "todo", "fixme")
+
+# Score penalty per issue of each severity
+SEVERITY_PENALTIES = {"critical": 2.0, "high": 1.0, "medium": 0.5, "low": 0.1}
+
 # Simple mock classes to demonstrate the functionality
 class MockCodeIssue:
+    __slots__ = ('file_path', 'line_number', 'severity', 'category', 'message', 'suggestion')
+    
     def __init__(self, file_path: str, line_number: int, severity: str, category: str, message: str, suggestion: str = ""):
         self.file_path = file_path
         self.line_number = line_number
@@ -23,6 +35,8 @@ class MockCodeIssue:
         self.suggestion = suggestion
 
 class MockPRInfo:
+    __slots__ = ('number', 'title', 'author', 'files_changed', 'additions', 'deletions')
+    
     def __init__(self, number: int, title: str, author: str, files_changed: List[str], additions: int, deletions: int):
         self.number = number
         self.title = title
@@ -45,36 +59,63 @@ class SimpleCodeAnalyzer:
     def analyze(self, file_path: str, content: str) -> List[MockCodeIssue]:
         issues = []
         lines = content.split('\n')
+        # Lowercase the whole buffer once; the rules and the trigger search
+        # both work on these lines instead of lowering line by line
+        content_lower = content.lower()
+        lines_lower = content_lower.split('\n')
+        # Line offsets within content_lower. lower() can turn one character
+        # into two, so they are not always the offsets within content.
+        line_starts = list(accumulate(map((1).__add__, map(len, lines_lower)), initial=0))
+        
+        # Only lines that contain a rule trigger or are too long can produce
+        # issues, so locate those with C-level searches over the whole buffer
+        # instead of running every rule on every line. compress/map keep
+        # the line length check out of the interpreter loop as well.
+        candidates = set(compress(count(1), map((100).__lt__, map(len, lines))))
+        for trigger in _RULE_TRIGGERS:
+            pos = content_lower.find(trigger)
+            while pos != -1:
+                line_number = bisect_right(line_starts, pos)
+                candidates.add(line_number)
+                # One hit per line is enough, resume on the next line
+                pos = content_lower.find(trigger, line_starts[line_number])
+        
+        for i in sorted(candidates):
+            issues.extend(self._check_line(file_path, i, lines[i - 1], lines_lower[i - 1]))
+        
+        return issues
+
+    def _check_line(self, file_path: str, i: int, line: str, line_lower: str) -> List[MockCodeIssue]:
+        issues = []
+        
+        # Check for common issues
+        if 'print(' in line and 'debug' not in line_lower:
+            issues.append(MockCodeIssue(
+                file_path, i, "low", "readability",
+                "Debug print statement found",
+                "Remove or replace with proper logging"
+            ))
         
-        for i, line in enumerate(lines, 1):
-            # Check for common issues
-            if 'print(' in line and 'debug' not in line.lower():
-                issues.append(MockCodeIssue(
-                    file_path, i, "low", "readability",
-                    "Debug print statement found",
-                    "Remove or replace with proper logging"
-                ))
-            
-            if 'password' in line.lower() and '=' in line:
-                issues.append(MockCodeIssue(
-                    file_path, i, "high", "security",
-                    "Potential hardcoded password",
-                    "Use environment variables for sensitive data"
-                ))
-            
-            if len(line) > 100:
-                issues.append(MockCodeIssue(
-                    file_path, i, "medium", "style",
-                    "Line too long",
-                    "Break long lines for better readability"
-                ))
-            
-            if 'TODO' in line or 'FIXME' in line:
-                issues.append(MockCodeIssue(
-                    file_path, i, "low", "maintainability",
-                    "TODO/FIXME comment found",
-                    "Address pending tasks before merging"
-                ))
+        if 'password' in line_lower and '=' in line:
+            issues.append(MockCodeIssue(
+                file_path, i, "high", "security",
+                "Potential hardcoded password",
+                "Use environment variables for sensitive data"
+            ))
+        
+        if len(line) > 100:
+            issues.append(MockCodeIssue(
+                file_path, i, "medium", "style",
+                "Line too long",
+                "Break long lines for better readability"
+            ))
+        
+        if 'TODO' in line or 'FIXME' in line:
+            issues.append(MockCodeIssue(
+                file_path, i, "low", "maintainability",
+                "TODO/FIXME comment found",
+                "Address pending tasks before merging"
+            ))
         
         return issues
 
@@ -84,17 +125,10 @@ def calculate_score(issues: List[MockCodeIssue]) -> float:
         return 10.0
     
     base_score = 10.0
-    penalty = 0
-    
-    for issue in issues:
-        if issue.severity == "critical":
-            penalty += 2.0
-        elif issue.severity == "high":
-            penalty += 1.0
-        elif issue.severity == "medium":
-            penalty += 0.5
-        elif issue.severity == "low":
-            penalty += 0.1
+    # Tally severities in one C-level pass, then weight the handful of counts
+    severity_counts = Counter(issue.severity for issue in issues)
+    penalty = sum(SEVERITY_PENALTIES.get(severity, 0.0) * count
+                  for severity, count in severity_counts.items())
     
     return max(0.0, base_score - penalty)
 
@@ -108,9 +142,7 @@ def generate_feedback(issues: List[MockCodeIssue], pr_info: MockPRInfo) -> MockR
     if not issues:
         summary = f"✅ Excellent work! No issues found in this {pr_info.additions + pr_info.deletions} line change across {len(pr_info.files_changed)} files."
     else:
-        severity_counts = {}
-        for issue in issues:
-            severity_counts[issue.severity] = severity_counts.get(issue.severity, 0) + 1
+        severity_counts = Counter(issue.severity for issue in issues)
         
         summary_parts = [f"Found {len(issues)} issues in {len(pr_info.files_changed)} files:"]
         for severity in ["critical", "high", "medium", "low"]:
@@ -121,17 +153,25 @@ def generate_feedback(issues: List[MockCodeIssue], pr_info: MockPRInfo) -> MockR
         summary = " ".join(summary_parts)
     
     # Extract suggestions
-    suggestions = list(set([issue.suggestion for issue in issues if issue.suggestion]))
+    # Deduplicate while keeping first-seen order so output is stable
+    suggestions = list(dict.fromkeys(issue.suggestion for issue in issues if issue.suggestion))
+    
+    # Identify strengths, checking the file list in a single pass
+    has_tests = has_docs = False
+    for f in pr_info.files_changed:
+        has_tests = has_tests or 'test' in f.lower()
+        has_docs = has_docs or f.endswith('.md')
+        if has_tests and has_docs:
+            break
     
-    # Identify strengths
     strengths = []
     if pr_info.additions > 0 and pr_info.deletions > 0:
         strengths.append("Good balance of additions and deletions")
     if len(pr_info.files_changed) <= 10:
         strengths.append("Focused changes across reasonable number of files")
-    if any('test' in f.lower() for f in pr_info.files_changed):
+    if has_tests:
         strengths.append("Includes test updates")
-    if any(f.endswith('.md') for f in pr_info.files_changed):
+    if has_docs:
         strengths.append("Includes documentation updates")
     
     return MockReviewFeedback(score, summary, issues, suggestions, strengths)
@@ -3,19 +3,43 @@
 Deployment script for PR Review Agent Web App
 """
 
+import hashlib
 import os
 import subprocess
 import sys
 
+REQUIREMENTS_FILE = "requirements_web.txt"
+DEPLOY_CACHE_FILE = ".deploy_cache"
+
+def requirements_fingerprint():
+    """Hash the requirements together with the interpreter they are installed into"""
+    with open(REQUIREMENTS_FILE, 'rb') as f:
+        digest = hashlib.blake2b(f.read(), digest_size=16)
+    digest.update(sys.executable.encode())
+    digest.update(sys.version.encode())
+    return digest.hexdigest()
+
 def install_requirements():
-    """Install required packages"""
+    """Install required packages, skipping pip when nothing has changed"""
+    fingerprint = requirements_fingerprint()
+    try:
+        with open(DEPLOY_CACHE_FILE) as f:
+            if f.read().strip() == fingerprint:
+                print("✅ Requirements already installed")
+                return True
+    except OSError:
+        pass
+    
     print("📦 Installing requirements...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements_web.txt"])
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", REQUIREMENTS_FILE])
         print("✅ Requirements installed successfully")
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to install requirements: {e}")
         return False
+    
+    with open(DEPLOY_CACHE_FILE, 'w') as f:
+        f.write(fingerprint)
     return True
 
 def create_directories():
@@ -1,68 +1,87 @@
 """Example of creating a custom analyzer."""
 
+from pr_review_agent.analyzers import CachedAnalyzerMixin
 from pr_review_agent.analyzers.base import CodeAnalyzer
 from pr_review_agent.core.models import CodeIssue, AnalysisConfig, IssueSeverity, IssueCategory
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 import re
 
 
-class CustomAnalyzer(CodeAnalyzer):
+class CustomAnalyzer(CachedAnalyzerMixin, CodeAnalyzer):
     """Custom analyzer for specific business rules."""
     
     def __init__(self, config: AnalysisConfig):
         super().__init__(config)
-        # Define custom patterns to check
+        # Define custom patterns to check. They are matched against the whole
+        # file, so whitespace classes exclude newlines to stay within a line.
         self.patterns = {
-            'hardcoded_password': r'password\s*=\s*["\'][^"\']+["\']',
-            'debug_print': r'print\s*\(',
-            'todo_comment': r'#\s*TODO',
-            'long_function': r'def\s+\w+\([^)]*\):\s*$'
+            'hardcoded_password': r'password[^\S\n]*=[^\S\n]*["\'][^"\'\n]+["\']',
+            'debug_print': r'print[^\S\n]*\(',
+            'todo_comment': r'#[^\S\n]*TODO',
+            'long_function': r'def[^\S\n]+\w+\([^)\n]*\):[^\S\n]*$'
         }
+        # Compile once so the scans skip the re module's cache lookup. MULTILINE
+        # lets '$' anchor at each line end rather than only the end of the file.
+        self.compiled_patterns = {
+            name: re.compile(pattern, re.MULTILINE | (re.IGNORECASE if name == 'hardcoded_password' else 0))
+            for name, pattern in self.patterns.items()
+        }
+        # Literal every match of a case-sensitive pattern must contain. When it
+        # is absent from the file, the regex scan is skipped altogether.
+        self.required_literals = {
+            'debug_print': 'print',
+            'todo_comment': 'TODO',
+            'long_function': 'def',
+        }
+        # Case-insensitive patterns are pre-filtered on an ASCII-lowercased byte
+        # copy of the file, which is much cheaper than an IGNORECASE scan. Only
+        # lines containing the literal are then matched, case-sensitively.
+        self.folded_literals = {
+            'hardcoded_password': b'password',
+        }
+        self.folded_patterns = {
+            name: re.compile(self.patterns[name]) for name in self.folded_literals
+        }
+        # Issue reported for each pattern, in the order they are listed for a line
+        self.rules = [
+            ('hardcoded_password', IssueSeverity.HIGH, IssueCategory.SECURITY,
+             "Hardcoded password detected", "custom-hardcoded-password",
+             "Use environment variables or secure configuration"),
+            ('debug_print', IssueSeverity.LOW, IssueCategory.READABILITY,
+             "Debug print statement found", "custom-debug-print",
+             "Remove or replace with proper logging"),
+            ('todo_comment', IssueSeverity.LOW, IssueCategory.MAINTAINABILITY,
+             "TODO comment found", "custom-todo",
+             "Consider addressing TODO items before merging"),
+        ]
     
     def analyze(self, file_path: str, content: str) -> List[CodeIssue]:
         """Analyze file for custom patterns."""
         if not self.should_analyze(file_path):
             return []
         
-        issues = []
-        lines = content.split('\n')
+        return self._cached_analyze(file_path, content, self._find_issues)
+    
+    def _find_issues(self, file_path: str, content: str) -> List[CodeIssue]:
+        """Match every rule against the file content."""
+        # Scan the whole buffer once per rule and report each rule at most
+        # once per line, ordered by line and then by rule
+        hits = set()
+        for rule_index, (name, *_) in enumerate(self.rules):
+            hits.update((line_num, rule_index) for line_num in self._matching_lines(name, content))
         
-        for line_num, line in enumerate(lines, 1):
-            # Check for hardcoded passwords
-            if re.search(self.patterns['hardcoded_password'], line, re.IGNORECASE):
-                issues.append(CodeIssue(
-                    file_path=file_path,
-                    line_number=line_num,
-                    severity=IssueSeverity.HIGH,
-                    category=IssueCategory.SECURITY,
-                    message="Hardcoded password detected",
-                    rule_id="custom-hardcoded-password",
-                    suggestion="Use environment variables or secure configuration"
-                ))
-            
-            # Check for debug prints
-            if re.search(self.patterns['debug_print'], line):
-                issues.append(CodeIssue(
-                    file_path=file_path,
-                    line_number=line_num,
-                    severity=IssueSeverity.LOW,
-                    category=IssueCategory.READABILITY,
-                    message="Debug print statement found",
-                    rule_id="custom-debug-print",
-                    suggestion="Remove or replace with proper logging"
-                ))
-            
-            # Check for TODO comments
-            if re.search(self.patterns['todo_comment'], line):
-                issues.append(CodeIssue(
-                    file_path=file_path,
-                    line_number=line_num,
-                    severity=IssueSeverity.LOW,
-                    category=IssueCategory.MAINTAINABILITY,
-                    message="TODO comment found",
-                    rule_id="custom-todo",
-                    suggestion="Consider addressing TODO items before merging"
-                ))
+        issues = []
+        for line_num, rule_index in sorted(hits):
+            _, severity, category, message, rule_id, suggestion = self.rules[rule_index]
+            issues.append(CodeIssue(
+                file_path=file_path,
+                line_number=line_num,
+                severity=severity,
+                category=category,
+                message=message,
+                rule_id=rule_id,
+                suggestion=suggestion
+            ))
         
         return issues
     
@@ -76,12 +95,63 @@ class CustomAnalyzer(CodeAnalyzer):
     
     def get_metrics(self, file_path: str, content: str) -> Dict[str, Any]:
         """Get custom metrics."""
-        lines = content.split('\n')
         return {
-            'total_lines': len(lines),
-            'todo_count': len([l for l in lines if re.search(self.patterns['todo_comment'], l)]),
-            'debug_prints': len([l for l in lines if re.search(self.patterns['debug_print'], l)])
+            'total_lines': content.count('\n') + 1,
+            'todo_count': len(set(self._matching_lines('todo_comment', content))),
+            'debug_prints': len(set(self._matching_lines('debug_print', content)))
+        }
+    
+    def analyze_with_metrics(self, file_path: str, content: str) -> Tuple[List[CodeIssue], Dict[str, Any]]:
+        """Analyze file and derive the TODO and print counts from its issues."""
+        if not self.should_analyze(file_path):
+            return [], self.get_metrics(file_path, content)
+        
+        # Each rule is reported at most once per line, so counting issues by
+        # rule gives the same numbers as get_metrics without rescanning
+        issues = self.analyze(file_path, content)
+        rule_ids = [issue.rule_id for issue in issues]
+        return issues, {
+            'total_lines': content.count('\n') + 1,
+            'todo_count': rule_ids.count('custom-todo'),
+            'debug_prints': rule_ids.count('custom-debug-print')
         }
+    
+    def _matching_lines(self, name: str, content: str) -> Iterator[int]:
+        """Yield the line number of every match of a pattern, in order."""
+        if name in self.folded_literals:
+            data = content.encode('utf-8', 'surrogatepass').lower()
+            # U+017F (long s) also matches 's' under IGNORECASE
+            if b'\xc5\xbf' not in data:
+                yield from self._folded_matching_lines(name, data)
+                return
+        
+        literal = self.required_literals.get(name)
+        if literal is not None and literal not in content:
+            return
+        
+        line_num, last_pos = 1, 0
+        for match in self.compiled_patterns[name].finditer(content):
+            line_num += content.count('\n', last_pos, match.start())
+            last_pos = match.start()
+            yield line_num
+    
+    def _folded_matching_lines(self, name: str, data: bytes) -> Iterator[int]:
+        """Yield each line of lowercased UTF-8 data where a folded pattern matches."""
+        literal = self.folded_literals[name]
+        pattern = self.folded_patterns[name]
+        
+        line_num, last_pos = 1, 0
+        pos = data.find(literal)
+        while pos != -1:
+            line_num += data.count(b'\n', last_pos, pos)
+            start = data.rfind(b'\n', 0, pos) + 1
+            end = data.find(b'\n', pos)
+            if end == -1:
+                end = len(data)
+            if pattern.search(data[start:end].decode('utf-8', 'surrogatepass')):
+                yield line_num
+            last_pos = end
+            pos = data.find(literal, end)
 
 
 def main():
@@ -103,7 +173,7 @@ def main():
     
     # Add custom analyzer
     custom_analyzer = CustomAnalyzer(config)
-    agent.analyzers.append(custom_analyzer)
+    agent.register(custom_analyzer)
     
     # Test with sample code
     sample_code = '''
@@ -6,7 +6,7 @@ Run this to get a guided experience
 
 import os
 import sys
-from simple_pr_review import analyze_file, calculate_score, generate_feedback, SimplePRInfo, display_results
+from simple_pr_review import analyze_file, analyze_files, read_source, count_lines, calculate_score, generate_feedback, SimplePRInfo, display_results
 
 def get_user_input():
     """Get input from user"""
@@ -70,8 +70,7 @@ class User:
     
     # Analyze files
     all_issues = []
-    for file_path, content in file_contents.items():
-        issues = analyze_file(file_path, content)
+    for file_path, issues in analyze_files(file_contents).items():
         all_issues.extend(issues)
         print(f"📄 Analyzed {file_path}: {len(issues)} issues found")
     
@@ -88,11 +87,11 @@ def analyze_single_file(filename):
     
     try:
         # Read file
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = read_source(filename)
         
         # Analyze
         issues = analyze_file(filename, content)
+        total_lines, non_empty_lines = count_lines(content)
         
         # Create PR info
         pr_info = SimplePRInfo(
@@ -100,7 +99,7 @@ def analyze_single_file(filename):
             title=f"Analysis of {filename}",
             author="local_user",
             files_changed=[filename],
-            additions=len(content.split('\n')),
+            additions=total_lines,
             deletions=0
         )
         
@@ -111,10 +110,9 @@ def analyze_single_file(filename):
         display_results(feedback)
         
         # Show statistics
-        lines = content.split('\n')
         print(f"\n📊 File Statistics:")
-        print(f"   • Total lines: {len(lines)}")
-        print(f"   • Non-empty lines: {len([l for l in lines if l.strip()])}")
+        print(f"   • Total lines: {total_lines}")
+        print(f"   • Non-empty lines: {non_empty_lines}")
         print(f"   • Issues found: {len(issues)}")
         print(f"   • Quality score: {feedback.overall_score:.1f}/10")
         
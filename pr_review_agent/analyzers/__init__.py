@@ -1,18 +1,44 @@
 """Code analyzers for different aspects of code quality."""
 
+import importlib
+from typing import Any, List
+
 from .base import CodeAnalyzer
-from .pylint_analyzer import PylintAnalyzer
-from .flake8_analyzer import Flake8Analyzer
-from .black_analyzer import BlackAnalyzer
-from .mypy_analyzer import MyPyAnalyzer
-from .bandit_analyzer import BanditAnalyzer
-from .safety_analyzer import SafetyAnalyzer
-from .ai_analyzer import AIAnalyzer
+from ._cache import CachedAnalyzerMixin
+
+# Concrete analyzers are imported on first access (PEP 562) so that loading
+# the package does not pay for analyzers that are disabled in the config
+_LAZY_ANALYZERS = {
+    "PylintAnalyzer": ".pylint_analyzer",
+    "Flake8Analyzer": ".flake8_analyzer",
+    "RuffAnalyzer": ".ruff_analyzer",
+    "BlackAnalyzer": ".black_analyzer",
+    "MyPyAnalyzer": ".mypy_analyzer",
+    "BanditAnalyzer": ".bandit_analyzer",
+    "SafetyAnalyzer": ".safety_analyzer",
+    "AIAnalyzer": ".ai_analyzer",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ANALYZERS:
+        module = importlib.import_module(_LAZY_ANALYZERS[name], __name__)
+        analyzer = getattr(module, name)
+        globals()[name] = analyzer
+        return analyzer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ANALYZERS))
+
 
 __all__ = [
     "CodeAnalyzer",
+    "CachedAnalyzerMixin",
     "PylintAnalyzer", 
     "Flake8Analyzer",
+    "RuffAnalyzer",
     "BlackAnalyzer",
     "MyPyAnalyzer",
     "BanditAnalyzer",
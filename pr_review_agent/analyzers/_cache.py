@@ -0,0 +1,265 @@
+"""Result cache shared by analyzers.
+
+Results are memoized in memory for the life of the process. Analyzers that
+shell out to slow linters can also persist them under ``CACHE_DIR`` so that
+re-reviews of unchanged files skip the tool entirely.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from pr_review_agent.core.models import AnalysisConfig, CodeIssue
+
+
+RESULT_CACHE_SIZE = 1024
+
+# Digests kept in each on-disk clean list; past this the older half is dropped
+CLEAN_LIST_SIZE = 100000
+
+# On-disk cache location; set PR_REVIEW_CACHE_DIR to move it
+CACHE_DIR = os.environ.get('PR_REVIEW_CACHE_DIR') or os.path.join(
+    os.path.expanduser('~'), '.cache', 'pr-review-agent'
+)
+
+# Tool configuration files that can change linter output
+CONFIG_FILES = (
+    'setup.cfg', 'tox.ini', '.flake8', 'pyproject.toml', '.pylintrc', 'pylintrc',
+    'mypy.ini', '.mypy.ini', 'ruff.toml', '.ruff.toml'
+)
+
+# Analyzer name, AnalysisConfig digest, file path and content digest
+CacheKey = Tuple[str, str, str, bytes]
+
+_results: "OrderedDict[CacheKey, List[CodeIssue]]" = OrderedDict()
+_results_lock = threading.Lock()
+
+# Per namespace, the on-disk digests of files that produced no issues
+_clean: Dict[str, Set[str]] = {}
+_clean_lock = threading.Lock()
+
+
+def content_digest(content: str) -> bytes:
+    """Return a short BLAKE2b digest of file content."""
+    return hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def get(key: CacheKey) -> Optional[List[CodeIssue]]:
+    """Return a copy of the cached issues for key, or None on a miss."""
+    with _results_lock:
+        issues = _results.get(key)
+        if issues is None:
+            return None
+        _results.move_to_end(key)
+    return list(issues)
+
+
+def put(key: CacheKey, issues: List[CodeIssue]) -> None:
+    """Store issues for key, evicting the least recently used entry."""
+    with _results_lock:
+        _results[key] = list(issues)
+        _results.move_to_end(key)
+        if len(_results) > RESULT_CACHE_SIZE:
+            _results.popitem(last=False)
+
+
+def _disk_path(namespace: str, digest: str) -> str:
+    return os.path.join(CACHE_DIR, namespace, digest[:2], digest + '.json')
+
+
+def _clean_path(namespace: str) -> str:
+    return os.path.join(CACHE_DIR, namespace, 'clean.txt')
+
+
+def _read_clean(namespace: str) -> List[str]:
+    try:
+        with open(_clean_path(namespace)) as clean_file:
+            return clean_file.read().split()
+    except OSError:
+        return []
+
+
+def _compact_clean(namespace: str, digests: List[str]) -> List[str]:
+    """Rewrite a clean list with only its most recently added half."""
+    kept = list(dict.fromkeys(digests[-(CLEAN_LIST_SIZE // 2):]))
+    path = _clean_path(namespace)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'w') as clean_file:
+            clean_file.write(''.join(digest + '\n' for digest in kept))
+        # Digests other processes append meanwhile are lost; they only cost a re-run
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+    return kept
+
+
+def _clean_digests(namespace: str) -> Set[str]:
+    """Digests of files known to have no issues, read once per process."""
+    with _clean_lock:
+        digests = _clean.get(namespace)
+        if digests is None:
+            lines = _read_clean(namespace)
+            # Several processes may have appended the same digests
+            if len(lines) > CLEAN_LIST_SIZE:
+                lines = _compact_clean(namespace, lines)
+            digests = _clean[namespace] = set(lines)
+    return digests
+
+
+def disk_get(namespace: str, digest: str) -> Optional[List[CodeIssue]]:
+    """Load issues persisted under namespace/digest, or None on a miss."""
+    # Most files in a PR are clean; answer those without touching the disk
+    if digest in _clean_digests(namespace):
+        return []
+
+    try:
+        with open(_disk_path(namespace, digest), 'rb') as cache_file:
+            data = json.loads(cache_file.read())
+        return [CodeIssue.model_validate(item) for item in data]
+    except (OSError, ValueError):
+        # Missing, unreadable or corrupt entries are treated as misses
+        return None
+
+
+def disk_put(namespace: str, digest: str, issues: List[CodeIssue]) -> None:
+    """Persist issues under namespace/digest; failures are ignored."""
+    if not issues:
+        digests = _clean_digests(namespace)
+        try:
+            os.makedirs(os.path.join(CACHE_DIR, namespace), exist_ok=True)
+            # A single short append is atomic, so processes can share the list
+            with open(_clean_path(namespace), 'a') as clean_file:
+                clean_file.write(digest + '\n')
+        except OSError:
+            pass
+        with _clean_lock:
+            digests.add(digest)
+            if len(digests) > CLEAN_LIST_SIZE:
+                _clean[namespace] = set(_compact_clean(namespace, _read_clean(namespace)))
+        return
+
+    path = _disk_path(namespace, digest)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # json.dump() would issue one write per token; serialise first
+        data = json.dumps([issue.model_dump(mode='json') for issue in issues])
+        with open(temp_path, 'wb') as cache_file:
+            cache_file.write(data.encode('utf-8'))
+        # Atomic rename so concurrent readers never see a partial entry
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=None)
+def tool_version(command: str) -> str:
+    """Return the first line of `command --version`, or '' if it cannot run."""
+    try:
+        result = subprocess.run([command, '--version'], capture_output=True, text=True, timeout=30)
+    except (subprocess.TimeoutExpired, OSError):
+        return ''
+    return result.stdout.strip().split('\n', 1)[0]
+
+
+@lru_cache(maxsize=None)
+def config_fingerprint(directory: str = '.') -> str:
+    """Hash the tool configuration files present in directory, read once per process."""
+    digest = hashlib.blake2b(digest_size=8)
+    for name in CONFIG_FILES:
+        try:
+            with open(os.path.join(directory, name), 'rb') as config_file:
+                digest.update(name.encode() + b'\0' + config_file.read())
+        except OSError:
+            continue
+    return digest.hexdigest()
+
+
+class CachedAnalyzerMixin:
+    """Memoize analyze() results by analyzer name and config, file path and content hash.
+
+    Set ``persistent_cache`` and ``tool_command`` to also keep results on disk,
+    keyed additionally by the tool's version and the configuration files.
+    """
+
+    persistent_cache = False
+    tool_command = ''
+    config: AnalysisConfig
+    _config_digest = ''
+
+    # Provided by the analyzer the mixin is combined with
+    def get_name(self) -> str:
+        raise NotImplementedError
+
+    def should_analyze(self, file_path: str) -> bool:
+        raise NotImplementedError
+
+    def _cache_key(self, file_path: str, content: str) -> CacheKey:
+        # Analyzers read their settings from the config, so results differ with it
+        if not self._config_digest:
+            config_json = self.config.model_dump_json().encode('utf-8')
+            self._config_digest = hashlib.blake2b(config_json, digest_size=8).hexdigest()
+        return (self.get_name(), self._config_digest, file_path, content_digest(content))
+
+    def _disk_digest(self, key: CacheKey) -> str:
+        name, config_digest, file_path, digest = key
+        fingerprint = '\0'.join(
+            (tool_version(self.tool_command), config_fingerprint(), config_digest, file_path)
+        )
+        return hashlib.sha256(digest + fingerprint.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def _cache_lookup(self, key: CacheKey) -> Optional[List[CodeIssue]]:
+        issues = get(key)
+        if issues is None and self.persistent_cache:
+            issues = disk_get(key[0], self._disk_digest(key))
+            if issues is not None:
+                put(key, issues)
+        return issues
+
+    def _cache_store(self, key: CacheKey, issues: List[CodeIssue]) -> None:
+        put(key, issues)
+        if self.persistent_cache:
+            disk_put(key[0], self._disk_digest(key), issues)
+
+    def _cached_analyze(self, file_path: str, content: str,
+                        analyze: Callable[[str, str], Optional[List[CodeIssue]]]) -> List[CodeIssue]:
+        """Return cached issues, or run analyze; a None result is a tool failure and is not cached."""
+        key = self._cache_key(file_path, content)
+        issues = self._cache_lookup(key)
+        if issues is None:
+            issues = analyze(file_path, content)
+            if issues is None:
+                return []
+            self._cache_store(key, issues)
+        return issues
+
+    def _cached_analyze_many(self, files: Dict[str, str],
+                             analyze_many: Callable[[Dict[str, str]], Optional[Dict[str, List[CodeIssue]]]]
+                             ) -> Dict[str, List[CodeIssue]]:
+        """Like _cached_analyze, sending only the cache misses to analyze_many in one call."""
+        issues: Dict[str, List[CodeIssue]] = {}
+        missing: Dict[str, CacheKey] = {}
+        for file_path, content in files.items():
+            if self.should_analyze(file_path):
+                key = self._cache_key(file_path, content)
+                cached = self._cache_lookup(key)
+                if cached is None:
+                    missing[file_path] = key
+                else:
+                    issues[file_path] = cached
+
+        if missing:
+            results = analyze_many({file_path: files[file_path] for file_path in missing})
+            for file_path, key in missing.items():
+                issues[file_path] = results.get(file_path, []) if results is not None else []
+                if results is not None:
+                    self._cache_store(key, issues[file_path])
+            # Back in the order files were given
+            issues = {file_path: issues[file_path] for file_path in files if file_path in issues}
+
+        return issues
@@ -0,0 +1,47 @@
+"""Long-lived Pylint process driven over stdin and stdout.
+
+Each request is one JSON line holding Pylint command-line arguments. The
+reply is the JSON reporter's output folded onto one line (newlines inside
+JSON strings are escaped, so dropping the others is safe), or a JSON object
+with an 'error' key if Pylint could not run. Keeping the process
+alive saves Pylint's start-up and astroid's parsing of the standard library
+on every run after the first.
+
+Run as a script (not with -m) so that it works wherever Pylint is importable,
+whether or not this package is.
+"""
+
+import io
+import json
+import sys
+
+from astroid import MANAGER
+from pylint.lint import Run
+from pylint.reporters.json_reporter import JSONReporter
+
+
+def main() -> None:
+    # Only replies go to the real stdout; anything Pylint prints goes to stderr
+    replies = sys.stdout
+    sys.stdout = sys.stderr
+
+    for request in sys.stdin:
+        args = json.loads(request)
+        output = io.StringIO()
+        try:
+            Run(args, reporter=JSONReporter(output), exit=False)
+            reply = output.getvalue().replace('\n', '')
+        except BaseException as e:  # Pylint exits on bad options
+            reply = json.dumps({'error': repr(e)})
+
+        # The checked files are throwaway copies; keep only library modules cached
+        for name, module in list(MANAGER.astroid_cache.items()):
+            if module.file in args:
+                del MANAGER.astroid_cache[name]
+
+        replies.write(reply + '\n')
+        replies.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Python source parsed once and shared by analyzers.
+
+The linters parse files themselves, but the analyzers' own checks (is the
+file valid Python, how many statements does it have) reuse one parse per
+content.
+"""
+
+import ast
+from functools import lru_cache
+from typing import Optional, Union
+
+# Trees are much larger than their source; keep only recently reviewed files
+PARSE_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse(content: str) -> Union[ast.Module, SyntaxError, None]:
+    """Return the tree of content, the SyntaxError that stops it parsing, or
+    None if Python cannot tell (source with null bytes, on older versions).
+    """
+    try:
+        return ast.parse(content)
+    except SyntaxError as e:
+        # Drop the traceback so the cache does not keep its frames alive
+        return e.with_traceback(None)
+    except ValueError:
+        return None
+
+
+def syntax_error(content: str) -> Optional[SyntaxError]:
+    """Return the SyntaxError that stops content parsing, if any."""
+    tree = parse(content)
+    return tree if isinstance(tree, SyntaxError) else None
@@ -0,0 +1,120 @@
+"""Temporary on-disk copies of PR files, and their output, for command-line analyzers."""
+
+import os
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from ._cache import content_digest
+
+
+# One directory per process, shared by every analyzer; copies are named by
+# content and reference-counted, so analyzers checking the same files at the
+# same time write each file once
+_shared_dir: Optional[tempfile.TemporaryDirectory] = None
+_refcounts: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def _workspace_dir() -> str:
+    global _shared_dir
+    if _shared_dir is None:
+        # Removed at interpreter exit
+        _shared_dir = tempfile.TemporaryDirectory()
+    return _shared_dir.name
+
+
+@contextmanager
+def temp_workspace(files: Dict[str, str], suffix: str = '.py') -> Iterator[Dict[str, str]]:
+    """Write files into the shared temporary directory.
+
+    Yields a mapping of temporary path to original file path. Files are
+    named after the directory plus a content digest: paths sharing a
+    basename cannot collide, the names are valid module names, and a module
+    name always means the same source (MyPy's cache would otherwise report
+    stale paths).
+    """
+    temp_paths = {}
+    try:
+        with _lock:
+            temp_dir = _workspace_dir()
+            prefix = os.path.basename(temp_dir)
+            for file_path, content in files.items():
+                name = f"{prefix}_{content_digest(content).hex()}"
+                temp_file_path = os.path.join(temp_dir, name + suffix)
+                # Identical files in one call still need a path each
+                copy = 1
+                while temp_file_path in temp_paths:
+                    temp_file_path = os.path.join(temp_dir, f"{name}_{copy}{suffix}")
+                    copy += 1
+
+                if not _refcounts.get(temp_file_path):
+                    # One encode and one write, without a text-mode file object
+                    fd = os.open(temp_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                    try:
+                        os.write(fd, content.encode('utf-8'))
+                    finally:
+                        os.close(fd)
+                _refcounts[temp_file_path] = _refcounts.get(temp_file_path, 0) + 1
+                temp_paths[temp_file_path] = file_path
+
+        yield temp_paths
+    finally:
+        with _lock:
+            for temp_file_path in temp_paths:
+                _refcounts[temp_file_path] -= 1
+                if not _refcounts[temp_file_path]:
+                    del _refcounts[temp_file_path]
+                    try:
+                        os.unlink(temp_file_path)
+                    except OSError:
+                        pass
+
+
+def source_path(line: str, temp_paths: Dict[str, str]) -> Optional[str]:
+    """Return the original path of the temporary file a 'path:line:...' line is about."""
+    head, sep, _ = line.partition('.py:')
+    return temp_paths.get(head + '.py') if sep else None
+
+
+def split_output(output: str, temp_paths: Dict[str, str]) -> Dict[str, List[str]]:
+    """Group 'path:line:...' tool output lines by original file path."""
+    grouped: Dict[str, List[str]] = {}
+    for line in output.splitlines():
+        file_path = source_path(line, temp_paths)
+        if file_path is not None:
+            grouped.setdefault(file_path, []).append(line)
+    return grouped
+
+
+def stream_lines(command: List[str], timeout: float) -> Iterator[str]:
+    """Yield a command's output lines as it prints them.
+
+    Raises subprocess.TimeoutExpired once the command has run for longer
+    than timeout, like subprocess.run. Closing the generator early kills
+    the command.
+    """
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    # Always set with stdout=PIPE; the check narrows its Optional type
+    stdout = process.stdout
+    assert stdout is not None
+    timed_out: List[bool] = []
+
+    def kill() -> None:
+        timed_out.append(True)
+        process.kill()
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        yield from stdout
+    finally:
+        timer.cancel()
+        # kill() is a no-op once the process has been reaped
+        process.kill()
+        stdout.close()
+        process.wait()
+
+    if timed_out:
+        raise subprocess.TimeoutExpired(command, timeout)
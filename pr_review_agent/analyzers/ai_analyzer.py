@@ -1,9 +1,20 @@
 """AI-powered code analyzer for intelligent suggestions."""
 
 import os
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 from pr_review_agent.core.models import CodeIssue, AnalysisConfig, IssueSeverity, IssueCategory
 
+if TYPE_CHECKING:
+    import anthropic
+    import openai
+
+
+# Token budget for the code sent with each review request
+MAX_PROMPT_TOKENS = 3000
+# Fallback estimate when tiktoken is not installed; source code averages
+# roughly four characters per token
+CHARS_PER_TOKEN = 4
+
 
 class AIAnalyzer:
     """AI-powered code analyzer using OpenAI or Anthropic."""
@@ -12,6 +23,10 @@ class AIAnalyzer:
         self.config = config
         self.openai_key = os.getenv('OPENAI_API_KEY')
         self.anthropic_key = os.getenv('ANTHROPIC_API_KEY')
+        # Clients are created on first use and reused so their HTTP
+        # connection pools stay warm across files
+        self._openai: Optional["openai.OpenAI"] = None
+        self._anthropic: Optional["anthropic.Anthropic"] = None
 
     def analyze(self, file_path: str, content: str) -> List[CodeIssue]:
         if not self.should_analyze(file_path) or not self._has_api_key():
@@ -30,17 +45,18 @@ class AIAnalyzer:
     def _analyze_with_openai(self, file_path: str, content: str) -> List[CodeIssue]:
         """Analyze using OpenAI API."""
         try:
-            import openai
-            client = openai.OpenAI(api_key=self.openai_key)
+            if self._openai is None:
+                import openai
+                self._openai = openai.OpenAI(api_key=self.openai_key)
             
-            response = client.chat.completions.create(
+            response = self._openai.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[{
                     "role": "system",
                     "content": "You are a code reviewer. Analyze the code and provide specific, actionable feedback on performance, readability, and potential issues. Return only JSON with issues array."
                 }, {
                     "role": "user", 
-                    "content": f"File: {file_path}\n\nCode:\n{content[:4000]}"
+                    "content": f"File: {file_path}\n\nCode:\n{self._truncate(content)}"
                 }],
                 max_tokens=1000
             )
@@ -55,15 +71,16 @@ class AIAnalyzer:
     def _analyze_with_anthropic(self, file_path: str, content: str) -> List[CodeIssue]:
         """Analyze using Anthropic API."""
         try:
-            import anthropic
-            client = anthropic.Anthropic(api_key=self.anthropic_key)
+            if self._anthropic is None:
+                import anthropic
+                self._anthropic = anthropic.Anthropic(api_key=self.anthropic_key)
             
-            response = client.messages.create(
+            response = self._anthropic.messages.create(
                 model="claude-3-sonnet-20240229",
                 max_tokens=1000,
                 messages=[{
                     "role": "user",
-                    "content": f"Review this code for issues:\n\nFile: {file_path}\n\nCode:\n{content[:4000]}"
+                    "content": f"Review this code for issues:\n\nFile: {file_path}\n\nCode:\n{self._truncate(content)}"
                 }]
             )
             
@@ -73,6 +90,25 @@ class AIAnalyzer:
         except Exception:
             return []
 
+    def _truncate(self, content: str) -> str:
+        """Trim content to the prompt token budget."""
+        try:
+            import tiktoken
+        except ImportError:
+            limit = MAX_PROMPT_TOKENS * CHARS_PER_TOKEN
+            if len(content) <= limit:
+                return content
+            # Cut at a line boundary so the model never sees half a statement
+            cut = content.rfind('\n', 0, limit)
+            return content[:cut if cut > 0 else limit]
+
+        encoding = tiktoken.get_encoding('cl100k_base')
+        tokens = encoding.encode(content, disallowed_special=())
+        if len(tokens) <= MAX_PROMPT_TOKENS:
+            return content
+        decoded: str = encoding.decode(tokens[:MAX_PROMPT_TOKENS])
+        return decoded
+
     def _has_api_key(self) -> bool:
         return bool(self.openai_key or self.anthropic_key)
 
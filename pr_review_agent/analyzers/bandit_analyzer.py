@@ -1,57 +1,126 @@
 """Bandit analyzer for security issues."""
 
+import atexit
+import json
 import subprocess
 import tempfile
+import threading
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from pr_review_agent.core.models import CodeIssue, AnalysisConfig, IssueSeverity, IssueCategory
+from ._cache import CachedAnalyzerMixin
+from ._source import syntax_error
+from ._workspace import temp_workspace
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; its decode errors subclass json.JSONDecodeError
+    from json import loads as json_loads  # type: ignore[assignment]
 
-class BanditAnalyzer:
+
+class BanditAnalyzer(CachedAnalyzerMixin):
     """Bandit-based security analyzer."""
 
     def __init__(self, config: AnalysisConfig):
         self.config = config
+        # Idle scratch files, rewritten in place for every analysis. Concurrent
+        # calls each take their own, so at most one exists per parallel caller.
+        self._scratch_files: List[Tuple[int, str]] = []
+        self._scratch_lock = threading.Lock()
 
     def analyze(self, file_path: str, content: str) -> List[CodeIssue]:
         if not self.should_analyze(file_path):
             return []
 
+        return self._cached_analyze(file_path, content, self._run_bandit)
+
+    def _run_bandit(self, file_path: str, content: str) -> Optional[List[CodeIssue]]:
+        """Run Bandit on one file; None means the tool itself failed."""
+        # Bandit reports no issues in a file it cannot parse
+        if syntax_error(content) is not None:
+            return []
+
         issues = []
+        scratch = self._acquire_scratch()
         try:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-                temp_file.write(content)
-                temp_file_path = temp_file.name
+            temp_file_path = self._write_scratch(scratch, content)
 
             result = subprocess.run([
                 'bandit', '-f', 'json', temp_file_path
-            ], capture_output=True, text=True, timeout=30)
+            ], capture_output=True, timeout=30)
 
             if result.stdout:
-                import json
-                data = json.loads(result.stdout)
+                data = json_loads(result.stdout)
                 for result_item in data.get('results', []):
-                    issues.append(CodeIssue(
-                        file_path=file_path,
-                        line_number=result_item.get('line_number', 1),
-                        severity=self._get_severity(result_item.get('issue_severity', 'MEDIUM')),
-                        category=IssueCategory.SECURITY,
-                        message=result_item.get('issue_text', ''),
-                        rule_id=result_item.get('test_id', ''),
-                        suggestion=result_item.get('issue_text', '')
-                    ))
+                    issues.append(self._to_issue(file_path, result_item))
 
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError):
-            pass
+            return None
         finally:
-            if 'temp_file_path' in locals():
-                try:
-                    os.unlink(temp_file_path)
-                except OSError:
-                    pass
+            with self._scratch_lock:
+                self._scratch_files.append(scratch)
 
         return issues
 
+    def _acquire_scratch(self) -> Tuple[int, str]:
+        """Take an idle scratch file, creating one if none is free."""
+        with self._scratch_lock:
+            if self._scratch_files:
+                return self._scratch_files.pop()
+
+        scratch = tempfile.mkstemp(suffix='.py')
+        atexit.register(_remove_scratch, *scratch)
+        return scratch
+
+    def _write_scratch(self, scratch: Tuple[int, str], content: str) -> str:
+        """Replace the scratch file contents and return its path."""
+        fd, path = scratch
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.ftruncate(fd, 0)
+        os.write(fd, content.encode('utf-8'))
+        return path
+
+    def analyze_many(self, files: Dict[str, str]) -> Dict[str, List[CodeIssue]]:
+        """Analyze several files with a single Bandit run."""
+        return self._cached_analyze_many(files, self._run_bandit_many)
+
+    def _run_bandit_many(self, files: Dict[str, str]) -> Optional[Dict[str, List[CodeIssue]]]:
+        """Run Bandit once over all files; None means the tool itself failed."""
+        issues: Dict[str, List[CodeIssue]] = {file_path: [] for file_path in files}
+        parsed = {file_path: content for file_path, content in files.items() if syntax_error(content) is None}
+        if not parsed:
+            return issues
+
+        try:
+            with temp_workspace(parsed) as temp_paths:
+                result = subprocess.run([
+                    'bandit', '-f', 'json', *temp_paths
+                ], capture_output=True, timeout=30 * len(temp_paths))
+
+            if not result.stdout:
+                return None
+            data = json_loads(result.stdout)
+            for result_item in data.get('results', []):
+                file_path = temp_paths.get(result_item.get('filename'))
+                if file_path is not None:
+                    issues[file_path].append(self._to_issue(file_path, result_item))
+
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        return issues
+
+    def _to_issue(self, file_path: str, result_item: Dict[str, Any]) -> CodeIssue:
+        return CodeIssue(
+            file_path=file_path,
+            line_number=result_item.get('line_number', 1),
+            severity=self._get_severity(result_item.get('issue_severity', 'MEDIUM')),
+            category=IssueCategory.SECURITY,
+            message=result_item.get('issue_text', ''),
+            rule_id=result_item.get('test_id', ''),
+            suggestion=result_item.get('issue_text', '')
+        )
+
     def _get_severity(self, severity: str) -> IssueSeverity:
         severity_map = {
             'LOW': IssueSeverity.LOW,
@@ -68,3 +137,11 @@ class BanditAnalyzer:
 
     def get_metrics(self, file_path: str, content: str) -> Dict[str, Any]:
         return {}
+
+
+def _remove_scratch(fd: int, path: str) -> None:
+    try:
+        os.close(fd)
+        os.unlink(path)
+    except OSError:
+        pass
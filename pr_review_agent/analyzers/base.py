@@ -1,7 +1,7 @@
 """Base analyzer interface for code analysis."""
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from pr_review_agent.core.models import CodeIssue, AnalysisConfig
 
 
@@ -30,3 +30,7 @@ class CodeAnalyzer(ABC):
     def get_metrics(self, file_path: str, content: str) -> Dict[str, Any]:
         """Get additional metrics for the file."""
         return {}
+
+    def analyze_with_metrics(self, file_path: str, content: str) -> Tuple[List[CodeIssue], Dict[str, Any]]:
+        """Analyze a file and collect its metrics, sharing work where possible."""
+        return self.analyze(file_path, content), self.get_metrics(file_path, content)
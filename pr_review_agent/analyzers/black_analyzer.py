@@ -1,66 +1,112 @@
 """Black formatter analyzer for code style consistency."""
 
-import subprocess
-import tempfile
-import os
-from typing import List, Dict, Any
+import difflib
+import threading
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 from pr_review_agent.core.models import CodeIssue, AnalysisConfig, IssueSeverity, IssueCategory
+from ._cache import CachedAnalyzerMixin
 
+if TYPE_CHECKING:
+    import black
 
-class BlackAnalyzer:
+# Black is compiled with mypyc; a thread racing another thread's first import
+# can see the package before it is fully initialised
+_black_import_lock = threading.Lock()
+
+
+def _black_available() -> bool:
+    """Import Black, once fully initialised, and report whether it is installed."""
+    try:
+        with _black_import_lock:
+            import black  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class BlackAnalyzer(CachedAnalyzerMixin):
     """Black formatter-based code analyzer."""
 
     def __init__(self, config: AnalysisConfig):
         """Initialize Black analyzer."""
         self.config = config
+        self._mode: Optional["black.Mode"] = None
 
     def analyze(self, file_path: str, content: str) -> List[CodeIssue]:
         """Analyze file using Black formatter."""
         if not self.should_analyze(file_path):
             return []
 
+        return self._cached_analyze(file_path, content, self._check_formatting)
+
+    def analyze_with_metrics(self, file_path: str, content: str) -> Tuple[List[CodeIssue], Dict[str, Any]]:
+        """Analyze a file and derive the metrics from the same Black run."""
+        if not self.should_analyze(file_path):
+            return [], {}
+        if not _black_available():
+            return [], {'black_available': False}
+
+        failed = []
+
+        def check_formatting(path: str, text: str) -> Optional[List[CodeIssue]]:
+            issues = self._check_formatting(path, text)
+            if issues is None:
+                failed.append(True)
+            return issues
+
+        # Failed runs are not cached, so a cached result means Black formatted the file
+        issues = self._cached_analyze(file_path, content, check_formatting)
+        return issues, {
+            'black_needs_formatting': bool(issues),
+            'black_compatible': not issues and not failed
+        }
+
+    def _check_formatting(self, file_path: str, content: str) -> Optional[List[CodeIssue]]:
+        """Report a single issue when Black would reformat the file; None if it could not run."""
         issues = []
-        
-        try:
-            # Create temporary file for analysis
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-                temp_file.write(content)
-                temp_file_path = temp_file.name
-
-            # Run black in check mode
-            result = subprocess.run([
-                'black', 
-                '--check', 
-                '--diff',
-                temp_file_path
-            ], capture_output=True, text=True, timeout=30)
-
-            # If exit code is 1, the file needs formatting
-            if result.returncode == 1 and result.stdout:
-                issues.append(CodeIssue(
-                    file_path=file_path,
-                    line_number=1,
-                    severity=IssueSeverity.LOW,
-                    category=IssueCategory.STYLE,
-                    message="Code formatting issues detected by Black",
-                    rule_id="black-formatting",
-                    suggestion="Run 'black' to format the code",
-                    code_snippet=result.stdout[:500]  # First 500 chars of diff
-                ))
-
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
-            # Black not available or failed
-            pass
-        finally:
-            # Clean up temporary file
-            if 'temp_file_path' in locals():
-                try:
-                    os.unlink(temp_file_path)
-                except OSError:
-                    pass
+        formatted = self._format(content)
+        # Black is unavailable or could not format the code
+        if formatted is None:
+            return None
+
+        if formatted != content:
+            diff = ''.join(difflib.unified_diff(
+                content.splitlines(keepends=True),
+                formatted.splitlines(keepends=True),
+                fromfile=file_path,
+                tofile=file_path
+            ))
+            issues.append(CodeIssue(
+                file_path=file_path,
+                line_number=1,
+                severity=IssueSeverity.LOW,
+                category=IssueCategory.STYLE,
+                message="Code formatting issues detected by Black",
+                rule_id="black-formatting",
+                suggestion="Run 'black' to format the code",
+                code_snippet=diff[:500]  # First 500 chars of diff
+            ))
 
         return issues
 
+    def _format(self, content: str) -> Optional[str]:
+        """Format content with Black in-process, or return None on failure."""
+        if not _black_available():
+            return None
+        import black
+
+        if self._mode is None:
+            self._mode = black.Mode()
+
+        try:
+            # Same safety checks as `black --check` (fast=False)
+            return black.format_file_contents(content, fast=False, mode=self._mode)
+        except black.NothingChanged:
+            return content
+        except Exception:
+            # Invalid syntax or an unsafe reformat; the CLI reports these as errors
+            return None
+
     def should_analyze(self, file_path: str) -> bool:
         """Check if file should be analyzed by Black."""
         return file_path.endswith('.py')
@@ -71,29 +117,5 @@ class BlackAnalyzer:
 
     def get_metrics(self, file_path: str, content: str) -> Dict[str, Any]:
         """Get Black metrics."""
-        if not self.should_analyze(file_path):
-            return {}
-
-        try:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-                temp_file.write(content)
-                temp_file_path = temp_file.name
-
-            result = subprocess.run([
-                'black', 
-                '--check',
-                temp_file_path
-            ], capture_output=True, text=True, timeout=30)
-
-            return {
-                'black_needs_formatting': result.returncode == 1,
-                'black_compatible': result.returncode == 0
-            }
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
-            return {'black_available': False}
-        finally:
-            if 'temp_file_path' in locals():
-                try:
-                    os.unlink(temp_file_path)
-                except OSError:
-                    pass
+        # Served from the result cache when analyze() already ran on this content
+        return self.analyze_with_metrics(file_path, content)[1]
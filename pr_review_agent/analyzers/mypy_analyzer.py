@@ -1,15 +1,28 @@
 """MyPy analyzer for type checking."""
 
 import subprocess
-import tempfile
-import os
-from typing import List, Dict, Any
+import re
+from typing import List, Dict, Any, Optional
 from pr_review_agent.core.models import CodeIssue, AnalysisConfig, IssueSeverity, IssueCategory
+from ._cache import CachedAnalyzerMixin
+from ._source import syntax_error
+from ._workspace import temp_workspace, split_output
 
+# Longer sources go through a temporary file: passed with -c they could
+# exceed the platform's command-line limit (32K characters on Windows,
+# 128KB per argument on Linux)
+INLINE_SOURCE_LIMIT = 30000
 
-class MyPyAnalyzer:
+# 'path:line: error: message  [code]' lines; notes are skipped
+_MYPY_ERROR_RE = re.compile(r'^.*?:(\d+): error:(.*)$', re.MULTILINE)
+
+
+class MyPyAnalyzer(CachedAnalyzerMixin):
     """MyPy-based type checker."""
 
+    persistent_cache = True
+    tool_command = 'mypy'
+
     def __init__(self, config: AnalysisConfig):
         self.config = config
 
@@ -17,48 +30,97 @@ class MyPyAnalyzer:
         if not self.should_analyze(file_path):
             return []
 
-        issues = []
-        try:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-                temp_file.write(content)
-                temp_file_path = temp_file.name
+        return self._cached_analyze(file_path, content, self._run_mypy)
 
+    def _run_mypy(self, file_path: str, content: str) -> Optional[List[CodeIssue]]:
+        """Run MyPy on one file; None means the tool itself failed."""
+        error = syntax_error(content)
+        if error is not None:
+            return [self._syntax_error_issue(file_path, error)]
+
+        if len(content) > INLINE_SOURCE_LIMIT or '\0' in content:
+            issues = self._run_mypy_many({file_path: content})
+            return issues[file_path] if issues is not None else None
+
+        try:
+            # -c checks the source as given, with no temporary file
             result = subprocess.run([
-                'mypy', '--show-error-codes', '--no-error-summary', temp_file_path
+                'mypy', '--show-error-codes', '--no-error-summary', '-c', content
             ], capture_output=True, text=True, timeout=30)
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
+            return None
 
-            if result.stdout:
-                issues.extend(self._parse_output(result.stdout, file_path))
+        return self._parse_output(result.stdout, file_path)
+
+    def analyze_many(self, files: Dict[str, str]) -> Dict[str, List[CodeIssue]]:
+        """Type check several files with a single MyPy run."""
+        return self._cached_analyze_many(files, self._run_mypy_many)
+
+    def _run_mypy_many(self, files: Dict[str, str]) -> Optional[Dict[str, List[CodeIssue]]]:
+        """Run MyPy once over all files; None means the tool itself failed."""
+        issues: Dict[str, List[CodeIssue]] = {file_path: [] for file_path in files}
+        remaining = {}
+        for file_path, content in files.items():
+            error = syntax_error(content)
+            if error is not None:
+                # A syntax error would stop the whole run; report it without MyPy
+                issues[file_path] = [self._syntax_error_issue(file_path, error)]
+            else:
+                remaining[file_path] = content
+
+        try:
+            while remaining:
+                with temp_workspace(remaining) as temp_paths:
+                    # One run builds the standard library import graph only once.
+                    # MyPy shortens paths under the working directory, which
+                    # can contain the temporary one; absolute paths always match.
+                    result = subprocess.run([
+                        'mypy', '--show-error-codes', '--no-error-summary', '--show-absolute-path',
+                        *temp_paths
+                    ], capture_output=True, text=True, timeout=30 * len(temp_paths))
+
+                grouped = split_output(result.stdout, temp_paths)
+                if result.returncode != 0 and not grouped:
+                    # Failed without reporting on any of the files: not a clean result
+                    return None
+                for file_path, lines in grouped.items():
+                    issues[file_path] = self._parse_output('\n'.join(lines), file_path)
+
+                # Exit status 2 means a blocking error (such as an invalid module name)
+                # stopped the run after reporting only the offending files;
+                # check the others again without them
+                if result.returncode != 2 or not grouped:
+                    break
+                for file_path in grouped:
+                    del remaining[file_path]
 
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
-            pass
-        finally:
-            if 'temp_file_path' in locals():
-                try:
-                    os.unlink(temp_file_path)
-                except OSError:
-                    pass
+            return None
 
         return issues
 
     def _parse_output(self, output: str, file_path: str) -> List[CodeIssue]:
-        issues = []
-        for line in output.strip().split('\n'):
-            if ':' in line and 'error:' in line:
-                parts = line.split(':', 3)
-                if len(parts) >= 4:
-                    line_num = int(parts[1]) if parts[1].isdigit() else 1
-                    message = parts[3].strip()
-                    
-                    issues.append(CodeIssue(
-                        file_path=file_path,
-                        line_number=line_num,
-                        severity=IssueSeverity.HIGH,
-                        category=IssueCategory.BUG,
-                        message=message,
-                        rule_id="mypy"
-                    ))
-        return issues
+        return [
+            CodeIssue(
+                file_path=file_path,
+                line_number=int(line_num),
+                severity=IssueSeverity.HIGH,
+                category=IssueCategory.BUG,
+                message=message.strip(),
+                rule_id="mypy"
+            )
+            for line_num, message in _MYPY_ERROR_RE.findall(output)
+        ]
+
+    def _syntax_error_issue(self, file_path: str, error: SyntaxError) -> CodeIssue:
+        return CodeIssue(
+            file_path=file_path,
+            line_number=error.lineno or 1,
+            severity=IssueSeverity.HIGH,
+            category=IssueCategory.BUG,
+            message=f"{error.msg}  [syntax]",
+            rule_id="mypy"
+        )
 
     def should_analyze(self, file_path: str) -> bool:
         return file_path.endswith('.py')
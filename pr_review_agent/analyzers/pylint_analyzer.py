@@ -1,113 +1,309 @@
 """Pylint analyzer for code quality analysis."""
 
+import ast
+import atexit
+import importlib.util
+import json
 import subprocess
-import tempfile
+import sys
+import threading
 import os
-from typing import List, Dict, Any
+import re
+from typing import List, Dict, Any, Optional, Union
 from pr_review_agent.core.models import CodeIssue, AnalysisConfig, IssueSeverity, IssueCategory
+from ._cache import CachedAnalyzerMixin
+from ._source import parse, syntax_error
+from ._workspace import temp_workspace
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; its decode errors subclass json.JSONDecodeError
+    from json import loads as json_loads  # type: ignore[assignment]
 
-class PylintAnalyzer:
+# 'path:line:col: msg-id: message' lines of Pylint's text output
+_PYLINT_TEXT_LINE_RE = re.compile(r'^[^:\n]*:(\d+):[^:\n]*:(.*)$', re.MULTILINE)
+
+_SEVERITY_MAP = {
+    'C': IssueSeverity.LOW,      # Convention
+    'W': IssueSeverity.MEDIUM,   # Warning
+    'R': IssueSeverity.MEDIUM,   # Refactor
+    'E': IssueSeverity.HIGH,     # Error
+    'F': IssueSeverity.CRITICAL  # Fatal
+}
+
+_CATEGORY_MAP = {
+    'C': IssueCategory.STYLE,
+    'W': IssueCategory.READABILITY,
+    'R': IssueCategory.MAINTAINABILITY,
+    'E': IssueCategory.BUG,
+    'F': IssueCategory.BUG
+}
+
+# Checks run on every file; the output format is set by whoever runs Pylint
+PYLINT_CHECKS = ('--disable=all', '--enable=C,W,R,E,F')
+
+# Nodes that define a scope and may start with a docstring
+_DOCSTRING_OWNERS = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+def count_statements(content: str) -> int:
+    """Count statements the way Pylint does: except clauses count, docstrings don't."""
+    tree = parse(content)
+    if not isinstance(tree, ast.Module):
+        return 0
+
+    statements = 0
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.stmt, ast.ExceptHandler)):
+            statements += 1
+        if isinstance(node, _DOCSTRING_OWNERS) and ast.get_docstring(node, clean=False) is not None:
+            statements -= 1
+    return statements
+
+
+_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_pylint_worker.py')
+
+# Warm Pylint processes per analyzer; each holds a full interpreter, so runs
+# beyond this many wait for a free one
+MAX_WORKERS = os.cpu_count() or 1
+
+
+class _PylintWorker:
+    """A warm Pylint process, see _pylint_worker.py."""
+
+    def __init__(self) -> None:
+        self.process = subprocess.Popen(
+            [sys.executable, _WORKER_SCRIPT],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        # Replies received; a worker that dies before its first reply cannot run Pylint
+        self.replies = 0
+        atexit.register(self.close)
+
+    def run(self, args: List[str], timeout: float) -> Optional[str]:
+        """Return Pylint's JSON output, or None if the worker died or Pylint failed."""
+        timed_out: List[bool] = []
+
+        def kill() -> None:
+            timed_out.append(True)
+            self.process.kill()
+
+        # Always set with PIPE; the check narrows their Optional types
+        stdin, stdout = self.process.stdin, self.process.stdout
+        assert stdin is not None and stdout is not None
+
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        try:
+            stdin.write(json.dumps(args) + '\n')
+            stdin.flush()
+            reply = stdout.readline()
+        except OSError:
+            reply = ''
+        finally:
+            timer.cancel()
+
+        if timed_out or not reply:
+            # Reap the process so alive() is accurate before the pool sees it
+            self.close()
+        if timed_out:
+            raise subprocess.TimeoutExpired(_WORKER_SCRIPT, timeout)
+        if not reply or reply.startswith('{'):
+            return None
+        self.replies += 1
+        return reply
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def close(self) -> None:
+        # kill() is a no-op once the process has been reaped
+        self.process.kill()
+        self.process.wait()
+        # Otherwise the exit hook would keep every replaced worker alive
+        atexit.unregister(self.close)
+
+
+class PylintAnalyzer(CachedAnalyzerMixin):
     """Pylint-based code analyzer."""
 
+    persistent_cache = True
+    tool_command = 'pylint'
+
     def __init__(self, config: AnalysisConfig):
         """Initialize Pylint analyzer."""
         self.config = config
+        # Idle warm Pylint processes; concurrent runs each take their own,
+        # at most MAX_WORKERS at a time
+        self._workers: List[_PylintWorker] = []
+        self._workers_lock = threading.Lock()
+        self._worker_slots = threading.BoundedSemaphore(MAX_WORKERS)
+        self._use_workers = importlib.util.find_spec('pylint') is not None
 
     def analyze(self, file_path: str, content: str) -> List[CodeIssue]:
         """Analyze file using Pylint."""
         if not self.should_analyze(file_path):
             return []
 
+        return self._cached_analyze(file_path, content, self._run_pylint)
+
+    def _run_pylint(self, file_path: str, content: str) -> Optional[List[CodeIssue]]:
+        """Run Pylint on one file; None means the tool itself failed."""
+        error = syntax_error(content)
+        if error is not None:
+            return [self._syntax_error_issue(file_path, error)]
+
         issues = []
         
         try:
-            # Create temporary file for analysis
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-                temp_file.write(content)
-                temp_file_path = temp_file.name
-
-            # Run pylint
-            result = subprocess.run([
-                'pylint', 
-                '--output-format=json',
-                '--disable=all',
-                '--enable=C,W,R,E,F',
-                temp_file_path
-            ], capture_output=True, text=True, timeout=30)
+            with temp_workspace({file_path: content}) as temp_paths:
+                output = self._pylint_json([*PYLINT_CHECKS, *temp_paths], timeout=30)
 
             # Parse JSON output
-            if result.stdout:
-                import json
+            if output:
                 try:
-                    pylint_output = json.loads(result.stdout)
+                    pylint_output = json_loads(output)
                     for issue in pylint_output:
                         issues.append(self._convert_pylint_issue(issue, file_path))
                 except json.JSONDecodeError:
                     # Fallback to text parsing if JSON fails
-                    issues.extend(self._parse_text_output(result.stdout, file_path))
+                    if isinstance(output, bytes):
+                        output = output.decode('utf-8', 'replace')
+                    issues.extend(self._parse_text_output(output, file_path))
 
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
             # Pylint not available or failed
-            pass
-        finally:
-            # Clean up temporary file
-            if 'temp_file_path' in locals():
+            return None
+
+        return issues
+
+    def analyze_many(self, files: Dict[str, str]) -> Dict[str, List[CodeIssue]]:
+        """Analyze several files with a single Pylint run."""
+        return self._cached_analyze_many(files, self._run_pylint_many)
+
+    def _run_pylint_many(self, files: Dict[str, str]) -> Optional[Dict[str, List[CodeIssue]]]:
+        """Run Pylint once over all files; None means the tool itself failed."""
+        issues: Dict[str, List[CodeIssue]] = {file_path: [] for file_path in files}
+
+        # Files that do not parse get only a syntax error, without Pylint
+        parsed = {}
+        for file_path, content in files.items():
+            error = syntax_error(content)
+            if error is not None:
+                issues[file_path].append(self._syntax_error_issue(file_path, error))
+            else:
+                parsed[file_path] = content
+        if not parsed:
+            return issues
+
+        try:
+            with temp_workspace(parsed) as temp_paths:
+                # -j 0 uses one worker per core. duplicate-code compares files
+                # with each other, which a per-file run never does.
+                output = self._pylint_json([
+                    *PYLINT_CHECKS,
+                    '--disable=duplicate-code',
+                    '-j', '0',
+                    *temp_paths
+                ], timeout=30 * len(temp_paths))
+
+            if output:
                 try:
-                    os.unlink(temp_file_path)
-                except OSError:
-                    pass
+                    pylint_output = json_loads(output)
+                except json.JSONDecodeError:
+                    pylint_output = []
+                # Pylint may report paths relative to the working directory
+                by_name = {os.path.basename(temp_path): file_path for temp_path, file_path in temp_paths.items()}
+                for issue in pylint_output:
+                    issue_path = by_name.get(os.path.basename(issue.get('path', '')))
+                    if issue_path is not None:
+                        issues[issue_path].append(self._convert_pylint_issue(issue, issue_path))
+
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
+            # Pylint not available or failed
+            return None
 
         return issues
 
-    def _convert_pylint_issue(self, issue: Dict[str, Any], file_path: str) -> CodeIssue:
-        """Convert Pylint issue to CodeIssue."""
-        severity_map = {
-            'C': IssueSeverity.LOW,      # Convention
-            'W': IssueSeverity.MEDIUM,   # Warning
-            'R': IssueSeverity.MEDIUM,   # Refactor
-            'E': IssueSeverity.HIGH,     # Error
-            'F': IssueSeverity.CRITICAL  # Fatal
-        }
+    def _pylint_json(self, args: List[str], timeout: float) -> Union[str, bytes]:
+        """Run Pylint with JSON output, in a warm worker when Pylint is importable."""
+        if self._use_workers:
+            output = self._run_in_worker(args, timeout)
+            if output is not None:
+                return output
 
-        category_map = {
-            'C': IssueCategory.STYLE,
-            'W': IssueCategory.READABILITY,
-            'R': IssueCategory.MAINTAINABILITY,
-            'E': IssueCategory.BUG,
-            'F': IssueCategory.BUG
-        }
+        # Left as bytes: the JSON parser decodes it
+        result = subprocess.run(
+            ['pylint', '--output-format=json', *args], capture_output=True, timeout=timeout
+        )
+        return result.stdout
+
+    def _run_in_worker(self, args: List[str], timeout: float) -> Optional[str]:
+        """Run Pylint in a warm worker; None means this run needs the command instead."""
+        with self._worker_slots:
+            worker = self._acquire_worker()
+            try:
+                output = worker.run(args, timeout)
+            finally:
+                if worker.alive():
+                    with self._workers_lock:
+                        self._workers.append(worker)
+
+        if output is None and (worker.alive() or not worker.replies):
+            # Pylint could not run in the worker at all; use the command from
+            # now on. A worker that crashed after serving runs is replaced by
+            # the next one.
+            self._use_workers = False
+        return output
+
+    def _acquire_worker(self) -> _PylintWorker:
+        """Take an idle worker, starting one if none is free or the idle ones died."""
+        with self._workers_lock:
+            while self._workers:
+                worker = self._workers.pop()
+                if worker.alive():
+                    return worker
+                worker.close()
+        return _PylintWorker()
 
+    def _convert_pylint_issue(self, issue: Dict[str, Any], file_path: str) -> CodeIssue:
+        """Convert Pylint issue to CodeIssue."""
         return CodeIssue(
             file_path=file_path,
             line_number=issue.get('line', 1),
             column_number=issue.get('column'),
-            severity=severity_map.get(issue.get('type', 'W'), IssueSeverity.MEDIUM),
-            category=category_map.get(issue.get('type', 'W'), IssueCategory.READABILITY),
+            severity=_SEVERITY_MAP.get(issue.get('type', 'W'), IssueSeverity.MEDIUM),
+            category=_CATEGORY_MAP.get(issue.get('type', 'W'), IssueCategory.READABILITY),
             message=issue.get('message', ''),
             rule_id=issue.get('message-id', ''),
             suggestion=self._get_suggestion(issue.get('message-id', ''))
         )
 
+    def _syntax_error_issue(self, file_path: str, error: SyntaxError) -> CodeIssue:
+        """The syntax-error message Pylint reports for a file it cannot parse."""
+        module = os.path.splitext(os.path.basename(file_path))[0]
+        return self._convert_pylint_issue({
+            'type': 'error',
+            'line': error.lineno or 1,
+            'column': error.offset,
+            'message': f"Parsing failed: '{error.msg} ({module}, line {error.lineno})'",
+            'message-id': 'E0001'
+        }, file_path)
+
     def _parse_text_output(self, output: str, file_path: str) -> List[CodeIssue]:
         """Parse Pylint text output as fallback."""
         issues = []
-        lines = output.split('\n')
         
-        for line in lines:
-            if ':' in line and ('error' in line.lower() or 'warning' in line.lower()):
-                parts = line.split(':')
-                if len(parts) >= 4:
-                    line_num = int(parts[1]) if parts[1].isdigit() else 1
-                    message = ':'.join(parts[3:]).strip()
-                    
-                    issues.append(CodeIssue(
-                        file_path=file_path,
-                        line_number=line_num,
-                        severity=IssueSeverity.MEDIUM,
-                        category=IssueCategory.READABILITY,
-                        message=message
-                    ))
+        for match in _PYLINT_TEXT_LINE_RE.finditer(output):
+            line = match.group(0).lower()
+            if 'error' in line or 'warning' in line:
+                issues.append(CodeIssue(
+                    file_path=file_path,
+                    line_number=int(match.group(1)),
+                    severity=IssueSeverity.MEDIUM,
+                    category=IssueCategory.READABILITY,
+                    message=match.group(2).strip()
+                ))
         
         return issues
 
@@ -139,35 +335,21 @@ class PylintAnalyzer:
         if not self.should_analyze(file_path):
             return {}
 
-        try:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-                temp_file.write(content)
-                temp_file_path = temp_file.name
-
-            result = subprocess.run([
-                'pylint', 
-                '--output-format=json',
-                '--score=y',
-                temp_file_path
-            ], capture_output=True, text=True, timeout=30)
-
-            if result.stdout:
-                import json
-                try:
-                    data = json.loads(result.stdout)
-                    return {
-                        'pylint_score': data.get('score', 0),
-                        'pylint_issues_count': len(data)
-                    }
-                except json.JSONDecodeError:
-                    pass
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
-            pass
-        finally:
-            if 'temp_file_path' in locals():
-                try:
-                    os.unlink(temp_file_path)
-                except OSError:
-                    pass
+        # Served from the result cache when analyze() already ran on this content
+        issues = self.analyze(file_path, content)
+        metrics: Dict[str, Any] = {'pylint_issues_count': len(issues)}
+
+        # Like Pylint, give no score to a file without statements
+        statements = count_statements(content)
+        if statements:
+            metrics['pylint_score'] = self._score(issues, statements)
+        return metrics
 
-        return {}
+    def _score(self, issues: List[CodeIssue], statements: int) -> float:
+        """Pylint's default evaluation: 10 - 10 * (5 * errors + others) / statements."""
+        # Message IDs start with the message type letter (C, R, W, E or F)
+        types = [issue.rule_id[:1] for issue in issues if issue.rule_id]
+        if 'F' in types:
+            return 0.0
+        weighted = sum(5 if message_type == 'E' else 1 for message_type in types if message_type in 'CRWE')
+        return max(0.0, 10.0 - weighted / statements * 10)
@@ -0,0 +1,120 @@
+"""Ruff analyzer, a faster but narrower alternative to Flake8.
+
+Ruff reports Flake8's error checks (F) and long lines, but leaves out most of
+pycodestyle's whitespace and blank-line checks (E1, E2, E3) and uses a longer
+default line length, so it is opt-in through AnalysisConfig.use_ruff.
+"""
+
+import json
+import shutil
+import subprocess
+from typing import List, Dict, Any, Optional
+from pr_review_agent.core.models import CodeIssue
+from .flake8_analyzer import Flake8Analyzer
+from ._workspace import temp_workspace
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; its decode errors subclass json.JSONDecodeError
+    from json import loads as json_loads  # type: ignore[assignment]
+
+# pycodestyle errors and warnings and Pyflakes, as Flake8 checks by default;
+# rules selected in the project's Ruff configuration are kept
+RUFF_CHECKS = ('--extend-select=E,W,F',)
+
+# Ruff reports syntax errors without a rule code (or as 'invalid-syntax');
+# Flake8 uses E999
+_SYNTAX_ERROR_CODES = (None, 'invalid-syntax')
+
+
+def ruff_available() -> bool:
+    """Return True if the ruff command is on PATH."""
+    return shutil.which('ruff') is not None
+
+
+class RuffAnalyzer(Flake8Analyzer):
+    """Ruff-based code analyzer.
+
+    Ruff reuses Flake8's rule codes, so issues are graded and given
+    suggestions exactly like Flake8's.
+    """
+
+    tool_command = 'ruff'
+
+    def analyze(self, file_path: str, content: str) -> List[CodeIssue]:
+        """Analyze file using Ruff."""
+        if not self.should_analyze(file_path):
+            return []
+
+        return self._cached_analyze(file_path, content, self._run_ruff)
+
+    def _run_ruff(self, file_path: str, content: str) -> Optional[List[CodeIssue]]:
+        """Run Ruff on one file passed on stdin; None means the tool itself failed."""
+        try:
+            # The file's own path lets Ruff apply per-file configuration
+            result = subprocess.run([
+                'ruff', 'check', '--no-cache', '--output-format=json', *RUFF_CHECKS,
+                '--stdin-filename', file_path, '-'
+            ], input=content.encode('utf-8'), capture_output=True, timeout=30)
+
+            # Exit status 1 only means violations were found
+            if result.returncode > 1:
+                return None
+            return [self._convert_ruff_issue(item, file_path) for item in json_loads(result.stdout)]
+
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def analyze_many(self, files: Dict[str, str]) -> Dict[str, List[CodeIssue]]:
+        """Analyze several files with a single Ruff run."""
+        return self._cached_analyze_many(files, self._run_ruff_many)
+
+    def _run_ruff_many(self, files: Dict[str, str]) -> Optional[Dict[str, List[CodeIssue]]]:
+        """Run Ruff once over all files; None means the tool itself failed."""
+        issues: Dict[str, List[CodeIssue]] = {file_path: [] for file_path in files}
+
+        try:
+            with temp_workspace(files) as temp_paths:
+                # Ruff checks the files in parallel itself. Our result cache
+                # replaces Ruff's, which would fill up with temporary paths.
+                result = subprocess.run([
+                    'ruff', 'check', '--no-cache', '--output-format=json', *RUFF_CHECKS, *temp_paths
+                ], capture_output=True, timeout=30 * len(temp_paths))
+
+            if result.returncode > 1:
+                return None
+            for item in json_loads(result.stdout):
+                file_path = temp_paths.get(item.get('filename'))
+                if file_path is not None:
+                    issues[file_path].append(self._convert_ruff_issue(item, file_path))
+
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        return issues
+
+    def _convert_ruff_issue(self, item: Dict[str, Any], file_path: str) -> CodeIssue:
+        """Convert one entry of Ruff's JSON output to a CodeIssue."""
+        code = item.get('code')
+        if code in _SYNTAX_ERROR_CODES:
+            code = 'E999'
+        location = item.get('location') or {}
+        return self._to_issue(
+            file_path, location.get('row', 1), location.get('column'), code, item.get('message', '')
+        )
+
+    def get_name(self) -> str:
+        """Get analyzer name."""
+        return "Ruff"
+
+    def get_metrics(self, file_path: str, content: str) -> Dict[str, Any]:
+        """Get Ruff metrics."""
+        if not self.should_analyze(file_path):
+            return {}
+
+        # Served from the result cache when analyze() already ran on this content
+        issues = self.analyze(file_path, content)
+        return {
+            'ruff_issues_count': len(issues),
+            'ruff_files_analyzed': 1
+        }
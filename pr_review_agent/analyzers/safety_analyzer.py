@@ -1,8 +1,64 @@
 """Safety analyzer for dependency vulnerabilities."""
 
+import json
 import subprocess
-from typing import List, Dict, Any
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from pr_review_agent.core.models import CodeIssue, AnalysisConfig, IssueSeverity, IssueCategory
+from ._workspace import temp_workspace
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; its decode errors subclass json.JSONDecodeError
+    from json import loads as json_loads  # type: ignore[assignment]
+
+
+# Successful checks kept in memory, by requirements file content
+FINDINGS_CACHE_SIZE = 32
+
+# None stands for the installed packages, which do not change during a run
+_findings: "OrderedDict[Optional[str], Tuple[Any, ...]]" = OrderedDict()
+_findings_lock = threading.Lock()
+
+
+def _run_safety(*args: str) -> Optional[Tuple[Any, ...]]:
+    """Run `safety check --json` and return its findings, or None if it failed."""
+    try:
+        result = subprocess.run([
+            'safety', 'check', '--json', *args
+        ], capture_output=True, timeout=30)
+
+        if result.stdout:
+            return tuple(json_loads(result.stdout))
+    except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError):
+        pass
+    return None
+
+
+def _check(requirements: Optional[str]) -> Tuple[Any, ...]:
+    """Check the packages pinned in a requirements file, or the installed ones for None.
+
+    Failed runs find nothing and are not cached, so a later call retries them.
+    """
+    with _findings_lock:
+        if requirements in _findings:
+            _findings.move_to_end(requirements)
+            return _findings[requirements]
+
+    if requirements is None:
+        findings = _run_safety()
+    else:
+        with temp_workspace({'requirements.txt': requirements}, suffix='.txt') as temp_paths:
+            findings = _run_safety('-r', *temp_paths)
+    if findings is None:
+        return ()
+
+    with _findings_lock:
+        _findings[requirements] = findings
+        if len(_findings) > FINDINGS_CACHE_SIZE:
+            _findings.popitem(last=False)
+    return findings
 
 
 class SafetyAnalyzer:
@@ -15,28 +71,21 @@ class SafetyAnalyzer:
         if not self.should_analyze(file_path):
             return []
 
+        # Check the dependencies the PR proposes where they are listed;
+        # otherwise the installed environment
+        vulnerabilities = _check(content if file_path == 'requirements.txt' else None)
+
         issues = []
-        try:
-            result = subprocess.run([
-                'safety', 'check', '--json'
-            ], capture_output=True, text=True, timeout=30)
-
-            if result.stdout:
-                import json
-                data = json.loads(result.stdout)
-                for vuln in data:
-                    issues.append(CodeIssue(
-                        file_path=file_path,
-                        line_number=1,
-                        severity=IssueSeverity.HIGH,
-                        category=IssueCategory.SECURITY,
-                        message=f"Vulnerability in {vuln.get('package', 'unknown')}: {vuln.get('advisory', '')}",
-                        rule_id="safety",
-                        suggestion=f"Update {vuln.get('package', '')} to version {vuln.get('safe_version', 'latest')}"
-                    ))
-
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError):
-            pass
+        for vuln in vulnerabilities:
+            issues.append(CodeIssue(
+                file_path=file_path,
+                line_number=1,
+                severity=IssueSeverity.HIGH,
+                category=IssueCategory.SECURITY,
+                message=f"Vulnerability in {vuln.get('package', 'unknown')}: {vuln.get('advisory', '')}",
+                rule_id="safety",
+                suggestion=f"Update {vuln.get('package', '')} to version {vuln.get('safe_version', 'latest')}"
+            ))
 
         return issues
 
@@ -13,11 +13,28 @@ from dotenv import load_dotenv
 from .core.agent import PRReviewAgent
 from .core.models import AnalysisConfig, IssueSeverity
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the json module is used without it
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
 console = Console()
 
+# Rich style for each issue severity in the issues table
+SEVERITY_COLORS = {
+    "low": "green",
+    "medium": "yellow",
+    "high": "red",
+    "critical": "bold red"
+}
+
+# Issues shown in the text report, and the message length they are cut to
+MAX_TABLE_ISSUES = 20
+MAX_MESSAGE_LENGTH = 100
+
 
 @click.group()
 @click.version_option(version="1.0.0")
@@ -135,26 +152,25 @@ def _display_text_output(result):
         table.add_column("Category", justify="center")
         table.add_column("Message", style="white")
         
-        for issue in result.feedback.issues[:20]:  # Show first 20 issues
-            severity_color = {
-                "low": "green",
-                "medium": "yellow", 
-                "high": "red",
-                "critical": "bold red"
-            }.get(issue.severity.value, "white")
+        for issue in result.feedback.issues[:MAX_TABLE_ISSUES]:
+            severity = issue.severity.value
+            severity_color = SEVERITY_COLORS.get(severity, "white")
+            message = issue.message
+            if len(message) > MAX_MESSAGE_LENGTH:
+                message = message[:MAX_MESSAGE_LENGTH] + "..."
             
             table.add_row(
                 issue.file_path,
                 str(issue.line_number),
-                f"[{severity_color}]{issue.severity.value.upper()}[/{severity_color}]",
+                f"[{severity_color}]{severity.upper()}[/{severity_color}]",
                 issue.category.value,
-                issue.message[:100] + "..." if len(issue.message) > 100 else issue.message
+                message
             )
         
         console.print(table)
         
-        if len(result.feedback.issues) > 20:
-            console.print(f"\n[dim]... and {len(result.feedback.issues) - 20} more issues[/dim]")
+        if len(result.feedback.issues) > MAX_TABLE_ISSUES:
+            console.print(f"\n[dim]... and {len(result.feedback.issues) - MAX_TABLE_ISSUES} more issues[/dim]")
     
     # Suggestions
     if result.feedback.suggestions:
@@ -191,7 +207,12 @@ def _display_json_output(result):
         "provider": result.provider
     }
     
-    console.print(json.dumps(output, indent=2, default=str))
+    # Echoed rather than printed through rich, which would wrap long lines
+    # and read square brackets in titles as markup
+    if orjson is not None:
+        click.echo(orjson.dumps(output, option=orjson.OPT_INDENT_2, default=str))
+    else:
+        click.echo(json.dumps(output, indent=2, default=str))
 
 
 @main.command()
@@ -222,8 +243,13 @@ def diff(provider, repo, pr):
         return
     
     try:
-        diff_content = pr_provider.get_diff(repo, pr)
-        console.print(diff_content)
+        if hasattr(pr_provider, 'iter_diff'):
+            # Shown as it downloads; written raw, as brackets in a diff are not markup
+            for chunk in pr_provider.iter_diff(repo, pr):
+                console.out(chunk, end="", highlight=False)
+        else:
+            diff_content = pr_provider.get_diff(repo, pr)
+            console.print(diff_content)
     except Exception as e:
         console.print(f"[red]Error fetching diff: {e}[/red]")
 
@@ -1,14 +1,55 @@
 """Main PR Review Agent implementation."""
 
 import time
-from typing import List, Optional, Dict, Any
-from .models import PRReviewResult, ReviewFeedback, CodeIssue, AnalysisConfig, PRInfo
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple
+from .models import PRReviewResult, ReviewFeedback, CodeIssue, AnalysisConfig, PRInfo, IssueSeverity
 from ..providers import GitHubProvider, GitLabProvider, BitbucketProvider
-from ..analyzers import (
-    PylintAnalyzer, Flake8Analyzer, BlackAnalyzer, MyPyAnalyzer,
-    BanditAnalyzer, SafetyAnalyzer, AIAnalyzer
+
+
+# Config flag enabling each built-in analyzer, in the order they run
+ANALYZER_FLAGS = (
+    ("enable_pylint", "PylintAnalyzer"),
+    ("enable_flake8", "Flake8Analyzer"),
+    ("enable_black", "BlackAnalyzer"),
+    ("enable_mypy", "MyPyAnalyzer"),
+    ("enable_bandit", "BanditAnalyzer"),
+    ("enable_safety", "SafetyAnalyzer"),
+    ("enable_ai_analysis", "AIAnalyzer"),
 )
 
+# Provider class for each supported git server
+PROVIDERS = {
+    "github": GitHubProvider,
+    "gitlab": GitLabProvider,
+    "bitbucket": BitbucketProvider,
+}
+
+# Concurrent file downloads; below requests' default pool of 10 connections
+# per host, so every download reuses a kept-alive connection
+FETCH_WORKERS = 8
+
+# Binary files, images, etc. are never analyzed (matched case-insensitively)
+_SKIP_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico',
+                  '.pdf', '.zip', '.tar', '.gz', '.exe', '.dll')
+
+# IssueSeverity is a str enum, so these also accept the plain values ("low", ...)
+_SEVERITY_LEVEL = {
+    IssueSeverity.LOW: 1,
+    IssueSeverity.MEDIUM: 2,
+    IssueSeverity.HIGH: 3,
+    IssueSeverity.CRITICAL: 4
+}
+
+# Score deducted per issue, before scaling by the number of files
+_SEVERITY_PENALTY = {
+    IssueSeverity.LOW: 0.1,
+    IssueSeverity.MEDIUM: 0.3,
+    IssueSeverity.HIGH: 0.7,
+    IssueSeverity.CRITICAL: 1.5
+}
+
 
 class PRReviewAgent:
     """Main PR Review Agent for analyzing pull requests."""
@@ -17,27 +58,31 @@ class PRReviewAgent:
         """Initialize the PR Review Agent."""
         self.config = config or AnalysisConfig()
         self.analyzers = self._initialize_analyzers()
+        # One provider per git server, so later reviews reuse its HTTP connections
+        self._providers: Dict[str, Any] = {}
 
-    def _initialize_analyzers(self) -> List:
+    def _initialize_analyzers(self) -> tuple:
         """Initialize all enabled analyzers."""
-        analyzers = []
-        
-        if self.config.enable_pylint:
-            analyzers.append(PylintAnalyzer(self.config))
-        if self.config.enable_flake8:
-            analyzers.append(Flake8Analyzer(self.config))
-        if self.config.enable_black:
-            analyzers.append(BlackAnalyzer(self.config))
-        if self.config.enable_mypy:
-            analyzers.append(MyPyAnalyzer(self.config))
-        if self.config.enable_bandit:
-            analyzers.append(BanditAnalyzer(self.config))
-        if self.config.enable_safety:
-            analyzers.append(SafetyAnalyzer(self.config))
-        if self.config.enable_ai_analysis:
-            analyzers.append(AIAnalyzer(self.config))
-
-        return analyzers
+        # Analyzer modules are only imported when enabled
+        from .. import analyzers as analyzer_classes
+
+        return tuple(
+            getattr(analyzer_classes, self._analyzer_class_name(class_name))(self.config)
+            for flag, class_name in ANALYZER_FLAGS
+            if getattr(self.config, flag)
+        )
+
+    def _analyzer_class_name(self, class_name: str) -> str:
+        """Swap in Ruff for Flake8 when it is enabled and installed."""
+        if class_name == "Flake8Analyzer" and self.config.use_ruff:
+            from ..analyzers.ruff_analyzer import ruff_available
+            if ruff_available():
+                return "RuffAnalyzer"
+        return class_name
+
+    def register(self, analyzer: Any) -> None:
+        """Add a custom analyzer, run after the built-in ones."""
+        self.analyzers = self.analyzers + (analyzer,)
 
     def review_pr(self, provider: str, repo: str, pr_number: int, 
                   post_comments: bool = False) -> PRReviewResult:
@@ -54,21 +99,67 @@ class PRReviewAgent:
         all_issues = []
         all_metrics = {}
         
-        for file_path in pr_info.files_changed:
-            if self._should_analyze_file(file_path):
-                try:
-                    # Get file content
-                    content = pr_provider.get_file_content(repo, file_path, pr_info.head_branch)
-                    
-                    # Run all analyzers on the file
-                    file_issues, file_metrics = self._analyze_file(file_path, content)
-                    all_issues.extend(file_issues)
-                    all_metrics[file_path] = file_metrics
-                    
-                except Exception as e:
-                    # Log error but continue with other files
-                    print(f"Error analyzing {file_path}: {e}")
-                    continue
+        # Don't download files that no enabled analyzer would look at
+        wanted = [
+            file_path for file_path in pr_info.files_changed
+            if self._should_analyze_file(file_path)
+            and any(analyzer.should_analyze(file_path) for analyzer in self.analyzers)
+        ]
+
+        # Downloads spend their time waiting on the network, so they overlap
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            downloads = {
+                file_path: executor.submit(pr_provider.get_file_content, repo, file_path, pr_info.head_branch)
+                for file_path in wanted
+            }
+
+        files = {}
+        for file_path, download in downloads.items():
+            try:
+                files[file_path] = download.result()
+            except Exception as e:
+                # Log error but continue with other files
+                print(f"Error analyzing {file_path}: {e}")
+                continue
+
+        # Files and analyzers are independent, so each (file, analyzer) pair
+        # runs on a worker thread; the subprocess-backed analyzers release
+        # the GIL while they wait, so a file takes as long as its slowest tool
+        threshold = self._get_severity_level(self.config.severity_threshold)
+        with ThreadPoolExecutor() as executor:
+            batch_futures = self._submit_batch_analyzers(executor, files)
+            pending = {
+                (file_path, analyzer): executor.submit(self._run_analyzer, analyzer, file_path, content)
+                for file_path, content in files.items()
+                for analyzer in self.analyzers
+                if analyzer not in batch_futures and analyzer.should_analyze(file_path)
+            }
+
+            batch_results = self._collect_batch_results(batch_futures)
+            for analyzer in batch_futures:
+                for file_path, content in files.items():
+                    if analyzer.should_analyze(file_path):
+                        pending[file_path, analyzer] = executor.submit(
+                            self._run_analyzer, analyzer, file_path, content, batch_results
+                        )
+
+            for file_path in files:
+                issues = []
+                metrics = {}
+                for analyzer in self.analyzers:
+                    future = pending.get((file_path, analyzer))
+                    if future is None:
+                        continue
+                    try:
+                        file_issues, file_metrics = future.result()
+                    except Exception as e:
+                        print(f"Error in {analyzer.get_name()}: {e}")
+                        continue
+                    issues.extend(file_issues)
+                    metrics.update(file_metrics)
+                # Only issues that can be reported are kept for the rest of the review
+                all_issues.extend(self._select_issues(issues, threshold))
+                all_metrics[file_path] = metrics
 
         # Generate feedback
         feedback = self._generate_feedback(all_issues, all_metrics, pr_info)
@@ -89,62 +180,116 @@ class PRReviewAgent:
 
     def _get_provider(self, provider: str):
         """Get the appropriate provider instance."""
-        if provider.lower() == "github":
-            return GitHubProvider()
-        elif provider.lower() == "gitlab":
-            return GitLabProvider()
-        elif provider.lower() == "bitbucket":
-            return BitbucketProvider()
-        else:
-            raise ValueError(f"Unsupported provider: {provider}")
+        key = provider.lower()
+        if key not in self._providers:
+            if key not in PROVIDERS:
+                raise ValueError(f"Unsupported provider: {provider}")
+            self._providers[key] = PROVIDERS[key]()
+        return self._providers[key]
 
     def _should_analyze_file(self, file_path: str) -> bool:
         """Check if a file should be analyzed."""
         # Skip binary files, images, etc.
-        skip_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', 
-                          '.pdf', '.zip', '.tar', '.gz', '.exe', '.dll'}
-        
-        if any(file_path.lower().endswith(ext) for ext in skip_extensions):
+        if file_path.lower().endswith(_SKIP_SUFFIXES):
             return False
             
         # Only analyze text files
         return True
 
-    def _analyze_file(self, file_path: str, content: str) -> tuple[List[CodeIssue], Dict[str, Any]]:
+    def _submit_batch_analyzers(self, executor: ThreadPoolExecutor,
+                                files: Dict[str, str]) -> Dict[Any, Future]:
+        """Start one analyze_many run over all files per analyzer that supports it."""
+        if len(files) < 2:
+            return {}
+        return {
+            analyzer: executor.submit(analyzer.analyze_many, files)
+            for analyzer in self.analyzers
+            if hasattr(analyzer, 'analyze_many')
+        }
+
+    def _collect_batch_results(self, futures: Dict[Any, Future]
+                               ) -> Dict[Any, Dict[str, List[CodeIssue]]]:
+        """Wait for the batch runs; failed analyzers are left out."""
+        batch_results = {}
+        for analyzer, future in futures.items():
+            try:
+                batch_results[analyzer] = future.result()
+            except Exception as e:
+                # Fall back to per-file analysis for this analyzer
+                print(f"Error in {analyzer.get_name()}: {e}")
+        return batch_results
+
+    def _run_analyzer(self, analyzer: Any, file_path: str, content: str,
+                      batch_results: Optional[Dict[Any, Dict[str, List[CodeIssue]]]] = None
+                      ) -> tuple[List[CodeIssue], Dict[str, Any]]:
+        """Return one analyzer's issues and metrics for a file."""
+        if batch_results and analyzer in batch_results:
+            return batch_results[analyzer].get(file_path, []), analyzer.get_metrics(file_path, content)
+        if hasattr(analyzer, 'analyze_with_metrics'):
+            combined: Tuple[List[CodeIssue], Dict[str, Any]] = analyzer.analyze_with_metrics(file_path, content)
+            return combined
+        return analyzer.analyze(file_path, content), analyzer.get_metrics(file_path, content)
+
+    def _analyze_file(self, file_path: str, content: str,
+                      batch_results: Optional[Dict[Any, Dict[str, List[CodeIssue]]]] = None
+                      ) -> tuple[List[CodeIssue], Dict[str, Any]]:
         """Analyze a single file with all enabled analyzers."""
         issues = []
         metrics = {}
-        
-        for analyzer in self.analyzers:
-            if analyzer.should_analyze(file_path):
-                try:
-                    file_issues = analyzer.analyze(file_path, content)
-                    issues.extend(file_issues)
-                    
-                    file_metrics = analyzer.get_metrics(file_path, content)
-                    metrics.update(file_metrics)
-                    
-                except Exception as e:
-                    print(f"Error in {analyzer.get_name()}: {e}")
-                    continue
+
+        # The analyzers are independent; running them side by side makes the
+        # file take as long as its slowest tool rather than their sum
+        applicable = [analyzer for analyzer in self.analyzers if analyzer.should_analyze(file_path)]
+        with ThreadPoolExecutor(max_workers=max(1, len(applicable))) as executor:
+            futures = [
+                (analyzer, executor.submit(self._run_analyzer, analyzer, file_path, content, batch_results))
+                for analyzer in applicable
+            ]
+
+        # Merged in analyzer order, as review_pr does
+        for analyzer, future in futures:
+            try:
+                file_issues, file_metrics = future.result()
+                issues.extend(file_issues)
+                metrics.update(file_metrics)
+                
+            except Exception as e:
+                print(f"Error in {analyzer.get_name()}: {e}")
+                continue
         
         return issues, metrics
 
+    def _select_issues(self, issues: List[CodeIssue], threshold: int) -> List[CodeIssue]:
+        """Keep a file's issues at or above the threshold, at most max_issues_per_file of them."""
+        issues = [issue for issue in issues if _SEVERITY_LEVEL.get(issue.severity, 2) >= threshold]
+
+        limit = self.config.max_issues_per_file
+        if len(issues) > limit >= 0:
+            # The most severe issues win; ties and the result keep analyzer order
+            ranked = sorted(range(len(issues)), key=lambda index: -_SEVERITY_LEVEL.get(issues[index].severity, 2))
+            kept = set(ranked[:limit])
+            issues = [issue for index, issue in enumerate(issues) if index in kept]
+        return issues
+
     def _generate_feedback(self, issues: List[CodeIssue], metrics: Dict[str, Any], 
                           pr_info: PRInfo) -> ReviewFeedback:
         """Generate comprehensive feedback from analysis results."""
         
         # Filter issues by severity threshold
+        threshold = self._get_severity_level(self.config.severity_threshold)
         filtered_issues = [
             issue for issue in issues 
-            if self._get_severity_level(issue.severity) >= self._get_severity_level(self.config.severity_threshold)
+            if _SEVERITY_LEVEL.get(issue.severity, 2) >= threshold
         ]
         
+        # Issues are tallied by severity once, for the score and the summary
+        severity_counts = Counter(issue.severity for issue in filtered_issues)
+
         # Calculate overall score
-        score = self._calculate_score(filtered_issues, pr_info)
+        score = self._calculate_score(filtered_issues, pr_info, severity_counts)
         
         # Generate summary
-        summary = self._generate_summary(filtered_issues, pr_info)
+        summary = self._generate_summary(filtered_issues, pr_info, severity_counts)
         
         # Extract suggestions and strengths
         suggestions = self._extract_suggestions(filtered_issues)
@@ -165,15 +310,10 @@ class PRReviewAgent:
 
     def _get_severity_level(self, severity) -> int:
         """Convert severity to numeric level for comparison."""
-        levels = {
-            "low": 1,
-            "medium": 2, 
-            "high": 3,
-            "critical": 4
-        }
-        return levels.get(severity.value if hasattr(severity, 'value') else severity, 2)
+        return _SEVERITY_LEVEL.get(severity, 2)
 
-    def _calculate_score(self, issues: List[CodeIssue], pr_info: PRInfo) -> float:
+    def _calculate_score(self, issues: List[CodeIssue], pr_info: PRInfo,
+                         severity_counts: Optional[Counter] = None) -> float:
         """Calculate overall PR quality score (0-10)."""
         if not issues:
             return 10.0
@@ -182,20 +322,11 @@ class PRReviewAgent:
         base_score = 10.0
         
         # Deduct points based on issue severity and count
-        severity_penalties = {
-            "low": 0.1,
-            "medium": 0.3,
-            "high": 0.7,
-            "critical": 1.5
-        }
-        
-        total_penalty = 0
-        for issue in issues:
-            penalty = severity_penalties.get(
-                issue.severity.value if hasattr(issue.severity, 'value') else issue.severity, 
-                0.3
-            )
-            total_penalty += penalty
+        if severity_counts is None:
+            severity_counts = Counter(issue.severity for issue in issues)
+        total_penalty = sum(
+            _SEVERITY_PENALTY.get(severity, 0.3) * count for severity, count in severity_counts.items()
+        )
         
         # Normalize by file count to avoid penalizing large PRs unfairly
         file_count = len(pr_info.files_changed)
@@ -205,7 +336,8 @@ class PRReviewAgent:
         score = max(0.0, base_score - total_penalty)
         return round(score, 1)
 
-    def _generate_summary(self, issues: List[CodeIssue], pr_info: PRInfo) -> str:
+    def _generate_summary(self, issues: List[CodeIssue], pr_info: PRInfo,
+                          severity_counts: Optional[Counter] = None) -> str:
         """Generate a summary of the PR review."""
         issue_count = len(issues)
         
@@ -213,10 +345,8 @@ class PRReviewAgent:
             return f"✅ Great work! No issues found in this {pr_info.additions + pr_info.deletions} line change across {len(pr_info.files_changed)} files."
         
         # Count issues by severity
-        severity_counts = {}
-        for issue in issues:
-            severity = issue.severity.value if hasattr(issue.severity, 'value') else issue.severity
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
+        if severity_counts is None:
+            severity_counts = Counter(issue.severity for issue in issues)
         
         summary_parts = [f"Found {issue_count} issues in {len(pr_info.files_changed)} files:"]
         
@@ -228,12 +358,8 @@ class PRReviewAgent:
         return " ".join(summary_parts)
 
     def _extract_suggestions(self, issues: List[CodeIssue]) -> List[str]:
-        """Extract unique suggestions from issues."""
-        suggestions = set()
-        for issue in issues:
-            if issue.suggestion:
-                suggestions.add(issue.suggestion)
-        return list(suggestions)
+        """Extract unique suggestions from issues, in the order they first appear."""
+        return list(dict.fromkeys(issue.suggestion for issue in issues if issue.suggestion))
 
     def _extract_strengths(self, issues: List[CodeIssue], pr_info: PRInfo) -> List[str]:
         """Extract strengths from the PR."""
@@ -246,14 +372,19 @@ class PRReviewAgent:
         if len(pr_info.files_changed) <= 10:
             strengths.append("Focused changes across reasonable number of files")
         
-        # Check for documentation
-        doc_files = [f for f in pr_info.files_changed if any(ext in f.lower() for ext in ['.md', '.rst', '.txt'])]
-        if doc_files:
+        # Check for documentation and tests in one pass over the file names
+        has_docs = has_tests = False
+        for file_path in pr_info.files_changed:
+            lowered = file_path.lower()
+            has_docs = has_docs or '.md' in lowered or '.rst' in lowered or '.txt' in lowered
+            has_tests = has_tests or 'test' in lowered
+            if has_docs and has_tests:
+                break
+
+        if has_docs:
             strengths.append("Includes documentation updates")
         
-        # Check for tests
-        test_files = [f for f in pr_info.files_changed if 'test' in f.lower()]
-        if test_files:
+        if has_tests:
             strengths.append("Includes test updates")
         
         return strengths
@@ -272,15 +403,20 @@ class PRReviewAgent:
         # Post overall summary
         provider.post_comment(repo, pr_number, f"## PR Review Summary\n\n{feedback.summary}")
         
-        # Post individual issue comments for high/critical issues
+        # Post one comment per line for high/critical issues; several tools
+        # often flag the same line
+        comments_by_line: Dict[Tuple[str, Optional[int]], List[str]] = {}
         for issue in feedback.issues:
             if issue.severity.value in ["high", "critical"]:
                 comment = f"**{issue.severity.value.upper()}**: {issue.message}"
                 if issue.suggestion:
                     comment += f"\n\n**Suggestion**: {issue.suggestion}"
-                
-                provider.post_comment(
-                    repo, pr_number, comment, 
-                    file_path=issue.file_path, 
-                    line_number=issue.line_number
-                )
+                comments_by_line.setdefault((issue.file_path, issue.line_number), []).append(comment)
+
+        # Posted one at a time: git servers rate limit concurrent writes
+        for (file_path, line_number), comments in comments_by_line.items():
+            provider.post_comment(
+                repo, pr_number, "\n\n".join(comments), 
+                file_path=file_path, 
+                line_number=line_number
+            )
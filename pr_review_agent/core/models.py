@@ -79,6 +79,7 @@ class AnalysisConfig(BaseModel):
     """Configuration for code analysis."""
     enable_pylint: bool = True
     enable_flake8: bool = True
+    use_ruff: bool = False  # opt in to running the Flake8 checks with Ruff when it is installed
     enable_black: bool = True
     enable_mypy: bool = True
     enable_bandit: bool = True
@@ -0,0 +1,142 @@
+"""Conditional GETs for provider APIs.
+
+Successful responses that carry an ETag are kept under ``CACHE_DIR/http``.
+Later requests for the same resource send ``If-None-Match``; when the server
+answers 304 Not Modified, the stored response is returned instead. Unchanged
+resources then cost no body transfer and, on GitHub, no rate-limit quota.
+Past ``HTTP_CACHE_BYTES`` the least recently used responses are deleted.
+
+Stored bodies can hold private repository contents, so only the current
+user can read them. Set ``PR_REVIEW_HTTP_CACHE=0`` to store nothing.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+import requests
+
+from ..analyzers._cache import CACHE_DIR
+
+# Response headers kept with a stored body; Link carries the next page
+_KEPT_HEADERS = ('Content-Type', 'ETag', 'Link')
+
+# False when PR_REVIEW_HTTP_CACHE=0; every request is then a plain GET
+HTTP_CACHE_ENABLED = os.environ.get('PR_REVIEW_HTTP_CACHE', '1') != '0'
+
+# Size the stored responses are pruned back to
+HTTP_CACHE_BYTES = 256 * 1024 * 1024
+
+# Bytes stored since the cache was last pruned; None before the first prune
+_written: Optional[int] = None
+_written_lock = threading.Lock()
+
+
+def _entry_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, 'http', key[:2], key)
+
+
+def _load(key: str) -> Optional[Tuple[str, requests.Response]]:
+    """Return the stored ETag and response for key, or None on a miss."""
+    try:
+        with open(_entry_path(key), 'rb') as entry:
+            meta, _, content = entry.read().partition(b'\n')
+        meta = json.loads(meta)
+    except (OSError, ValueError):
+        # Missing, unreadable or corrupt entries are treated as misses
+        return None
+
+    response = requests.Response()
+    response.status_code = 200
+    response.url = meta['url']
+    response.encoding = meta['encoding']
+    response.headers.update(meta['headers'])
+    response._content = content
+    return meta['etag'], response
+
+
+def _store(key: str, etag: str, response: requests.Response) -> None:
+    """Persist response under key; failures are ignored."""
+    meta = json.dumps({
+        'etag': etag,
+        'url': response.url,
+        'encoding': response.encoding,
+        'headers': {name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers},
+    })
+    path = _entry_path(key)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        # makedirs() applies the mode to the last directory only
+        os.makedirs(os.path.join(CACHE_DIR, 'http'), mode=0o700, exist_ok=True)
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as entry:
+            entry.write(meta.encode('utf-8') + b'\n' + response.content)
+        # Atomic rename so concurrent readers never see a partial entry
+        os.replace(temp_path, path)
+    except OSError:
+        return
+
+    global _written
+    with _written_lock:
+        # Pruned when first written to in a process, then after every
+        # quarter of the budget so a long-running server stays bounded
+        due = _written is None or _written > HTTP_CACHE_BYTES // 4
+        _written = 0 if due else (_written or 0) + len(response.content)
+    if due:
+        prune()
+
+
+def prune() -> None:
+    """Delete the least recently used responses until the cache fits HTTP_CACHE_BYTES."""
+    entries = []
+    for directory, _, names in os.walk(os.path.join(CACHE_DIR, 'http')):
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= HTTP_CACHE_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def conditional_get(session: requests.Session, url: str, params: Optional[Dict[str, str]] = None,
+                    headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    """Like session.get(), revalidating a stored copy of the response when there is one."""
+    if not HTTP_CACHE_ENABLED:
+        return session.get(url, params=params, headers=headers)
+
+    # The same URL can be served in several formats (GitHub diffs), so the
+    # Accept header is part of the key
+    accept = (headers or {}).get('Accept') or session.headers.get('Accept', '')
+    key = hashlib.sha256(json.dumps([url, sorted((params or {}).items()), accept]).encode('utf-8')).hexdigest()
+
+    cached = _load(key)
+    request_headers = dict(headers or {})
+    if cached is not None:
+        request_headers['If-None-Match'] = cached[0]
+
+    response = session.get(url, params=params, headers=request_headers)
+    if response.status_code == 304 and cached is not None:
+        try:
+            # Marks the entry as recently used for prune()
+            os.utime(_entry_path(key))
+        except OSError:
+            pass
+        return cached[1]
+
+    etag = response.headers.get('ETag')
+    if etag and response.status_code == 200:
+        _store(key, etag, response)
+    return response
@@ -1,9 +1,158 @@
 """Base provider interface for git servers."""
 
+import logging
+import os
+import re
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Iterator, List, Optional, Tuple, TypeVar, cast
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from ..core.models import PRInfo
 
+logger = logging.getLogger(__name__)
+
+# Kept-alive connections per host; enough for the agent's concurrent
+# file downloads
+POOL_SIZE = 16
+
+# Rate limiting and transient server errors are retried with backoff, or
+# after the server's Retry-After delay when it sends one. Only idempotent
+# methods are retried, so a comment is never posted twice.
+RETRY = Retry(total=3, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+
+# Requests left in the rate-limit window below which the next request
+# waits for the window to reset, instead of failing with 403/429
+RATE_LIMIT_RESERVE = 5
+
+# Longest wait, in seconds, for a rate-limit reset; past it the request goes
+# ahead and fails instead. GitHub's window is an hour, so by default every
+# reset is waited for; set PR_REVIEW_MAX_RATE_LIMIT_WAIT to stall less.
+MAX_RATE_LIMIT_WAIT = float(os.environ.get('PR_REVIEW_MAX_RATE_LIMIT_WAIT') or 3600)
+
+# Bytes read at a time when streaming a diff
+DIFF_CHUNK_SIZE = 65536
+
+# File contents kept in memory per provider
+CONTENT_CACHE_SIZE = 512
+
+# Full SHA-1 or SHA-256 commit ids; branch and tag names can move
+_COMMIT_ID = re.compile(r"[0-9a-f]{40}|[0-9a-f]{64}")
+
+try:
+    from ciso8601 import parse_datetime as parse_timestamp
+except ImportError:  # ciso8601 is optional; it parses the same timestamps faster
+    def parse_timestamp(datetime_string: str) -> datetime:
+        """Parse an ISO 8601 timestamp from an API response."""
+        # fromisoformat() only accepts a trailing Z from Python 3.11
+        return datetime.fromisoformat(datetime_string.replace("Z", "+00:00"))
+
+
+def pooled_session() -> requests.Session:
+    """Return a session that keeps connections alive, retries transient
+    failures and slows down before exhausting the API rate limit.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=POOL_SIZE, max_retries=RETRY)
+    # Self-hosted servers may be plain HTTP
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.hooks["response"].append(wait_for_rate_limit)
+    return session
+
+
+def wait_for_rate_limit(response: requests.Response, *args: Any, **kwargs: Any) -> None:
+    """Sleep until the rate-limit window resets if response left too few requests.
+
+    Reads GitHub's X-RateLimit-* and GitLab's RateLimit-* headers; the reset
+    is a Unix timestamp in both.
+    """
+    headers = response.headers
+    remaining = headers.get("X-RateLimit-Remaining", headers.get("RateLimit-Remaining"))
+    reset = headers.get("X-RateLimit-Reset", headers.get("RateLimit-Reset"))
+    try:
+        if remaining is None or reset is None or int(remaining) >= RATE_LIMIT_RESERVE:
+            return
+        wait = int(reset) - time.time()
+    except ValueError:
+        return
+    if wait <= 0:
+        return
+    if wait > MAX_RATE_LIMIT_WAIT:
+        logger.warning("Rate limit nearly used up (%s left) and resets in %.0fs, over the %.0fs cap; not waiting",
+                       remaining, wait, MAX_RATE_LIMIT_WAIT)
+        return
+    logger.warning("Rate limit nearly used up (%s left); waiting %.0fs for it to reset", remaining, wait)
+    time.sleep(wait)
+
+
+def iter_text(response: requests.Response) -> Iterator[str]:
+    """Yield a streamed response's body as text, in chunks as it downloads."""
+    # Decoded incrementally, so an undeclared charset cannot be guessed from
+    # the whole body; requests' ISO-8859-1 default for text/* would garble
+    # UTF-8 source
+    if "charset" not in response.headers.get("Content-Type", "").lower():
+        response.encoding = "utf-8"
+    chunks = response.iter_content(chunk_size=DIFF_CHUNK_SIZE, decode_unicode=True)
+    yield from cast(Iterator[str], chunks)
+
+
+class ContentCache:
+    """File contents at commit ids, least recently used evicted first.
+
+    Content at a commit never changes, so entries need no expiry or
+    revalidation. Contents at branch or tag names are not kept; those go
+    through the ETag-revalidated response cache instead.
+    """
+
+    def __init__(self, size: int = CONTENT_CACHE_SIZE):
+        self.size = size
+        self._contents: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, repo: str, file_path: str, ref: str) -> Optional[str]:
+        """Return the cached content of file_path at ref, or None on a miss."""
+        key = (repo, file_path, ref)
+        with self._lock:
+            content = self._contents.get(key)
+            if content is not None:
+                self._contents.move_to_end(key)
+            return content
+
+    def put(self, repo: str, file_path: str, ref: str, content: str) -> None:
+        """Store content if ref is a commit id."""
+        if not _COMMIT_ID.fullmatch(ref):
+            return
+        key = (repo, file_path, ref)
+        with self._lock:
+            self._contents[key] = content
+            self._contents.move_to_end(key)
+            if len(self._contents) > self.size:
+                self._contents.popitem(last=False)
+
+
+_Owner = TypeVar("_Owner", bound="SessionOwner")
+
+
+class SessionOwner:
+    """Closes a provider's HTTP session; providers are also context managers."""
+
+    session: requests.Session
+
+    def close(self) -> None:
+        """Close the provider's pooled connections."""
+        self.session.close()
+
+    def __enter__(self: _Owner) -> _Owner:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
 
 class PRProvider(ABC):
     """Abstract base class for PR providers."""
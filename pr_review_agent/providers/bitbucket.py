@@ -1,12 +1,20 @@
 """Bitbucket provider implementation."""
 
-import requests
-from typing import List, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
 from pr_review_agent.core.models import PRInfo
+from .base import SessionOwner, iter_text, parse_timestamp, pooled_session
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; both parse the raw response bytes
+    from json import loads as json_loads  # type: ignore[assignment]
 
-class BitbucketProvider:
+# Entries per page of a paginated listing (Bitbucket's documented maximum)
+PAGE_LENGTH = 100
+
+
+class BitbucketProvider(SessionOwner):
     """Bitbucket API provider for pull requests."""
 
     def __init__(self, username: Optional[str] = None, password: Optional[str] = None, 
@@ -16,7 +24,7 @@ class BitbucketProvider:
         self.password = password
         self.base_url = base_url.rstrip("/")
         self.api_url = f"{self.base_url}/2.0"
-        self.session = requests.Session()
+        self.session = pooled_session()
         
         if self.username and self.password:
             self.session.auth = (self.username, self.password)
@@ -24,34 +32,39 @@ class BitbucketProvider:
     def get_pr_info(self, repo: str, pr_number: int) -> PRInfo:
         """Fetch pull request information from Bitbucket."""
         url = f"{self.api_url}/repositories/{repo}/pullrequests/{pr_number}"
-        response = self.session.get(url)
-        response.raise_for_status()
+        # The file list and commit count are fetched alongside the pull request itself
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            files = executor.submit(self.get_pr_files, repo, pr_number)
+            commits = executor.submit(self._get_commit_count, repo, pr_number)
+            response = self.session.get(url)
+            response.raise_for_status()
+            files_changed = files.result()
+            commit_count = commits.result()
         
-        data = response.json()
+        data = json_loads(response.content)
         
         return PRInfo(
             number=data["id"],
             title=data["title"],
             description=data["description"] or "",
             author=data["author"]["display_name"],
-            created_at=datetime.fromisoformat(data["created_on"].replace("Z", "+00:00")),
-            updated_at=datetime.fromisoformat(data["updated_on"].replace("Z", "+00:00")),
+            created_at=parse_timestamp(data["created_on"]),
+            updated_at=parse_timestamp(data["updated_on"]),
             base_branch=data["destination"]["branch"]["name"],
             head_branch=data["source"]["branch"]["name"],
-            files_changed=self.get_pr_files(repo, pr_number),
+            files_changed=files_changed,
             additions=data["summary"]["additions"],
             deletions=data["summary"]["deletions"],
-            commits=len(self.get_commits(repo, pr_number))
+            commits=commit_count
         )
 
     def get_pr_files(self, repo: str, pr_number: int) -> List[str]:
         """Get list of files changed in the PR."""
         url = f"{self.api_url}/repositories/{repo}/pullrequests/{pr_number}/diffstat"
-        response = self.session.get(url)
-        response.raise_for_status()
-        
-        data = response.json()
-        return [file["new"]["path"] for file in data["values"] if "new" in file]
+        # Only the paths are needed, not the per-file line counts and links
+        pages = self._pages(url, {"fields": "values.new.path,next", "pagelen": PAGE_LENGTH})
+        # Deleted files have no new side
+        return [file["new"]["path"] for page in pages for file in page["values"] if file.get("new")]
 
     def get_file_content(self, repo: str, file_path: str, ref: str) -> str:
         """Get file content at a specific reference."""
@@ -63,11 +76,14 @@ class BitbucketProvider:
 
     def get_diff(self, repo: str, pr_number: int) -> str:
         """Get the diff for the pull request."""
+        return "".join(self.iter_diff(repo, pr_number))
+
+    def iter_diff(self, repo: str, pr_number: int) -> Iterator[str]:
+        """Yield the diff for the pull request in chunks as it downloads."""
         url = f"{self.api_url}/repositories/{repo}/pullrequests/{pr_number}/diff"
-        response = self.session.get(url)
-        response.raise_for_status()
-        
-        return response.text
+        with self.session.get(url, stream=True) as response:
+            response.raise_for_status()
+            yield from iter_text(response)
 
     def post_comment(self, repo: str, pr_number: int, comment: str, 
                     file_path: Optional[str] = None, 
@@ -92,8 +108,27 @@ class BitbucketProvider:
     def get_commits(self, repo: str, pr_number: int) -> List[dict]:
         """Get commits in the pull request."""
         url = f"{self.api_url}/repositories/{repo}/pullrequests/{pr_number}/commits"
-        response = self.session.get(url)
-        response.raise_for_status()
-        
-        data = response.json()
-        return data["values"]
+        return [commit for page in self._pages(url, {"pagelen": PAGE_LENGTH}) for commit in page["values"]]
+
+    def _get_commit_count(self, repo: str, pr_number: int) -> int:
+        """Count the PR's commits without downloading their details."""
+        url = f"{self.api_url}/repositories/{repo}/pullrequests/{pr_number}/commits"
+        count = 0
+        for page in self._pages(url, {"fields": "size,values.hash,next", "pagelen": PAGE_LENGTH}):
+            # Commit listings are not always sized; count the pages otherwise
+            if "size" in page:
+                return int(page["size"])
+            count += len(page["values"])
+        return count
+
+    def _pages(self, url: str, params: Optional[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield every page of a paginated listing, following its next links."""
+        while url:
+            response = self.session.get(url, params=params)
+            response.raise_for_status()
+
+            page = json_loads(response.content)
+            yield page
+            # The next link already carries the query parameters
+            url = page.get("next")
+            params = None
@@ -1,19 +1,42 @@
 """GitHub provider implementation."""
 
-import requests
-from typing import List, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
 from pr_review_agent.core.models import PRInfo
+from .base import ContentCache, SessionOwner, iter_text, parse_timestamp, pooled_session
+from ._http_cache import conditional_get
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; both parse the raw response bytes
+    from json import loads as json_loads  # type: ignore[assignment]
 
-class GitHubProvider:
+# Pull requests fetched per GraphQL query, well inside GitHub's node limit
+GRAPHQL_BATCH_SIZE = 50
+
+# Changed paths selected per pull request; longer lists are fetched over REST
+GRAPHQL_FILES = 100
+
+# Entries per page of a paginated REST listing (GitHub's maximum)
+PAGE_LENGTH = 100
+
+# Fields selected for each aliased pull request, mirroring get_pr_info()
+_PR_FIELDS = (
+    "number title body author { login } createdAt updatedAt baseRefName headRefName "
+    "additions deletions commits { totalCount } "
+    f"files(first: {GRAPHQL_FILES}) {{ nodes {{ path }} pageInfo {{ hasNextPage }} }}"
+)
+
+
+class GitHubProvider(SessionOwner):
     """GitHub API provider for pull requests."""
 
     def __init__(self, token: Optional[str] = None, base_url: str = "https://api.github.com"):
         """Initialize GitHub provider."""
         self.token = token
         self.base_url = base_url
-        self.session = requests.Session()
+        self.session = pooled_session()
+        self._content_cache = ContentCache()
         
         if self.token:
             self.session.headers.update({
@@ -24,55 +47,134 @@ class GitHubProvider:
     def get_pr_info(self, repo: str, pr_number: int) -> PRInfo:
         """Fetch pull request information from GitHub."""
         url = f"{self.base_url}/repos/{repo}/pulls/{pr_number}"
-        response = self.session.get(url)
-        response.raise_for_status()
+        # The file list is fetched alongside the pull request itself
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            files = executor.submit(self.get_pr_files, repo, pr_number)
+            response = conditional_get(self.session, url)
+            response.raise_for_status()
+            files_changed = files.result()
         
-        data = response.json()
+        data = json_loads(response.content)
         
         return PRInfo(
             number=data["number"],
             title=data["title"],
             description=data["body"] or "",
             author=data["user"]["login"],
-            created_at=datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")),
-            updated_at=datetime.fromisoformat(data["updated_at"].replace("Z", "+00:00")),
+            created_at=parse_timestamp(data["created_at"]),
+            updated_at=parse_timestamp(data["updated_at"]),
             base_branch=data["base"]["ref"],
             head_branch=data["head"]["ref"],
-            files_changed=self.get_pr_files(repo, pr_number),
+            files_changed=files_changed,
             additions=data["additions"],
             deletions=data["deletions"],
             commits=data["commits"]
         )
 
+    def get_pr_infos(self, repo: str, pr_numbers: List[int]) -> List[PRInfo]:
+        """Fetch several pull requests, in order, with one GraphQL query per batch.
+
+        GraphQL needs a token; without one each pull request is fetched over REST.
+        """
+        if not self.token:
+            return [self.get_pr_info(repo, pr_number) for pr_number in pr_numbers]
+
+        owner, name = repo.split("/", 1)
+        pr_infos: List[PRInfo] = []
+        for start in range(0, len(pr_numbers), GRAPHQL_BATCH_SIZE):
+            batch = pr_numbers[start:start + GRAPHQL_BATCH_SIZE]
+            selections = " ".join(
+                f"pr{index}: pullRequest(number: {int(pr_number)}) {{ {_PR_FIELDS} }}"
+                for index, pr_number in enumerate(batch)
+            )
+            query = f"query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {selections} }} }}"
+            response = self.session.post(self._graphql_url(), json={
+                "query": query,
+                "variables": {"owner": owner, "name": name}
+            })
+            response.raise_for_status()
+
+            result = json_loads(response.content)
+            if result.get("errors"):
+                raise ValueError(f"GitHub GraphQL error: {result['errors'][0].get('message')}")
+            repository = result["data"]["repository"]
+            pr_infos.extend(self._graphql_pr_info(repo, repository[f"pr{index}"]) for index in range(len(batch)))
+
+        return pr_infos
+
+    def _graphql_url(self) -> str:
+        """GraphQL endpoint for base_url; GitHub Enterprise serves REST under /api/v3."""
+        base_url = self.base_url.rstrip("/")
+        if base_url.endswith("/v3"):
+            return base_url[:-len("/v3")] + "/graphql"
+        return f"{base_url}/graphql"
+
+    def _graphql_pr_info(self, repo: str, node: dict) -> PRInfo:
+        """Convert one aliased pullRequest selection to PRInfo."""
+        files = node["files"]
+        if files["pageInfo"]["hasNextPage"]:
+            # The REST listing is paginated in full; the GraphQL one would
+            # need a follow-up query per page
+            files_changed = self.get_pr_files(repo, node["number"])
+        else:
+            files_changed = [file["path"] for file in files["nodes"]]
+
+        return PRInfo(
+            number=node["number"],
+            title=node["title"],
+            description=node["body"] or "",
+            # Deleted accounts have no author; REST reports them as "ghost"
+            author=(node["author"] or {}).get("login", "ghost"),
+            created_at=parse_timestamp(node["createdAt"]),
+            updated_at=parse_timestamp(node["updatedAt"]),
+            base_branch=node["baseRefName"],
+            head_branch=node["headRefName"],
+            files_changed=files_changed,
+            additions=node["additions"],
+            deletions=node["deletions"],
+            commits=node["commits"]["totalCount"]
+        )
+
     def get_pr_files(self, repo: str, pr_number: int) -> List[str]:
         """Get list of files changed in the PR."""
         url = f"{self.base_url}/repos/{repo}/pulls/{pr_number}/files"
-        response = self.session.get(url)
-        response.raise_for_status()
-        
-        files = response.json()
-        return [file["filename"] for file in files]
+        return [file["filename"] for page in self._pages(url) for file in page]
 
     def get_file_content(self, repo: str, file_path: str, ref: str) -> str:
         """Get file content at a specific reference."""
+        content = self._content_cache.get(repo, file_path, ref)
+        if content is not None:
+            return content
+
         url = f"{self.base_url}/repos/{repo}/contents/{file_path}"
         params = {"ref": ref}
-        response = self.session.get(url, params=params)
+        response = conditional_get(self.session, url, params=params)
         response.raise_for_status()
         
-        data = response.json()
+        data = json_loads(response.content)
         import base64
-        return base64.b64decode(data["content"]).decode("utf-8")
+        content = base64.b64decode(data["content"]).decode("utf-8")
+        self._content_cache.put(repo, file_path, ref, content)
+        return content
 
     def get_diff(self, repo: str, pr_number: int) -> str:
         """Get the diff for the pull request."""
         url = f"{self.base_url}/repos/{repo}/pulls/{pr_number}"
         headers = {"Accept": "application/vnd.github.v3.diff"}
-        response = self.session.get(url, headers=headers)
+        response = conditional_get(self.session, url, headers=headers)
         response.raise_for_status()
         
         return response.text
 
+    def iter_diff(self, repo: str, pr_number: int) -> Iterator[str]:
+        """Yield the diff for the pull request in chunks as it downloads."""
+        url = f"{self.base_url}/repos/{repo}/pulls/{pr_number}"
+        headers = {"Accept": "application/vnd.github.v3.diff"}
+        # Streamed past the response cache, which needs the whole body
+        with self.session.get(url, headers=headers, stream=True) as response:
+            response.raise_for_status()
+            yield from iter_text(response)
+
     def post_comment(self, repo: str, pr_number: int, comment: str, 
                     file_path: Optional[str] = None, 
                     line_number: Optional[int] = None) -> bool:
@@ -82,10 +184,7 @@ class GitHubProvider:
         payload = {"body": comment}
         
         if file_path and line_number:
-            # Get the diff to find the commit SHA and position
-            diff = self.get_diff(repo, pr_number)
-            # This is simplified - in practice, you'd need to parse the diff
-            # to find the correct position for inline comments
+            # Addressed by file line and side, so no diff position is needed
             payload.update({
                 "path": file_path,
                 "line": line_number,
@@ -98,7 +197,16 @@ class GitHubProvider:
     def get_commits(self, repo: str, pr_number: int) -> List[dict]:
         """Get commits in the pull request."""
         url = f"{self.base_url}/repos/{repo}/pulls/{pr_number}/commits"
-        response = self.session.get(url)
-        response.raise_for_status()
-        
-        return response.json()
+        return [commit for page in self._pages(url) for commit in page]
+
+    def _pages(self, url: str) -> Iterator[List[Dict[str, Any]]]:
+        """Yield every page of a paginated listing, following its Link headers."""
+        params: Optional[Dict[str, str]] = {"per_page": str(PAGE_LENGTH)}
+        while url:
+            response = conditional_get(self.session, url, params=params)
+            response.raise_for_status()
+
+            yield json_loads(response.content)
+            # The next link already carries the query parameters
+            url = response.links.get("next", {}).get("url", "")
+            params = None
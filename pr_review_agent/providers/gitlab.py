@@ -1,12 +1,33 @@
 """GitLab provider implementation."""
 
-import requests
-from typing import List, Optional
-from datetime import datetime
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
 from pr_review_agent.core.models import PRInfo
+from .base import ContentCache, SessionOwner, iter_text, parse_timestamp, pooled_session
+from ._http_cache import conditional_get
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; both parse the raw response bytes
+    from json import loads as json_loads  # type: ignore[assignment]
 
-class GitLabProvider:
+# Merge requests whose /changes payload is kept; the payload holds every
+# file's diff, so only recent ones are remembered
+CHANGES_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=1024)
+def encode_path(value: str) -> str:
+    """Percent-encode a project or file path as one URL path segment."""
+    # GitLab addresses both by their full path, slashes included
+    return quote(value, safe="")
+
+
+class GitLabProvider(SessionOwner):
     """GitLab API provider for merge requests."""
 
     def __init__(self, token: Optional[str] = None, base_url: str = "https://gitlab.com"):
@@ -14,7 +35,10 @@ class GitLabProvider:
         self.token = token
         self.base_url = base_url.rstrip("/")
         self.api_url = f"{self.base_url}/api/v4"
-        self.session = requests.Session()
+        self.session = pooled_session()
+        self._content_cache = ContentCache()
+        self._changes_cache: "OrderedDict[Tuple[str, int], Dict[str, Any]]" = OrderedDict()
+        self._changes_lock = threading.Lock()
         
         if self.token:
             self.session.headers.update({
@@ -24,24 +48,30 @@ class GitLabProvider:
 
     def get_pr_info(self, repo: str, pr_number: int) -> PRInfo:
         """Fetch merge request information from GitLab."""
-        # Convert repo format from owner/repo to owner%2Frepo for GitLab API
-        encoded_repo = repo.replace("/", "%2F")
+        encoded_repo = encode_path(repo)
         url = f"{self.api_url}/projects/{encoded_repo}/merge_requests/{pr_number}"
-        response = self.session.get(url)
-        response.raise_for_status()
+        # A new review must see pushes made since the last one
+        with self._changes_lock:
+            self._changes_cache.pop((repo, pr_number), None)
+        # The file list is fetched alongside the merge request itself
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            files = executor.submit(self.get_pr_files, repo, pr_number)
+            response = conditional_get(self.session, url)
+            response.raise_for_status()
+            files_changed = files.result()
         
-        data = response.json()
+        data = json_loads(response.content)
         
         return PRInfo(
             number=data["iid"],
             title=data["title"],
             description=data["description"] or "",
             author=data["author"]["username"],
-            created_at=datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")),
-            updated_at=datetime.fromisoformat(data["updated_at"].replace("Z", "+00:00")),
+            created_at=parse_timestamp(data["created_at"]),
+            updated_at=parse_timestamp(data["updated_at"]),
             base_branch=data["target_branch"],
             head_branch=data["source_branch"],
-            files_changed=self.get_pr_files(repo, pr_number),
+            files_changed=files_changed,
             additions=data["changes_count"]["additions"],
             deletions=data["changes_count"]["deletions"],
             commits=data["commits_count"]
@@ -49,40 +79,70 @@ class GitLabProvider:
 
     def get_pr_files(self, repo: str, pr_number: int) -> List[str]:
         """Get list of files changed in the merge request."""
-        encoded_repo = repo.replace("/", "%2F")
-        url = f"{self.api_url}/projects/{encoded_repo}/merge_requests/{pr_number}/changes"
-        response = self.session.get(url)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = self._get_changes(repo, pr_number)
         return [change["new_path"] for change in data["changes"] if change["new_path"]]
 
     def get_file_content(self, repo: str, file_path: str, ref: str) -> str:
         """Get file content at a specific reference."""
-        encoded_repo = repo.replace("/", "%2F")
-        encoded_file = file_path.replace("/", "%2F")
+        content = self._content_cache.get(repo, file_path, ref)
+        if content is not None:
+            return content
+
+        encoded_repo = encode_path(repo)
+        encoded_file = encode_path(file_path)
         url = f"{self.api_url}/projects/{encoded_repo}/repository/files/{encoded_file}/raw"
         params = {"ref": ref}
-        response = self.session.get(url, params=params)
+        response = conditional_get(self.session, url, params=params)
         response.raise_for_status()
         
+        self._content_cache.put(repo, file_path, ref, response.text)
         return response.text
 
     def get_diff(self, repo: str, pr_number: int) -> str:
         """Get the diff for the merge request."""
-        encoded_repo = repo.replace("/", "%2F")
+        return "".join(self.iter_diff(repo, pr_number))
+
+    def iter_diff(self, repo: str, pr_number: int) -> Iterator[str]:
+        """Yield the diff for the merge request in chunks as it downloads."""
+        encoded_repo = encode_path(repo)
+        url = f"{self.api_url}/projects/{encoded_repo}/merge_requests/{pr_number}/raw_diffs"
+        with self.session.get(url, stream=True) as response:
+            if response.status_code != 404:
+                response.raise_for_status()
+                yield from iter_text(response)
+                return
+
+        # GitLab before 17.1 has no raw_diffs endpoint; /changes holds each
+        # file's diff without its header
+        for change in self._get_changes(repo, pr_number)["changes"]:
+            yield f"--- a/{change['old_path']}\n+++ b/{change['new_path']}\n{change['diff']}"
+
+    def _get_changes(self, repo: str, pr_number: int) -> Dict[str, Any]:
+        """Return the merge request's /changes payload, fetched once per review."""
+        key = (repo, pr_number)
+        with self._changes_lock:
+            cached = self._changes_cache.get(key)
+            if cached is not None:
+                self._changes_cache.move_to_end(key)
+                return cached
+
+        encoded_repo = encode_path(repo)
         url = f"{self.api_url}/projects/{encoded_repo}/merge_requests/{pr_number}/changes"
-        response = self.session.get(url)
+        response = conditional_get(self.session, url)
         response.raise_for_status()
-        
-        data = response.json()
-        return data["diff"]
+        data: Dict[str, Any] = json_loads(response.content)
+
+        with self._changes_lock:
+            self._changes_cache[key] = data
+            if len(self._changes_cache) > CHANGES_CACHE_SIZE:
+                self._changes_cache.popitem(last=False)
+        return data
 
     def post_comment(self, repo: str, pr_number: int, comment: str, 
                     file_path: Optional[str] = None, 
                     line_number: Optional[int] = None) -> bool:
         """Post a comment on the merge request."""
-        encoded_repo = repo.replace("/", "%2F")
+        encoded_repo = encode_path(repo)
         url = f"{self.api_url}/projects/{encoded_repo}/merge_requests/{pr_number}/notes"
         
         payload = {"body": comment}
@@ -105,9 +165,9 @@ class GitLabProvider:
 
     def get_commits(self, repo: str, pr_number: int) -> List[dict]:
         """Get commits in the merge request."""
-        encoded_repo = repo.replace("/", "%2F")
+        encoded_repo = encode_path(repo)
         url = f"{self.api_url}/projects/{encoded_repo}/merge_requests/{pr_number}/commits"
-        response = self.session.get(url)
+        response = conditional_get(self.session, url)
         response.raise_for_status()
         
-        return response.json()
+        return json_loads(response.content)
@@ -8,7 +8,45 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
 import sys
-from simple_pr_review import analyze_file, calculate_score, generate_feedback, SimplePRInfo, display_results
+import threading
+from functools import lru_cache
+from simple_pr_review import analyze_file, read_source, calculate_score, generate_feedback, SimplePRInfo, display_results
+
+SEVERITY_EMOJI = {"critical": "🔴", "high": "🟠", "medium": "🟡", "low": "🟢"}
+
+# Issues share a handful of paths; each is shortened once
+file_name = lru_cache(maxsize=1024)(os.path.basename)
+
+# Demo PR data
+DEMO_PR_INFO = SimplePRInfo(
+    number=123,
+    title="Add user authentication feature",
+    author="developer123",
+    files_changed=["auth.py", "models.py"],
+    additions=150,
+    deletions=25
+)
+
+# Demo file contents
+DEMO_FILE_CONTENTS = {
+    "auth.py": '''def authenticate_user(username, password):
+    # TODO: Add rate limiting
+    print(f"Authenticating user: {username}")
+    user_password = "admin123"  # Hardcoded password
+    if password == user_password:
+        return True
+    return False
+
+def create_session(user_id):
+    # This is a very long line that exceeds the recommended line length
+    session = Session(user_id=user_id, created_at=datetime.now())
+    return session''',
+    "models.py": '''class User:
+    def __init__(self, username, email):
+        self.username = username
+        self.email = email
+        self.password = "default123"  # Hardcoded password'''
+}
 
 class PRReviewGUI:
     def __init__(self, root):
@@ -89,6 +127,7 @@ class PRReviewGUI:
             pady=5
         )
         demo_btn.pack(side='right', padx=(0, 10))
+        self.demo_btn = demo_btn
         
         # Analysis button
         analyze_btn = tk.Button(
@@ -180,91 +219,88 @@ class PRReviewGUI:
             self.status_var.set(f"File selected: {os.path.basename(file_path)}")
     
     def run_demo(self):
-        """Run the demo analysis"""
+        """Run the demo analysis in a separate thread"""
         self.status_var.set("Running demo...")
-        self.root.update()
-        
-        # Demo PR data
-        pr_info = SimplePRInfo(
-            number=123,
-            title="Add user authentication feature",
-            author="developer123",
-            files_changed=["auth.py", "models.py"],
-            additions=150,
-            deletions=25
-        )
-        
-        # Demo file contents
-        file_contents = {
-            "auth.py": '''def authenticate_user(username, password):
-    # TODO: Add rate limiting
-    print(f"Authenticating user: {username}")
-    user_password = "admin123"  # Hardcoded password
-    if password == user_password:
-        return True
-    return False
-
-def create_session(user_id):
-    # This is a very long line that exceeds the recommended line length
-    session = Session(user_id=user_id, created_at=datetime.now())
-    return session''',
-            "models.py": '''class User:
-    def __init__(self, username, email):
-        self.username = username
-        self.email = email
-        self.password = "default123"  # Hardcoded password'''
-        }
-        
-        # Analyze files
-        all_issues = []
-        for file_path, content in file_contents.items():
-            issues = analyze_file(file_path, content)
-            all_issues.extend(issues)
-        
-        # Generate feedback
-        feedback = generate_feedback(all_issues, pr_info)
-        
-        # Display results
-        self.display_results(feedback, pr_info)
-        self.status_var.set("Demo completed")
+        self.start_analysis()
+        threading.Thread(target=self._demo_thread, daemon=True).start()
+    
+    def _demo_thread(self):
+        """Analyze the demo files; the results are shown from the main thread"""
+        try:
+            # Analyze files
+            all_issues = []
+            for file_path, content in DEMO_FILE_CONTENTS.items():
+                issues = analyze_file(file_path, content)
+                all_issues.extend(issues)
+            
+            # Generate feedback
+            feedback = generate_feedback(all_issues, DEMO_PR_INFO)
+            
+            # Update UI in main thread
+            self.root.after(0, self.finish_analysis, feedback, DEMO_PR_INFO, "Demo completed")
+            
+        except Exception as e:
+            self.root.after(0, self.fail_analysis, f"Demo failed: {str(e)}", "Demo failed")
     
     def analyze_code(self):
-        """Analyze the selected file"""
+        """Analyze the selected file in a separate thread"""
         if not self.current_file:
             messagebox.showerror("Error", "Please select a file first")
             return
         
         self.status_var.set("Analyzing code...")
-        self.root.update()
-        
+        self.start_analysis()
+        threading.Thread(target=self._analysis_thread, args=(self.current_file,), daemon=True).start()
+    
+    def _analysis_thread(self, file_path):
+        """Analyze one file; the results are shown from the main thread"""
         try:
             # Read file
-            with open(self.current_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = read_source(file_path)
             
             # Analyze
-            issues = analyze_file(self.current_file, content)
+            issues = analyze_file(file_path, content)
             
             # Create PR info
             pr_info = SimplePRInfo(
                 number=1,
-                title=f"Analysis of {os.path.basename(self.current_file)}",
+                title=f"Analysis of {os.path.basename(file_path)}",
                 author="local_user",
-                files_changed=[self.current_file],
-                additions=len(content.split('\n')),
+                files_changed=[file_path],
+                additions=content.count('\n') + 1,
                 deletions=0
             )
             
             # Generate feedback
             feedback = generate_feedback(issues, pr_info)
             
-            # Display results
-            self.display_results(feedback, pr_info)
-            self.status_var.set("Analysis completed")
+            # Update UI in main thread
+            self.root.after(0, self.finish_analysis, feedback, pr_info, "Analysis completed")
             
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to analyze file: {str(e)}")
-            self.status_var.set("Analysis failed")
+            self.root.after(0, self.fail_analysis, f"Failed to analyze file: {str(e)}", "Analysis failed")
+    
+    def start_analysis(self):
+        """Disable the buttons while an analysis runs"""
+        self.analyze_btn.config(state='disabled')
+        self.demo_btn.config(state='disabled')
+    
+    def end_analysis(self, status):
+        """Re-enable the buttons once an analysis has finished"""
+        self.demo_btn.config(state='normal')
+        if self.current_file:
+            self.analyze_btn.config(state='normal')
+        self.status_var.set(status)
+    
+    def finish_analysis(self, feedback, pr_info, status):
+        """Show the results of a finished analysis"""
+        self.display_results(feedback, pr_info)
+        self.end_analysis(status)
+    
+    def fail_analysis(self, message, status):
+        """Report an analysis that raised an error"""
+        messagebox.showerror("Error", message)
+        self.end_analysis(status)
     
     def display_results(self, feedback, pr_info):
         """Display analysis results in the GUI"""
@@ -300,35 +336,34 @@ File Statistics:
         self.summary_text.insert(tk.END, summary_content)
         
         # Issues tab
+        # Each tab's text is joined once and inserted in one call
         if feedback.issues:
-            issues_content = f"🐛 ISSUES FOUND ({len(feedback.issues)})\n{'='*50}\n\n"
+            issues_parts = [f"🐛 ISSUES FOUND ({len(feedback.issues)})\n{'='*50}\n\n"]
             
             for i, issue in enumerate(feedback.issues, 1):
-                severity_emoji = {"critical": "🔴", "high": "🟠", "medium": "🟡", "low": "🟢"}.get(issue.severity, "⚪")
-                issues_content += f"{i}. {severity_emoji} {issue.severity.upper()} - {os.path.basename(issue.file_path)}:{issue.line_number}\n"
-                issues_content += f"   {issue.message}\n"
+                severity_emoji = SEVERITY_EMOJI.get(issue.severity, "⚪")
+                issues_parts.append(f"{i}. {severity_emoji} {issue.severity.upper()} - {file_name(issue.file_path)}:{issue.line_number}\n")
+                issues_parts.append(f"   {issue.message}\n")
                 if issue.suggestion:
-                    issues_content += f"   💡 Suggestion: {issue.suggestion}\n"
-                issues_content += "\n"
+                    issues_parts.append(f"   💡 Suggestion: {issue.suggestion}\n")
+                issues_parts.append("\n")
         else:
-            issues_content = "✅ No issues found! Your code looks great!"
+            issues_parts = ["✅ No issues found! Your code looks great!"]
         
-        self.issues_text.insert(tk.END, issues_content)
+        self.issues_text.insert(tk.END, "".join(issues_parts))
         
         # Suggestions tab
         if feedback.suggestions:
-            suggestions_content = f"💡 SUGGESTIONS ({len(feedback.suggestions)})\n{'='*50}\n\n"
-            for i, suggestion in enumerate(feedback.suggestions, 1):
-                suggestions_content += f"{i}. {suggestion}\n"
+            suggestions_parts = [f"💡 SUGGESTIONS ({len(feedback.suggestions)})\n{'='*50}\n\n"]
+            suggestions_parts.extend(f"{i}. {suggestion}\n" for i, suggestion in enumerate(feedback.suggestions, 1))
         else:
-            suggestions_content = "✅ No suggestions - your code follows best practices!"
+            suggestions_parts = ["✅ No suggestions - your code follows best practices!"]
         
         if feedback.strengths:
-            suggestions_content += f"\n✨ STRENGTHS\n{'='*30}\n"
-            for strength in feedback.strengths:
-                suggestions_content += f"• {strength}\n"
+            suggestions_parts.append(f"\n✨ STRENGTHS\n{'='*30}\n")
+            suggestions_parts.extend(f"• {strength}\n" for strength in feedback.strengths)
         
-        self.suggestions_text.insert(tk.END, suggestions_content)
+        self.suggestions_text.insert(tk.END, "".join(suggestions_parts))
         
         # Switch to summary tab
         self.notebook.select(0)
@@ -10,8 +10,106 @@ import os
 import sys
 import threading
 import webbrowser
+from collections import deque
 from datetime import datetime
-from simple_pr_review import analyze_file, calculate_score, generate_feedback, SimplePRInfo, display_results
+from functools import lru_cache
+from simple_pr_review import analyze_file, read_source, calculate_score, generate_feedback, SimplePRInfo, display_results
+
+SEVERITY_EMOJI = {"critical": "🔴", "high": "🟠", "medium": "🟡", "low": "🟢"}
+
+# Colours of the severity group headings in the Issues tab
+SEVERITY_COLORS = {"critical": "#c0392b", "high": "#e74c3c", "medium": "#f39c12", "low": "#27ae60"}
+
+# Issues share a handful of paths; each is shortened once
+file_name = lru_cache(maxsize=1024)(os.path.basename)
+
+# Demo PR data
+DEMO_PR_INFO = SimplePRInfo(
+    number=123,
+    title="Add user authentication feature",
+    author="developer123",
+    files_changed=["auth.py", "models.py"],
+    additions=150,
+    deletions=25
+)
+
+# Demo file contents
+DEMO_FILE_CONTENTS = {
+    "auth.py": '''def authenticate_user(username, password):
+    # TODO: Add rate limiting
+    print(f"Authenticating user: {username}")
+    user_password = "admin123"  # Hardcoded password
+    if password == user_password:
+        return True
+    return False
+
+def create_session(user_id):
+    # This is a very long line that exceeds the recommended line length
+    session = Session(user_id=user_id, created_at=datetime.now())
+    return session
+
+def process_payment(amount):
+    try:
+        # Process payment
+        result = payment_gateway.charge(amount)
+        return result
+    except:  # Bare except clause
+        return None''',
+    "models.py": '''class User:
+    def __init__(self, username, email):
+        self.username = username
+        self.email = email
+        self.password = "default123"  # Hardcoded password
+    
+    def validate_password(self, password):
+        # FIXME: Implement proper password validation
+        return password == self.password'''
+}
+
+# Analyses listed in the History tab
+HISTORY_LENGTH = 10
+
+# Timestamps in the summary, history and exported reports
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Shown by the Help button
+HELP_TEXT = """PR Review Agent Pro - Help & Tips
+
+🎯 How to Use:
+1. Click 'Browse Files' to select a Python file
+2. Click 'Run Demo' to see a sample analysis
+3. Click 'Analyze Code' to analyze your file
+4. Check the tabs for detailed results
+
+📊 Understanding Results:
+• Score 8-10: Excellent code quality
+• Score 6-7: Good code with minor issues
+• Score 4-5: Fair code with several issues
+• Score 0-3: Poor code with many issues
+
+🐛 Issue Severity:
+• 🔴 Critical: Security vulnerabilities, major bugs
+• 🟠 High: Important issues that should be fixed
+• 🟡 Medium: Style and quality improvements
+• 🟢 Low: Minor suggestions and best practices
+
+💡 Tips for Better Code:
+• Use environment variables for secrets
+• Add proper error handling
+• Keep lines under 100 characters
+• Add docstrings to functions
+• Use meaningful variable names
+• Remove debug print statements
+
+🚀 Features:
+• Real-time analysis
+• Export reports
+• Analysis history
+• Multiple file support
+• Professional interface
+
+For more help, visit: https://github.com/your-repo/pr-review-agent
+"""
 
 class EnhancedPRReviewGUI:
     def __init__(self, root):
@@ -23,7 +121,11 @@ class EnhancedPRReviewGUI:
         # Variables
         self.current_file = None
         self.analysis_results = None
-        self.analysis_history = []
+        self.analysis_history = deque(maxlen=HISTORY_LENGTH)
+        # Text for tabs not yet viewed since the last analysis, by tab
+        self._pending_tab_text = {}
+        # Built on first use, then hidden and shown again
+        self.help_window = None
         
         # Configure styles
         self.setup_styles()
@@ -37,20 +139,22 @@ class EnhancedPRReviewGUI:
         style = ttk.Style()
         style.theme_use('clam')
         
-        # Configure custom styles
-        style.configure('Title.TLabel', font=('Segoe UI', 24, 'bold'), foreground='#2c3e50')
-        style.configure('Subtitle.TLabel', font=('Segoe UI', 12), foreground='#7f8c8d')
-        style.configure('Header.TLabel', font=('Segoe UI', 14, 'bold'), foreground='#34495e')
-        style.configure('Success.TLabel', font=('Segoe UI', 10), foreground='#27ae60')
-        style.configure('Warning.TLabel', font=('Segoe UI', 10), foreground='#f39c12')
-        style.configure('Error.TLabel', font=('Segoe UI', 10), foreground='#e74c3c')
-        
-        # Button styles
-        style.configure('Primary.TButton', font=('Segoe UI', 10, 'bold'), padding=(20, 10))
-        style.configure('Secondary.TButton', font=('Segoe UI', 9), padding=(15, 8))
-        style.configure('Success.TButton', font=('Segoe UI', 10, 'bold'), padding=(20, 10))
-        style.configure('Warning.TButton', font=('Segoe UI', 10, 'bold'), padding=(20, 10))
-        style.configure('Info.TButton', font=('Segoe UI', 10, 'bold'), padding=(20, 10))
+        # All custom styles are applied to the theme in a single Tcl call
+        style.theme_settings('clam', {
+            'Title.TLabel': {'configure': {'font': ('Segoe UI', 24, 'bold'), 'foreground': '#2c3e50'}},
+            'Subtitle.TLabel': {'configure': {'font': ('Segoe UI', 12), 'foreground': '#7f8c8d'}},
+            'Header.TLabel': {'configure': {'font': ('Segoe UI', 14, 'bold'), 'foreground': '#34495e'}},
+            'Success.TLabel': {'configure': {'font': ('Segoe UI', 10), 'foreground': '#27ae60'}},
+            'Warning.TLabel': {'configure': {'font': ('Segoe UI', 10), 'foreground': '#f39c12'}},
+            'Error.TLabel': {'configure': {'font': ('Segoe UI', 10), 'foreground': '#e74c3c'}},
+            
+            # Button styles
+            'Primary.TButton': {'configure': {'font': ('Segoe UI', 10, 'bold'), 'padding': (20, 10)}},
+            'Secondary.TButton': {'configure': {'font': ('Segoe UI', 9), 'padding': (15, 8)}},
+            'Success.TButton': {'configure': {'font': ('Segoe UI', 10, 'bold'), 'padding': (20, 10)}},
+            'Warning.TButton': {'configure': {'font': ('Segoe UI', 10, 'bold'), 'padding': (20, 10)}},
+            'Info.TButton': {'configure': {'font': ('Segoe UI', 10, 'bold'), 'padding': (20, 10)}}
+        })
     
     def setup_ui(self):
         """Set up the enhanced user interface"""
@@ -284,6 +388,37 @@ class EnhancedPRReviewGUI:
         
         # History tab
         self.create_history_tab()
+        
+        # Hidden tabs are filled in when first selected
+        self._tab_texts = {
+            str(self.issues_frame): self.issues_text,
+            str(self.suggestions_frame): self.suggestions_text,
+            str(self.history_frame): self.history_text
+        }
+        self.notebook.bind('<<NotebookTabChanged>>', self.render_selected_tab)
+    
+    def defer_tab_text(self, frame, *content):
+        """Show content in the tab of frame once that tab is selected.
+
+        content is the text, optionally followed by tags and further text
+        and tags, as taken by Text.insert.
+        """
+        self._pending_tab_text[str(frame)] = content
+        if self.notebook.select() == str(frame):
+            self.render_selected_tab()
+    
+    def render_selected_tab(self, event=None):
+        """Fill the selected tab with its pending text, if any"""
+        tab = self.notebook.select()
+        content = self._pending_tab_text.pop(tab, None)
+        if content is None:
+            return
+        
+        text_widget = self._tab_texts[tab]
+        text_widget.config(state='normal')
+        text_widget.delete(1.0, tk.END)
+        text_widget.insert(tk.END, *content)
+        text_widget.config(state='disabled')
     
     def create_summary_tab(self):
         """Create the summary tab"""
@@ -303,14 +438,16 @@ class EnhancedPRReviewGUI:
         self.summary_text.pack(fill='both', expand=True)
         
         # Add initial content
-        self.summary_text.insert(tk.END, "Welcome to PR Review Agent Pro!\n\n")
-        self.summary_text.insert(tk.END, "Select a Python file or run the demo to get started.\n\n")
-        self.summary_text.insert(tk.END, "Features:\n")
-        self.summary_text.insert(tk.END, "• 🔍 Advanced code analysis\n")
-        self.summary_text.insert(tk.END, "• 🐛 Bug and security detection\n")
-        self.summary_text.insert(tk.END, "• 💡 Intelligent suggestions\n")
-        self.summary_text.insert(tk.END, "• 📊 Quality scoring\n")
-        self.summary_text.insert(tk.END, "• 📈 Analysis history\n")
+        self.summary_text.insert(tk.END, (
+            "Welcome to PR Review Agent Pro!\n\n"
+            "Select a Python file or run the demo to get started.\n\n"
+            "Features:\n"
+            "• 🔍 Advanced code analysis\n"
+            "• 🐛 Bug and security detection\n"
+            "• 💡 Intelligent suggestions\n"
+            "• 📊 Quality scoring\n"
+            "• 📈 Analysis history\n"
+        ))
         self.summary_text.config(state='disabled')
     
     def create_issues_tab(self):
@@ -329,15 +466,19 @@ class EnhancedPRReviewGUI:
             pady=15
         )
         self.issues_text.pack(fill='both', expand=True)
+        for severity, color in SEVERITY_COLORS.items():
+            self.issues_text.tag_configure(severity, foreground=color, font=('Consolas', 10, 'bold'))
         
         # Add initial content
-        self.issues_text.insert(tk.END, "No issues found yet.\n\n")
-        self.issues_text.insert(tk.END, "Issues will be displayed here after analysis.\n")
-        self.issues_text.insert(tk.END, "Each issue includes:\n")
-        self.issues_text.insert(tk.END, "• Severity level (Critical, High, Medium, Low)\n")
-        self.issues_text.insert(tk.END, "• File location and line number\n")
-        self.issues_text.insert(tk.END, "• Description of the problem\n")
-        self.issues_text.insert(tk.END, "• Suggested fix\n")
+        self.issues_text.insert(tk.END, (
+            "No issues found yet.\n\n"
+            "Issues will be displayed here after analysis.\n"
+            "Each issue includes:\n"
+            "• Severity level (Critical, High, Medium, Low)\n"
+            "• File location and line number\n"
+            "• Description of the problem\n"
+            "• Suggested fix\n"
+        ))
         self.issues_text.config(state='disabled')
     
     def create_suggestions_tab(self):
@@ -358,13 +499,15 @@ class EnhancedPRReviewGUI:
         self.suggestions_text.pack(fill='both', expand=True)
         
         # Add initial content
-        self.suggestions_text.insert(tk.END, "No suggestions yet.\n\n")
-        self.suggestions_text.insert(tk.END, "Suggestions will appear here after analysis.\n")
-        self.suggestions_text.insert(tk.END, "These help you:\n")
-        self.suggestions_text.insert(tk.END, "• Fix code issues\n")
-        self.suggestions_text.insert(tk.END, "• Improve code quality\n")
-        self.suggestions_text.insert(tk.END, "• Follow best practices\n")
-        self.suggestions_text.insert(tk.END, "• Enhance security\n")
+        self.suggestions_text.insert(tk.END, (
+            "No suggestions yet.\n\n"
+            "Suggestions will appear here after analysis.\n"
+            "These help you:\n"
+            "• Fix code issues\n"
+            "• Improve code quality\n"
+            "• Follow best practices\n"
+            "• Enhance security\n"
+        ))
         self.suggestions_text.config(state='disabled')
     
     def create_history_tab(self):
@@ -385,14 +528,16 @@ class EnhancedPRReviewGUI:
         self.history_text.pack(fill='both', expand=True)
         
         # Add initial content
-        self.history_text.insert(tk.END, "Analysis History\n")
-        self.history_text.insert(tk.END, "=" * 50 + "\n\n")
-        self.history_text.insert(tk.END, "No analyses performed yet.\n\n")
-        self.history_text.insert(tk.END, "History will show:\n")
-        self.history_text.insert(tk.END, "• Timestamp of each analysis\n")
-        self.history_text.insert(tk.END, "• File analyzed\n")
-        self.history_text.insert(tk.END, "• Quality score\n")
-        self.history_text.insert(tk.END, "• Number of issues found\n")
+        self.history_text.insert(tk.END, (
+            "Analysis History\n"
+            + "=" * 50 + "\n\n"
+            "No analyses performed yet.\n\n"
+            "History will show:\n"
+            "• Timestamp of each analysis\n"
+            "• File analyzed\n"
+            "• Quality score\n"
+            "• Number of issues found\n"
+        ))
         self.history_text.config(state='disabled')
     
     def create_status_bar(self, parent):
@@ -454,8 +599,16 @@ class EnhancedPRReviewGUI:
             
             # Update stats
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    lines = len(f.readlines())
+                # Newlines are counted in binary chunks, without building
+                # or decoding the lines
+                lines = 0
+                last = b''
+                with open(file_path, 'rb') as f:
+                    while chunk := f.read(1024 * 1024):
+                        lines += chunk.count(b'\n')
+                        last = chunk[-1:]
+                if last not in (b'', b'\n'):
+                    lines += 1  # Final line without a newline
                 self.stats_label.config(text=f"File: {filename} ({lines} lines)")
             except:
                 self.stats_label.config(text=f"File: {filename}")
@@ -468,60 +621,17 @@ class EnhancedPRReviewGUI:
         
         def demo_thread():
             try:
-                # Demo PR data
-                pr_info = SimplePRInfo(
-                    number=123,
-                    title="Add user authentication feature",
-                    author="developer123",
-                    files_changed=["auth.py", "models.py"],
-                    additions=150,
-                    deletions=25
-                )
-                
-                # Demo file contents
-                file_contents = {
-                    "auth.py": '''def authenticate_user(username, password):
-    # TODO: Add rate limiting
-    print(f"Authenticating user: {username}")
-    user_password = "admin123"  # Hardcoded password
-    if password == user_password:
-        return True
-    return False
-
-def create_session(user_id):
-    # This is a very long line that exceeds the recommended line length
-    session = Session(user_id=user_id, created_at=datetime.now())
-    return session
-
-def process_payment(amount):
-    try:
-        # Process payment
-        result = payment_gateway.charge(amount)
-        return result
-    except:  # Bare except clause
-        return None''',
-                    "models.py": '''class User:
-    def __init__(self, username, email):
-        self.username = username
-        self.email = email
-        self.password = "default123"  # Hardcoded password
-    
-    def validate_password(self, password):
-        # FIXME: Implement proper password validation
-        return password == self.password'''
-                }
-                
                 # Analyze files
                 all_issues = []
-                for file_path, content in file_contents.items():
+                for file_path, content in DEMO_FILE_CONTENTS.items():
                     issues = analyze_file(file_path, content)
                     all_issues.extend(issues)
                 
                 # Generate feedback
-                feedback = generate_feedback(all_issues, pr_info)
+                feedback = generate_feedback(all_issues, DEMO_PR_INFO)
                 
                 # Update UI in main thread
-                self.root.after(0, lambda: self.display_results(feedback, pr_info, "Demo"))
+                self.root.after(0, lambda: self.display_results(feedback, DEMO_PR_INFO, "Demo"))
                 
             except Exception as e:
                 self.root.after(0, lambda: self.show_error(f"Demo failed: {str(e)}"))
@@ -544,8 +654,7 @@ def process_payment(amount):
         def analysis_thread():
             try:
                 # Read file
-                with open(self.current_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = read_source(self.current_file)
                 
                 # Analyze
                 issues = analyze_file(self.current_file, content)
@@ -556,7 +665,7 @@ def process_payment(amount):
                     title=f"Analysis of {os.path.basename(self.current_file)}",
                     author="local_user",
                     files_changed=[self.current_file],
-                    additions=len(content.split('\n')),
+                    additions=content.count('\n') + 1,
                     deletions=0
                 )
                 
@@ -579,14 +688,9 @@ def process_payment(amount):
         # Store results
         self.analysis_results = (feedback, pr_info)
         
-        # Clear previous results
+        # Clear previous results; the other tabs are replaced when viewed
         self.summary_text.config(state='normal')
-        self.issues_text.config(state='normal')
-        self.suggestions_text.config(state='normal')
-        
         self.summary_text.delete(1.0, tk.END)
-        self.issues_text.delete(1.0, tk.END)
-        self.suggestions_text.delete(1.0, tk.END)
         
         # Summary tab
         score_emoji = "🟢" if feedback.overall_score >= 8 else "🟡" if feedback.overall_score >= 6 else "🔴"
@@ -612,53 +716,60 @@ def process_payment(amount):
 • Suggestions: {len(feedback.suggestions)}
 • Strengths: {len(feedback.strengths)}
 
-⏰ Analysis completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+⏰ Analysis completed at: {datetime.now().strftime(TIME_FORMAT)}
 """
         
         self.summary_text.insert(tk.END, summary_content)
         
         # Issues tab
+        # Each tab's text is joined once and inserted in one call
         if feedback.issues:
-            issues_content = f"🐛 ISSUES FOUND ({len(feedback.issues)})\n{'='*60}\n\n"
+            issues_parts = [f"🐛 ISSUES FOUND ({len(feedback.issues)})\n{'='*60}\n\n"]
+            # Text and tag arguments for Text.insert
+            issues_content = []
             
             # Group issues by severity
-            severity_groups = {"critical": [], "high": [], "medium": [], "low": []}
+            severity_groups = {severity: [] for severity in SEVERITY_EMOJI}
             for issue in feedback.issues:
                 severity_groups[issue.severity].append(issue)
             
-            for severity in ["critical", "high", "medium", "low"]:
+            for severity, severity_emoji in SEVERITY_EMOJI.items():
                 issues = severity_groups[severity]
                 if issues:
-                    severity_emoji = {"critical": "🔴", "high": "🟠", "medium": "🟡", "low": "🟢"}[severity]
-                    issues_content += f"{severity_emoji} {severity.upper()} SEVERITY ({len(issues)} issues)\n"
-                    issues_content += "-" * 40 + "\n\n"
+                    # The group heading is tagged to show in its severity's colour
+                    issues_content += [
+                        "".join(issues_parts), (),
+                        f"{severity_emoji} {severity.upper()} SEVERITY ({len(issues)} issues)\n", severity
+                    ]
+                    issues_parts = ["-" * 40 + "\n\n"]
                     
                     for i, issue in enumerate(issues, 1):
-                        issues_content += f"{i}. {os.path.basename(issue.file_path)}:{issue.line_number}\n"
-                        issues_content += f"   {issue.message}\n"
+                        issues_parts.append(f"{i}. {file_name(issue.file_path)}:{issue.line_number}\n")
+                        issues_parts.append(f"   {issue.message}\n")
                         if issue.suggestion:
-                            issues_content += f"   💡 Suggestion: {issue.suggestion}\n"
-                        issues_content += "\n"
+                            issues_parts.append(f"   💡 Suggestion: {issue.suggestion}\n")
+                        issues_parts.append("\n")
+            issues_content.append("".join(issues_parts))
         else:
-            issues_content = "✅ No issues found! Your code looks great!\n\n"
-            issues_content += "This means your code follows best practices and is well-written."
+            issues_content = [
+                "✅ No issues found! Your code looks great!\n\n"
+                "This means your code follows best practices and is well-written."
+            ]
         
-        self.issues_text.insert(tk.END, issues_content)
+        self.defer_tab_text(self.issues_frame, *issues_content)
         
         # Suggestions tab
         if feedback.suggestions:
-            suggestions_content = f"💡 SUGGESTIONS ({len(feedback.suggestions)})\n{'='*60}\n\n"
-            for i, suggestion in enumerate(feedback.suggestions, 1):
-                suggestions_content += f"{i}. {suggestion}\n"
+            suggestions_parts = [f"💡 SUGGESTIONS ({len(feedback.suggestions)})\n{'='*60}\n\n"]
+            suggestions_parts.extend(f"{i}. {suggestion}\n" for i, suggestion in enumerate(feedback.suggestions, 1))
         else:
-            suggestions_content = "✅ No suggestions - your code follows best practices!\n\n"
+            suggestions_parts = ["✅ No suggestions - your code follows best practices!\n\n"]
         
         if feedback.strengths:
-            suggestions_content += f"\n✨ STRENGTHS\n{'='*30}\n"
-            for strength in feedback.strengths:
-                suggestions_content += f"• {strength}\n"
+            suggestions_parts.append(f"\n✨ STRENGTHS\n{'='*30}\n")
+            suggestions_parts.extend(f"• {strength}\n" for strength in feedback.strengths)
         
-        self.suggestions_text.insert(tk.END, suggestions_content)
+        self.defer_tab_text(self.suggestions_frame, "".join(suggestions_parts))
         
         # Update history
         self.update_history(feedback, pr_info, analysis_type)
@@ -671,13 +782,12 @@ def process_payment(amount):
         
         # Disable text widgets
         self.summary_text.config(state='disabled')
-        self.issues_text.config(state='disabled')
-        self.suggestions_text.config(state='disabled')
     
     def update_history(self, feedback, pr_info, analysis_type):
         """Update the analysis history"""
         self.analysis_history.append({
-            'timestamp': datetime.now(),
+            # Formatted once here rather than on every redraw of the tab
+            'timestamp': datetime.now().strftime(TIME_FORMAT),
             'type': analysis_type,
             'file': pr_info.title,
             'score': feedback.overall_score,
@@ -685,24 +795,21 @@ def process_payment(amount):
         })
         
         # Update history tab
-        self.history_text.config(state='normal')
-        self.history_text.delete(1.0, tk.END)
-        
-        history_content = "📈 ANALYSIS HISTORY\n"
-        history_content += "=" * 50 + "\n\n"
+        history_parts = ["📈 ANALYSIS HISTORY\n", "=" * 50 + "\n\n"]
         
         if self.analysis_history:
-            for i, entry in enumerate(reversed(self.analysis_history[-10:]), 1):  # Show last 10
-                history_content += f"{i}. {entry['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}\n"
-                history_content += f"   Type: {entry['type']}\n"
-                history_content += f"   File: {entry['file']}\n"
-                history_content += f"   Score: {entry['score']:.1f}/10\n"
-                history_content += f"   Issues: {entry['issues']}\n\n"
+            for i, entry in enumerate(reversed(self.analysis_history), 1):
+                history_parts.append(
+                    f"{i}. {entry['timestamp']}\n"
+                    f"   Type: {entry['type']}\n"
+                    f"   File: {entry['file']}\n"
+                    f"   Score: {entry['score']:.1f}/10\n"
+                    f"   Issues: {entry['issues']}\n\n"
+                )
         else:
-            history_content += "No analyses performed yet.\n"
+            history_parts.append("No analyses performed yet.\n")
         
-        self.history_text.insert(tk.END, history_content)
-        self.history_text.config(state='disabled')
+        self.defer_tab_text(self.history_frame, "".join(history_parts))
     
     def analysis_complete(self):
         """Called when analysis is complete"""
@@ -735,24 +842,28 @@ def process_payment(amount):
             try:
                 feedback, pr_info = self.analysis_results
                 
+                # The report is joined and written, so encoded, in one call
+                parts = [
+                    "PR Review Agent Pro - Analysis Report\n",
+                    "=" * 50 + "\n\n",
+                    f"Generated: {datetime.now().strftime(TIME_FORMAT)}\n",
+                    f"File: {pr_info.title}\n",
+                    f"Score: {feedback.overall_score:.1f}/10\n\n",
+                    "SUMMARY:\n",
+                    feedback.summary + "\n\n",
+                    "ISSUES:\n"
+                ]
+                for i, issue in enumerate(feedback.issues, 1):
+                    suggestion = f"   Suggestion: {issue.suggestion}\n" if issue.suggestion else ""
+                    parts.append(
+                        f"{i}. {issue.severity.upper()} - {issue.file_path}:{issue.line_number}\n"
+                        f"   {issue.message}\n{suggestion}\n"
+                    )
+                parts.append("SUGGESTIONS:\n")
+                parts.extend(f"{i}. {suggestion}\n" for i, suggestion in enumerate(feedback.suggestions, 1))
+                
                 with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write("PR Review Agent Pro - Analysis Report\n")
-                    f.write("=" * 50 + "\n\n")
-                    f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"File: {pr_info.title}\n")
-                    f.write(f"Score: {feedback.overall_score:.1f}/10\n\n")
-                    f.write("SUMMARY:\n")
-                    f.write(feedback.summary + "\n\n")
-                    f.write("ISSUES:\n")
-                    for i, issue in enumerate(feedback.issues, 1):
-                        f.write(f"{i}. {issue.severity.upper()} - {issue.file_path}:{issue.line_number}\n")
-                        f.write(f"   {issue.message}\n")
-                        if issue.suggestion:
-                            f.write(f"   Suggestion: {issue.suggestion}\n")
-                        f.write("\n")
-                    f.write("SUGGESTIONS:\n")
-                    for i, suggestion in enumerate(feedback.suggestions, 1):
-                        f.write(f"{i}. {suggestion}\n")
+                    f.write("".join(parts))
                 
                 messagebox.showinfo("Success", f"Report exported to {file_path}")
                 
@@ -762,7 +873,8 @@ def process_payment(amount):
     def clear_results(self):
         """Clear all results"""
         if messagebox.askyesno("Confirm", "Clear all results and history?"):
-            # Clear text widgets
+            # Drop results not yet shown, then clear text widgets
+            self._pending_tab_text.clear()
             self.summary_text.config(state='normal')
             self.issues_text.config(state='normal')
             self.suggestions_text.config(state='normal')
@@ -772,8 +884,10 @@ def process_payment(amount):
             self.suggestions_text.delete(1.0, tk.END)
             
             # Reset to initial content
-            self.summary_text.insert(tk.END, "Welcome to PR Review Agent Pro!\n\n")
-            self.summary_text.insert(tk.END, "Select a Python file or run the demo to get started.\n")
+            self.summary_text.insert(tk.END, (
+                "Welcome to PR Review Agent Pro!\n\n"
+                "Select a Python file or run the demo to get started.\n"
+            ))
             self.summary_text.config(state='disabled')
             
             self.issues_text.insert(tk.END, "No issues found yet.\n")
@@ -796,48 +910,17 @@ def process_payment(amount):
     
     def show_help(self):
         """Show help dialog"""
-        help_text = """PR Review Agent Pro - Help & Tips
-
-🎯 How to Use:
-1. Click 'Browse Files' to select a Python file
-2. Click 'Run Demo' to see a sample analysis
-3. Click 'Analyze Code' to analyze your file
-4. Check the tabs for detailed results
-
-📊 Understanding Results:
-• Score 8-10: Excellent code quality
-• Score 6-7: Good code with minor issues
-• Score 4-5: Fair code with several issues
-• Score 0-3: Poor code with many issues
-
-🐛 Issue Severity:
-• 🔴 Critical: Security vulnerabilities, major bugs
-• 🟠 High: Important issues that should be fixed
-• 🟡 Medium: Style and quality improvements
-• 🟢 Low: Minor suggestions and best practices
-
-💡 Tips for Better Code:
-• Use environment variables for secrets
-• Add proper error handling
-• Keep lines under 100 characters
-• Add docstrings to functions
-• Use meaningful variable names
-• Remove debug print statements
-
-🚀 Features:
-• Real-time analysis
-• Export reports
-• Analysis history
-• Multiple file support
-• Professional interface
-
-For more help, visit: https://github.com/your-repo/pr-review-agent
-"""
+        if self.help_window is not None and self.help_window.winfo_exists():
+            self.help_window.deiconify()
+            self.help_window.lift()
+            return
         
-        help_window = tk.Toplevel(self.root)
+        help_window = self.help_window = tk.Toplevel(self.root)
         help_window.title("Help & Tips")
         help_window.geometry("600x500")
         help_window.configure(bg='#f8f9fa')
+        # Closing only hides the window, so the next click just shows it
+        help_window.protocol('WM_DELETE_WINDOW', help_window.withdraw)
         
         help_text_widget = scrolledtext.ScrolledText(
             help_window,
@@ -849,7 +932,7 @@ For more help, visit: https://github.com/your-repo/pr-review-agent
             pady=20
         )
         help_text_widget.pack(fill='both', expand=True, padx=20, pady=20)
-        help_text_widget.insert(tk.END, help_text)
+        help_text_widget.insert(tk.END, HELP_TEXT)
         help_text_widget.config(state='disabled')
 
 def main():
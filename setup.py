@@ -33,6 +33,10 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        # Brotli-compressed API responses, faster timestamp and JSON parsing
+        "speedups": ["brotli>=1.0.9", "ciso8601>=2.3.0", "orjson>=3.9.0"],
+    },
     entry_points={
         "console_scripts": [
             "pr-review=pr_review_agent.cli:main",
@@ -7,10 +7,50 @@ This is a working version that demonstrates the core functionality
 import os
 import sys
 import json
+import hashlib
+import multiprocessing
+import threading
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from itertools import accumulate, compress, count
+from typing import List, Dict, Any, Optional, Tuple
+
+# Substrings the per-line rules look for, lowercased. Finding them in the
+# lowercased buffer gives a superset of the lines the rules can fire on; the
+# rules themselves are still evaluated on each of those lines.
+_RULE_TRIGGERS = ("print(", "password", "todo", "fixme", "except:", "eval(", "exec(")
+
+# Score penalty per issue of each severity
+SEVERITY_PENALTIES = {"critical": 2.0, "high": 1.0, "medium": 0.5, "low": 0.1}
+
+# analyze_file results, as rows of issue fields, keyed by (file_path,
+# content digest), least recently used first. The web app and GUIs see the
+# same snippets over and over.
+ANALYSIS_CACHE_SIZE = 256
+_analysis_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+# Results for files at least this large (in characters) are also kept on
+# disk, so re-running the review skips large files that have not changed.
+# Bump RULES_VERSION whenever a rule changes to leave stale entries behind.
+DISK_CACHE_MIN_CHARS = 64 * 1024
+RULES_VERSION = 1
+CACHE_DIR = os.path.join(
+    os.environ.get('PR_REVIEW_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'pr-review-agent'),
+    'simple', f'v{RULES_VERSION}'
+)
+
+# Batches smaller than this (in characters) are analyzed in-process, where
+# they finish faster than it takes to ship them to worker processes
+PARALLEL_MIN_CHARS = 256 * 1024
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
 
 class SimpleCodeIssue:
+    __slots__ = ('file_path', 'line_number', 'severity', 'category', 'message', 'suggestion')
+    
     def __init__(self, file_path: str, line_number: int, severity: str, category: str, message: str, suggestion: str = ""):
         self.file_path = file_path
         self.line_number = line_number
@@ -20,6 +60,8 @@ class SimpleCodeIssue:
         self.suggestion = suggestion
 
 class SimplePRInfo:
+    __slots__ = ('number', 'title', 'author', 'files_changed', 'additions', 'deletions')
+    
     def __init__(self, number: int, title: str, author: str, files_changed: List[str], additions: int, deletions: int):
         self.number = number
         self.title = title
@@ -29,6 +71,8 @@ class SimplePRInfo:
         self.deletions = deletions
 
 class SimpleReviewFeedback:
+    __slots__ = ('overall_score', 'summary', 'issues', 'suggestions', 'strengths')
+    
     def __init__(self, overall_score: float, summary: str, issues: List[SimpleCodeIssue], suggestions: List[str], strengths: List[str]):
         self.overall_score = overall_score
         self.summary = summary
@@ -42,56 +86,94 @@ class SimpleCodeAnalyzer:
     def analyze(self, file_path: str, content: str) -> List[SimpleCodeIssue]:
         issues = []
         lines = content.split('\n')
+        # Lowercase the whole buffer once; the rules and the trigger search
+        # both work on these lines instead of lowering line by line
+        content_lower = content.lower()
+        if len(content_lower) == len(content):
+            # lower() kept every character one character long, so the
+            # lowered lines are sliced out of content_lower when a rule needs
+            # them instead of all being held at once
+            lines_lower = None
+            line_lengths = map(len, lines)
+        else:
+            # lower() turned a character into two; split the lowered buffer
+            lines_lower = content_lower.split('\n')
+            line_lengths = map(len, lines_lower)
+        # Line offsets within content_lower
+        line_starts = list(accumulate(map((1).__add__, line_lengths), initial=0))
         
-        for i, line in enumerate(lines, 1):
-            line_lower = line.lower().strip()
-            
-            # Skip empty lines and comments
-            if not line_lower or line_lower.startswith('#'):
-                continue
-                
-            # Check for common issues
-            if 'print(' in line and 'debug' not in line_lower:
-                issues.append(SimpleCodeIssue(
-                    file_path, i, "low", "readability",
-                    "Debug print statement found",
-                    "Remove or replace with proper logging"
-                ))
-            
-            if 'password' in line_lower and '=' in line and '"' in line:
-                issues.append(SimpleCodeIssue(
-                    file_path, i, "high", "security",
-                    "Potential hardcoded password",
-                    "Use environment variables for sensitive data"
-                ))
-            
-            if len(line) > 100:
-                issues.append(SimpleCodeIssue(
-                    file_path, i, "medium", "style",
-                    "Line too long",
-                    "Break long lines for better readability"
-                ))
-            
-            if 'todo' in line_lower or 'fixme' in line_lower:
-                issues.append(SimpleCodeIssue(
-                    file_path, i, "low", "maintainability",
-                    "TODO/FIXME comment found",
-                    "Address pending tasks before merging"
-                ))
-            
-            if 'except:' in line_lower and 'except Exception:' not in line_lower:
-                issues.append(SimpleCodeIssue(
-                    file_path, i, "medium", "bug",
-                    "Bare except clause",
-                    "Specify exception types for better error handling"
-                ))
+        # Only lines that contain a rule trigger or are too long can produce
+        # issues, so locate those with C-level searches over the whole buffer
+        # instead of running every rule on every line. compress/map keep
+        # the line length check out of the interpreter loop as well.
+        candidates = set(compress(count(1), map((100).__lt__, map(len, lines))))
+        for trigger in _RULE_TRIGGERS:
+            pos = content_lower.find(trigger)
+            while pos != -1:
+                line_number = bisect_right(line_starts, pos)
+                candidates.add(line_number)
+                # One hit per line is enough, resume on the next line
+                pos = content_lower.find(trigger, line_starts[line_number])
+        
+        for i in sorted(candidates):
+            if lines_lower is None:
+                line_lower = content_lower[line_starts[i - 1]:line_starts[i] - 1]
+            else:
+                line_lower = lines_lower[i - 1]
+            issues.extend(self._check_line(file_path, i, lines[i - 1], line_lower))
+
+        return issues
+
+    def _check_line(self, file_path: str, i: int, line: str, line_lower: str) -> List[SimpleCodeIssue]:
+        issues = []
+        line_lower = line_lower.strip()
+        
+        # Skip empty lines and comments
+        if not line_lower or line_lower.startswith('#'):
+            return issues
             
-            if 'eval(' in line_lower or 'exec(' in line_lower:
-                issues.append(SimpleCodeIssue(
-                    file_path, i, "high", "security",
-                    "Use of eval/exec detected",
-                    "Avoid eval/exec for security reasons"
-                ))
+        # Check for common issues
+        if 'print(' in line and 'debug' not in line_lower:
+            issues.append(SimpleCodeIssue(
+                file_path, i, "low", "readability",
+                "Debug print statement found",
+                "Remove or replace with proper logging"
+            ))
+        
+        if 'password' in line_lower and '=' in line and '"' in line:
+            issues.append(SimpleCodeIssue(
+                file_path, i, "high", "security",
+                "Potential hardcoded password",
+                "Use environment variables for sensitive data"
+            ))
+        
+        if len(line) > 100:
+            issues.append(SimpleCodeIssue(
+                file_path, i, "medium", "style",
+                "Line too long",
+                "Break long lines for better readability"
+            ))
+        
+        if 'todo' in line_lower or 'fixme' in line_lower:
+            issues.append(SimpleCodeIssue(
+                file_path, i, "low", "maintainability",
+                "TODO/FIXME comment found",
+                "Address pending tasks before merging"
+            ))
+        
+        if 'except:' in line_lower and 'except Exception:' not in line_lower:
+            issues.append(SimpleCodeIssue(
+                file_path, i, "medium", "bug",
+                "Bare except clause",
+                "Specify exception types for better error handling"
+            ))
+        
+        if 'eval(' in line_lower or 'exec(' in line_lower:
+            issues.append(SimpleCodeIssue(
+                file_path, i, "high", "security",
+                "Use of eval/exec detected",
+                "Avoid eval/exec for security reasons"
+            ))
 
         return issues
 
@@ -101,17 +183,7 @@ def calculate_score(issues: List[SimpleCodeIssue]) -> float:
         return 10.0
     
     base_score = 10.0
-    penalty = 0
-    
-    for issue in issues:
-        if issue.severity == "critical":
-            penalty += 2.0
-        elif issue.severity == "high":
-            penalty += 1.0
-        elif issue.severity == "medium":
-            penalty += 0.5
-        elif issue.severity == "low":
-            penalty += 0.1
+    penalty = sum(SEVERITY_PENALTIES.get(issue.severity, 0.0) for issue in issues)
     
     return max(0.0, base_score - penalty)
 
@@ -125,9 +197,7 @@ def generate_feedback(issues: List[SimpleCodeIssue], pr_info: SimplePRInfo) -> S
     if not issues:
         summary = f"✅ Excellent work! No issues found in this {pr_info.additions + pr_info.deletions} line change across {len(pr_info.files_changed)} files."
     else:
-        severity_counts = {}
-        for issue in issues:
-            severity_counts[issue.severity] = severity_counts.get(issue.severity, 0) + 1
+        severity_counts = Counter(issue.severity for issue in issues)
         
         summary_parts = [f"Found {len(issues)} issues in {len(pr_info.files_changed)} files:"]
         for severity in ["critical", "high", "medium", "low"]:
@@ -138,25 +208,147 @@ def generate_feedback(issues: List[SimpleCodeIssue], pr_info: SimplePRInfo) -> S
         summary = " ".join(summary_parts)
     
     # Extract suggestions
-    suggestions = list(set([issue.suggestion for issue in issues if issue.suggestion]))
+    # Deduplicate while keeping first-seen order so output is stable
+    suggestions = list(dict.fromkeys(issue.suggestion for issue in issues if issue.suggestion))
+    
+    # Identify strengths, checking the file list in a single pass
+    has_tests = has_docs = False
+    for f in pr_info.files_changed:
+        has_tests = has_tests or 'test' in f.lower()
+        has_docs = has_docs or f.endswith('.md')
+        if has_tests and has_docs:
+            break
     
-    # Identify strengths
     strengths = []
     if pr_info.additions > 0 and pr_info.deletions > 0:
         strengths.append("Good balance of additions and deletions")
     if len(pr_info.files_changed) <= 10:
         strengths.append("Focused changes across reasonable number of files")
-    if any('test' in f.lower() for f in pr_info.files_changed):
+    if has_tests:
         strengths.append("Includes test updates")
-    if any(f.endswith('.md') for f in pr_info.files_changed):
+    if has_docs:
         strengths.append("Includes documentation updates")
 
     return SimpleReviewFeedback(score, summary, issues, suggestions, strengths)
 
+def read_source(path: str) -> str:
+    """Read a UTF-8 source file the way text mode would, in one decode"""
+    # A single bytes read plus decode avoids the text layer's incremental
+    # decoder; newlines are then normalized as universal newlines mode does
+    with open(path, 'rb') as f:
+        content = f.read().decode('utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+def count_lines(content: str) -> Tuple[int, int]:
+    """Return the total and non-blank line counts of content"""
+    lines = content.split('\n')
+    # Blank lines are empty or all whitespace; both are counted in C
+    return len(lines), len(lines) - lines.count('') - sum(map(str.isspace, lines))
+
+def _issue_rows(issues: List[SimpleCodeIssue]) -> Tuple[tuple, ...]:
+    """Everything but the path of each issue, as plain tuples"""
+    return tuple((issue.line_number, issue.severity, issue.category, issue.message, issue.suggestion) for issue in issues)
+
+def _disk_path(digest: bytes) -> str:
+    name = digest.hex()
+    return os.path.join(CACHE_DIR, name[:2], name + '.json')
+
+def _disk_get(digest: bytes) -> Optional[Tuple[tuple, ...]]:
+    """Load the issue rows stored for a content digest, or None on a miss"""
+    try:
+        with open(_disk_path(digest), 'rb') as cache_file:
+            rows = tuple(map(tuple, json.loads(cache_file.read())))
+    except (OSError, ValueError, TypeError):
+        # Missing, unreadable or corrupt entries are treated as misses
+        return None
+    if any(len(row) != 5 for row in rows):
+        return None
+    return rows
+
+def _disk_put(digest: bytes, rows: Tuple[tuple, ...]) -> None:
+    """Store issue rows for a content digest; failures are ignored"""
+    path = _disk_path(digest)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, 'wb') as cache_file:
+            cache_file.write(json.dumps(rows).encode('utf-8'))
+        # Atomic rename so concurrent readers never see a partial entry
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
 def analyze_file(file_path: str, content: str) -> List[SimpleCodeIssue]:
-    """Analyze a single file"""
-    analyzer = SimpleCodeAnalyzer()
-    return analyzer.analyze(file_path, content)
+    """Analyze a single file, reusing the result for content seen before"""
+    digest = hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    key = (file_path, digest)
+    
+    with _analysis_cache_lock:
+        rows = _analysis_cache.get(key)
+        if rows is not None:
+            _analysis_cache.move_to_end(key)
+    
+    if rows is None:
+        # The rules do not depend on the path, so the disk cache leaves it out
+        on_disk = len(content) >= DISK_CACHE_MIN_CHARS
+        rows = _disk_get(digest) if on_disk else None
+        if rows is None:
+            rows = _issue_rows(SimpleCodeAnalyzer().analyze(file_path, content))
+            if on_disk:
+                _disk_put(digest, rows)
+        
+        with _analysis_cache_lock:
+            _analysis_cache[key] = rows
+            if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+                _analysis_cache.popitem(last=False)
+    
+    # Fresh issues on every call, so callers can change theirs without
+    # changing what later calls get
+    return [SimpleCodeIssue(file_path, *row) for row in rows]
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Create the shared worker pool on first use"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn, not fork: the web app calls this from request threads,
+            # and a forked child would inherit any lock they hold
+            _process_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(), mp_context=multiprocessing.get_context('spawn')
+            )
+        return _process_pool
+
+def analyze_files(file_contents: Dict[str, str]) -> Dict[str, List[SimpleCodeIssue]]:
+    """Analyze several files, spreading large batches across CPU cores"""
+    # Identical files (vendored or generated copies) are analyzed only once;
+    # the rules do not depend on the path, so copies just get their own path
+    first_paths: Dict[str, str] = {}
+    for path, content in file_contents.items():
+        first_paths.setdefault(content, path)
+    unique = {path: content for content, path in first_paths.items()}
+    
+    total_size = sum(map(len, unique.values()))
+    if len(unique) < 2 or total_size < PARALLEL_MIN_CHARS:
+        results = {path: analyze_file(path, content) for path, content in unique.items()}
+    else:
+        pool = _get_process_pool()
+        paths = list(unique)
+        chunksize = max(1, len(paths) // (4 * (os.cpu_count() or 1)))
+        results = dict(zip(paths, pool.map(analyze_file, paths, list(unique.values()), chunksize=chunksize)))
+    
+    analyzed = {}
+    for path, content in file_contents.items():
+        first_path = first_paths[content]
+        if path == first_path:
+            analyzed[path] = results[path]
+        else:
+            analyzed[path] = [
+                SimpleCodeIssue(path, issue.line_number, issue.severity, issue.category, issue.message, issue.suggestion)
+                for issue in results[first_path]
+            ]
+    return analyzed
 
 def review_pr(pr_info: SimplePRInfo, file_contents: Dict[str, str]) -> SimpleReviewFeedback:
     """Review a pull request"""
@@ -168,11 +360,17 @@ def review_pr(pr_info: SimplePRInfo, file_contents: Dict[str, str]) -> SimpleRev
     
     all_issues = []
     
-    # Analyze each file
+    # Analyze every provided file up front in one batch, so identical
+    # contents are scanned once and large PRs use all cores
+    results = analyze_files({
+        file_path: file_contents[file_path]
+        for file_path in pr_info.files_changed if file_path in file_contents
+    })
+    
     for file_path in pr_info.files_changed:
         if file_path in file_contents:
             print(f"📄 Analyzing {file_path}...")
-            issues = analyze_file(file_path, file_contents[file_path])
+            issues = results[file_path]
             all_issues.extend(issues)
             print(f"   Found {len(issues)} issues")
         else:
@@ -0,0 +1,24 @@
+"""Shared test fixtures."""
+
+from collections import OrderedDict
+
+import os
+
+import pytest
+import simple_pr_review
+from pr_review_agent.analyzers import _cache
+from pr_review_agent.providers import _http_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep the caches of every test in its own directory, starting empty."""
+    directory = str(tmp_path / "cache")
+    monkeypatch.setattr(_cache, "CACHE_DIR", directory)
+    monkeypatch.setattr(_cache, "_results", OrderedDict())
+    monkeypatch.setattr(_cache, "_clean", {})
+    monkeypatch.setattr(_http_cache, "CACHE_DIR", directory)
+    monkeypatch.setattr(simple_pr_review, "CACHE_DIR", os.path.join(directory, "simple"))
+    monkeypatch.setattr(simple_pr_review, "_analysis_cache", OrderedDict())
+    _cache.config_fingerprint.cache_clear()
+    return directory
@@ -2,11 +2,31 @@
 
 import pytest
 from unittest.mock import Mock, patch
+from pr_review_agent.analyzers.base import CodeAnalyzer
 from pr_review_agent.core.agent import PRReviewAgent
 from pr_review_agent.core.models import AnalysisConfig, IssueSeverity, PRInfo, CodeIssue
 from datetime import datetime
 
 
+@pytest.fixture
+def pr_info():
+    """A small PR touching one Python file."""
+    return PRInfo(
+        number=123,
+        title="Test PR",
+        description="Test description",
+        author="testuser",
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+        base_branch="main",
+        head_branch="feature",
+        files_changed=["test.py"],
+        additions=10,
+        deletions=5,
+        commits=1
+    )
+
+
 class TestPRReviewAgent:
     """Test cases for PRReviewAgent."""
     
@@ -159,6 +179,24 @@ class TestPRReviewAgent:
         assert "Includes documentation updates" in strengths
         assert "Includes test updates" in strengths
 
+    def test_select_issues(self):
+        """Test per-file threshold filtering and issue cap."""
+        self.agent.config.max_issues_per_file = 2
+        severities = [IssueSeverity.LOW, IssueSeverity.MEDIUM, IssueSeverity.CRITICAL, IssueSeverity.MEDIUM]
+        issues = [
+            CodeIssue(
+                file_path="test.py",
+                line_number=line,
+                severity=severity,
+                category="bug",
+                message=f"Issue {line}"
+            )
+            for line, severity in enumerate(severities, 1)
+        ]
+
+        selected = self.agent._select_issues(issues, self.agent._get_severity_level("medium"))
+        assert [issue.line_number for issue in selected] == [2, 3]  # Most severe, in original order
+
 
 class TestMockProvider:
     """Test with mocked provider."""
@@ -176,65 +214,52 @@ class TestMockProvider:
         )
         self.agent = PRReviewAgent(self.config)
     
+    @pytest.mark.parametrize("post_comments", [False, True])
     @patch('pr_review_agent.core.agent.PRReviewAgent._get_provider')
-    def test_review_pr_success(self, mock_get_provider):
-        """Test successful PR review."""
+    def test_review_pr(self, mock_get_provider, pr_info, post_comments):
+        """Test PR review, with and without comment posting."""
         # Mock provider
         mock_provider = Mock()
-        mock_provider.get_pr_info.return_value = PRInfo(
-            number=123,
-            title="Test PR",
-            description="Test description",
-            author="testuser",
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
-            base_branch="main",
-            head_branch="feature",
-            files_changed=["test.py"],
-            additions=10,
-            deletions=5,
-            commits=1
-        )
+        mock_provider.get_pr_info.return_value = pr_info
         mock_provider.get_file_content.return_value = "print('hello world')"
+        mock_provider.post_comment.return_value = True
         mock_get_provider.return_value = mock_provider
         
         # Run review
-        result = self.agent.review_pr("github", "owner/repo", 123)
+        result = self.agent.review_pr("github", "owner/repo", 123, post_comments=post_comments)
         
         # Verify results
         assert result.pr_info.number == 123
         assert result.pr_info.title == "Test PR"
         assert result.provider == "github"
         assert result.analysis_duration > 0
-    
+        assert mock_provider.post_comment.called == post_comments
+
     @patch('pr_review_agent.core.agent.PRReviewAgent._get_provider')
-    def test_review_pr_with_comments(self, mock_get_provider):
-        """Test PR review with comment posting."""
-        # Mock provider
+    def test_review_pr_identical_files(self, mock_get_provider, pr_info):
+        """Test that copies of a file are analyzed under their own paths."""
+        class PathAnalyzer(CodeAnalyzer):
+            # Like Black's diff header, the issue depends on the path
+            def analyze(self, file_path, content):
+                return [CodeIssue(file_path=file_path, line_number=1, severity=IssueSeverity.HIGH,
+                                  category="style", message=f"Checked {file_path}")]
+
+            def get_name(self):
+                return "Path"
+
+        pr_info.files_changed = ["a/util.py", "b/util.py"]
         mock_provider = Mock()
-        mock_provider.get_pr_info.return_value = PRInfo(
-            number=123,
-            title="Test PR",
-            description="Test description",
-            author="testuser",
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
-            base_branch="main",
-            head_branch="feature",
-            files_changed=["test.py"],
-            additions=10,
-            deletions=5,
-            commits=1
-        )
+        mock_provider.get_pr_info.return_value = pr_info
         mock_provider.get_file_content.return_value = "print('hello world')"
-        mock_provider.post_comment.return_value = True
         mock_get_provider.return_value = mock_provider
-        
-        # Run review with comments
-        result = self.agent.review_pr("github", "owner/repo", 123, post_comments=True)
-        
-        # Verify comment was posted
-        assert mock_provider.post_comment.called
+        self.agent.register(PathAnalyzer(self.config))
+
+        result = self.agent.review_pr("github", "owner/repo", 123)
+
+        assert [(issue.file_path, issue.message) for issue in result.feedback.issues] == [
+            ("a/util.py", "Checked a/util.py"),
+            ("b/util.py", "Checked b/util.py"),
+        ]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,414 @@
+"""Tests for the code analyzers."""
+
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pytest
+from pr_review_agent.analyzers import _cache, flake8_analyzer, pylint_analyzer, safety_analyzer
+from pr_review_agent.analyzers._cache import CachedAnalyzerMixin
+from pr_review_agent.analyzers import _workspace
+from pr_review_agent.analyzers._workspace import split_output, stream_lines, temp_workspace
+from pr_review_agent.analyzers.mypy_analyzer import MyPyAnalyzer
+from pr_review_agent.analyzers.black_analyzer import BlackAnalyzer
+from pr_review_agent.analyzers.flake8_analyzer import Flake8Analyzer
+from pr_review_agent.analyzers.pylint_analyzer import PylintAnalyzer
+from pr_review_agent.analyzers.safety_analyzer import SafetyAnalyzer
+from pr_review_agent.core.agent import PRReviewAgent
+from pr_review_agent.core.models import AnalysisConfig, CodeIssue, IssueCategory, IssueSeverity
+
+
+# Flake8 reports F401, F841, E302 (twice), E231, E111 (twice) and E225 here
+STYLE_SAMPLE = """import os
+def f(a,b):
+  unused = 1
+  return a+b
+def g():
+    x=1
+    return x
+"""
+
+
+def only_config(**enabled) -> AnalysisConfig:
+    """An AnalysisConfig with every analyzer off except those given."""
+    flags = dict(
+        enable_pylint=False,
+        enable_flake8=False,
+        enable_black=False,
+        enable_mypy=False,
+        enable_bandit=False,
+        enable_safety=False,
+        enable_ai_analysis=False
+    )
+    flags.update(enabled)
+    return AnalysisConfig(**flags)
+
+
+class TestWorkspace:
+    """Temporary copies of PR files for the command-line analyzers."""
+
+    def test_temp_workspace(self):
+        """Test that every file gets its own copy, removed when the last user is done."""
+        files = {"pkg/a.py": "x = 1\n", "other/a.py": "x = 1\n", "b.py": "y = 2\n"}
+        with temp_workspace(files) as temp_paths:
+            assert sorted(temp_paths.values()) == sorted(files)
+            assert len(set(temp_paths)) == 3
+            for temp_path, file_path in temp_paths.items():
+                assert temp_path.endswith(".py")
+                with open(temp_path) as temp_file:
+                    assert temp_file.read() == files[file_path]
+
+            # Another analyzer checking the same file shares its copy
+            with temp_workspace({"b.py": "y = 2\n"}) as nested:
+                assert set(nested) <= set(temp_paths)
+            assert all(os.path.exists(temp_path) for temp_path in temp_paths)
+
+        assert not any(os.path.exists(temp_path) for temp_path in temp_paths)
+
+    def test_split_output(self):
+        """Test that tool output lines are grouped by original file path."""
+        with temp_workspace({"a.py": "x = 1\n", "b.py": "y = 2\n"}) as temp_paths:
+            by_file = {file_path: temp_path for temp_path, file_path in temp_paths.items()}
+            output = "\n".join([
+                f"{by_file['a.py']}:1:1: E1 first",
+                "summary line",
+                f"{by_file['b.py']}:1:1: E2 second",
+                f"{by_file['a.py']}:2:1: E3 third",
+            ])
+            assert split_output(output, temp_paths) == {
+                "a.py": [f"{by_file['a.py']}:1:1: E1 first", f"{by_file['a.py']}:2:1: E3 third"],
+                "b.py": [f"{by_file['b.py']}:1:1: E2 second"],
+            }
+
+    def test_stream_lines(self):
+        """Test that a command's output is yielded line by line."""
+        command = [sys.executable, "-c", "print('one'); print('two')"]
+        assert list(stream_lines(command, timeout=30)) == ["one\n", "two\n"]
+
+    def test_stream_lines_timeout(self):
+        """Test that a command running past its timeout is killed and reported."""
+        command = [sys.executable, "-c", "import time; time.sleep(30)"]
+        started = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired):
+            list(stream_lines(command, timeout=0.5))
+        assert time.monotonic() - started < 10
+
+
+class CountingAnalyzer(CachedAnalyzerMixin):
+    """Reports one issue per TODO and counts how often it really runs."""
+
+    persistent_cache = True
+    tool_command = 'python'
+
+    def __init__(self, config: AnalysisConfig):
+        self.config = config
+        self.runs = 0
+
+    def get_name(self) -> str:
+        return "Counting"
+
+    def should_analyze(self, file_path: str) -> bool:
+        return True
+
+    def analyze(self, file_path, content):
+        return self._cached_analyze(file_path, content, self._run)
+
+    def _run(self, file_path, content):
+        self.runs += 1
+        return [
+            CodeIssue(
+                file_path=file_path,
+                line_number=number,
+                severity=IssueSeverity.LOW,
+                category=IssueCategory.MAINTAINABILITY,
+                message="TODO left in code",
+                tool="counting"
+            )
+            for number, line in enumerate(content.splitlines(), 1) if "TODO" in line
+        ]
+
+
+class TestResultCache:
+    """Analyzer results are reused until the file, config or tool setup changes."""
+
+    def test_hit_and_miss(self):
+        """Test that unchanged content is served from memory and changed content is analyzed."""
+        analyzer = CountingAnalyzer(AnalysisConfig())
+
+        assert len(analyzer.analyze("a.py", "# TODO\n")) == 1
+        assert len(analyzer.analyze("a.py", "# TODO\n")) == 1
+        assert analyzer.runs == 1
+
+        assert analyzer.analyze("a.py", "x = 1\n") == []
+        assert analyzer.runs == 2
+
+    def test_config_is_part_of_the_key(self):
+        """Test that an analyzer with different settings does not reuse results."""
+        CountingAnalyzer(AnalysisConfig()).analyze("a.py", "# TODO\n")
+
+        analyzer = CountingAnalyzer(AnalysisConfig(max_issues_per_file=5))
+        analyzer.analyze("a.py", "# TODO\n")
+        assert analyzer.runs == 1
+
+    def test_disk_hit(self, monkeypatch):
+        """Test that a new process reads issues and clean files back from disk."""
+        first = CountingAnalyzer(AnalysisConfig())
+        first.analyze("a.py", "# TODO\n")
+        first.analyze("b.py", "x = 1\n")
+
+        # As seen by the next process
+        monkeypatch.setattr(_cache, "_results", OrderedDict())
+        monkeypatch.setattr(_cache, "_clean", {})
+        second = CountingAnalyzer(AnalysisConfig())
+        assert [issue.line_number for issue in second.analyze("a.py", "# TODO\n")] == [1]
+        assert second.analyze("b.py", "x = 1\n") == []
+        assert second.runs == 0
+
+    def test_config_file_change_invalidates(self, monkeypatch, tmp_path):
+        """Test that editing a tool configuration file misses the disk cache."""
+        monkeypatch.chdir(tmp_path)
+        CountingAnalyzer(AnalysisConfig()).analyze("a.py", "# TODO\n")
+
+        (tmp_path / "setup.cfg").write_text("[flake8]\nmax-line-length = 100\n")
+        _cache.config_fingerprint.cache_clear()
+        monkeypatch.setattr(_cache, "_results", OrderedDict())
+        analyzer = CountingAnalyzer(AnalysisConfig())
+        analyzer.analyze("a.py", "# TODO\n")
+        assert analyzer.runs == 1
+
+    def test_corrupt_entry_is_a_miss(self, monkeypatch, cache_dir):
+        """Test that an unreadable disk entry is re-analyzed and rewritten."""
+        CountingAnalyzer(AnalysisConfig()).analyze("a.py", "# TODO\n")
+        for directory, _, names in os.walk(os.path.join(cache_dir, "Counting")):
+            for name in names:
+                with open(os.path.join(directory, name), "w") as entry:
+                    entry.write("{not json")
+
+        monkeypatch.setattr(_cache, "_results", OrderedDict())
+        analyzer = CountingAnalyzer(AnalysisConfig())
+        assert len(analyzer.analyze("a.py", "# TODO\n")) == 1
+        assert analyzer.runs == 1
+
+    def test_clean_list_is_bounded(self, monkeypatch, cache_dir):
+        """Test that the list of clean files drops its oldest half when full."""
+        monkeypatch.setattr(_cache, "CLEAN_LIST_SIZE", 4)
+        analyzer = CountingAnalyzer(AnalysisConfig())
+        for number in range(10):
+            analyzer.analyze("a.py", f"x = {number}\n")
+
+        with open(os.path.join(cache_dir, "Counting", "clean.txt")) as clean_file:
+            assert len(clean_file.read().split()) <= 4
+        assert len(_cache._clean["Counting"]) <= 4
+        # The newest clean file is still known
+        assert analyzer.analyze("a.py", "x = 9\n") == []
+        assert analyzer.runs == 10
+
+
+class TestBlackAnalyzer:
+    """Black formats each file once for both its issues and its metrics."""
+
+    @pytest.mark.skipif(importlib.util.find_spec("black") is None, reason="black is not installed")
+    def test_formats_once(self, monkeypatch):
+        """Test that the agent's issues-and-metrics call runs Black a single time."""
+        analyzer = BlackAnalyzer(only_config(enable_black=True))
+        formats = []
+        format_content = analyzer._format
+        monkeypatch.setattr(analyzer, "_format", lambda content: formats.append(content) or format_content(content))
+
+        agent = PRReviewAgent(only_config())
+        issues, metrics = agent._run_analyzer(analyzer, "sample.py", STYLE_SAMPLE)
+        assert [issue.rule_id for issue in issues] == ["black-formatting"]
+        assert metrics == {"black_needs_formatting": True, "black_compatible": False}
+        assert analyzer.get_metrics("sample.py", STYLE_SAMPLE) == metrics
+        assert len(formats) == 1
+
+        assert analyzer.analyze_with_metrics("clean.py", "x = 1\n") == (
+            [], {"black_needs_formatting": False, "black_compatible": True}
+        )
+        # Code Black cannot format is neither compatible nor cached as clean
+        assert analyzer.analyze_with_metrics("broken.py", "def (:\n") == (
+            [], {"black_needs_formatting": False, "black_compatible": False}
+        )
+        analyzer.analyze("broken.py", "def (:\n")
+        assert formats.count("def (:\n") == 2
+
+
+class TestFlake8Analyzer:
+    """Flake8 runs in process through its API, or as a command without it."""
+
+    @pytest.mark.skipif(flake8_analyzer.flake8_api is None, reason="flake8 API is not available")
+    def test_api_matches_command(self, monkeypatch):
+        """Test that the in-process formatter collects what the command prints."""
+        api_issues = Flake8Analyzer(only_config(enable_flake8=True)).analyze("sample.py", STYLE_SAMPLE)
+
+        _cache._results.clear()
+        monkeypatch.setattr(flake8_analyzer, "flake8_api", None)
+        monkeypatch.setattr(_cache, "CACHE_DIR", _cache.CACHE_DIR + "-command")
+        command_issues = Flake8Analyzer(only_config(enable_flake8=True)).analyze("sample.py", STYLE_SAMPLE)
+
+        def found(issues):
+            return sorted((issue.line_number, issue.rule_id) for issue in issues)
+
+        assert found(api_issues) == found(command_issues)
+        assert {"F401", "F841", "E302", "E231", "E111", "E225"} == {rule for _, rule in found(api_issues)}
+
+
+class TestMyPyAnalyzer:
+    """MyPy findings are matched back to the files they are about."""
+
+    TYPE_ERROR = "def f() -> int:\n    return 'a'\n"
+
+    @pytest.mark.skipif(shutil.which("mypy") is None, reason="mypy is not installed")
+    def test_cwd_above_workspace(self, monkeypatch):
+        """Test that findings are kept when MyPy runs from a parent of the temporary directory."""
+        monkeypatch.chdir(os.path.dirname(_workspace._workspace_dir()))
+        analyzer = MyPyAnalyzer(only_config(enable_mypy=True))
+
+        results = analyzer.analyze_many({"m1.py": self.TYPE_ERROR, "m2.py": "x = 1\n" + self.TYPE_ERROR})
+        assert [issue.line_number for issue in results["m1.py"]] == [2]
+        assert [issue.line_number for issue in results["m2.py"]] == [3]
+
+    def test_unmatched_failure_is_not_cached(self, monkeypatch):
+        """Test that a failed run that reports on none of the files is retried later."""
+        runs = []
+
+        def run(command, **kwargs):
+            runs.append(command)
+            return subprocess.CompletedProcess(command, 2, stdout="mypy: error: unexpected failure\n")
+
+        monkeypatch.setattr(subprocess, "run", run)
+        analyzer = MyPyAnalyzer(only_config(enable_mypy=True))
+        assert analyzer.analyze_many({"m1.py": self.TYPE_ERROR}) == {"m1.py": []}
+        analyzer.analyze_many({"m1.py": self.TYPE_ERROR})
+        assert len(runs) == 2
+
+
+class TestSafetyAnalyzer:
+    """Safety findings are cached only when the check actually ran."""
+
+    def test_failed_runs_are_retried(self, monkeypatch):
+        """Test that a failed check is not remembered, while a successful one is."""
+        finding = b'[{"package": "django", "advisory": "CVE", "safe_version": "4.2"}]'
+        outcomes = [FileNotFoundError("safety"), subprocess.CompletedProcess([], 64, stdout=finding)]
+        runs = []
+
+        def run(*args, **kwargs):
+            runs.append(args)
+            outcome = outcomes[min(len(runs), len(outcomes)) - 1]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        monkeypatch.setattr(safety_analyzer.subprocess, "run", run)
+        monkeypatch.setattr(safety_analyzer, "_findings", OrderedDict())
+        analyzer = SafetyAnalyzer(only_config(enable_safety=True))
+
+        assert analyzer.analyze("requirements.txt", "django==3.0\n") == []
+        issues = analyzer.analyze("requirements.txt", "django==3.0\n")
+        assert [issue.suggestion for issue in issues] == ["Update django to version 4.2"]
+        assert len(analyzer.analyze("requirements.txt", "django==3.0\n")) == 1
+        assert len(runs) == 2
+
+
+class TestRuffAnalyzer:
+    """Ruff stands in for Flake8 only when asked to."""
+
+    def test_flake8_is_the_default(self):
+        """Test that the default config keeps Flake8's full style checks."""
+        agent = PRReviewAgent(only_config(enable_flake8=True))
+        assert [analyzer.get_name() for analyzer in agent.analyzers] == ["Flake8"]
+
+    @pytest.mark.skipif(shutil.which('ruff') is None, reason="ruff is not installed")
+    def test_use_ruff(self):
+        """Test that use_ruff swaps in Ruff, which still finds Pyflakes errors."""
+        agent = PRReviewAgent(only_config(enable_flake8=True, use_ruff=True))
+        assert [analyzer.get_name() for analyzer in agent.analyzers] == ["Ruff"]
+
+        codes = {issue.rule_id for issue in agent.analyzers[0].analyze("sample.py", STYLE_SAMPLE)}
+        assert {"F401", "F841"} <= codes
+
+
+class TestPylintWorkers:
+    """Warm Pylint processes are reused, bounded and replaced when they die."""
+
+    def test_workers_are_bounded(self, monkeypatch):
+        """Test that concurrent runs wait for a free worker instead of starting more."""
+        started = []
+        running = []
+        most_running = []
+
+        class FakeWorker:
+            replies = 1
+
+            def __init__(self):
+                started.append(self)
+
+            def run(self, args, timeout):
+                running.append(self)
+                most_running.append(len(running))
+                time.sleep(0.05)
+                running.remove(self)
+                return '[]'
+
+            def alive(self):
+                return True
+
+        monkeypatch.setattr(pylint_analyzer, "MAX_WORKERS", 2)
+        monkeypatch.setattr(pylint_analyzer, "_PylintWorker", FakeWorker)
+        analyzer = PylintAnalyzer(only_config(enable_pylint=True))
+        analyzer._use_workers = True
+
+        threads = [threading.Thread(target=analyzer._pylint_json, args=([], 30)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(started) <= 2
+        assert max(most_running) <= 2
+
+    @pytest.mark.skipif(importlib.util.find_spec("pylint") is None, reason="pylint is not installed")
+    def test_worker_reuse_and_restart(self, tmp_path):
+        """Test that a worker serves several runs and a dead one is replaced."""
+        sample = tmp_path / "sample.py"
+        sample.write_text("import os\n")
+        args = ["--disable=all", "--enable=unused-import", str(sample)]
+        analyzer = PylintAnalyzer(only_config(enable_pylint=True))
+
+        assert "unused-import" in analyzer._pylint_json(args, timeout=60)
+        assert "unused-import" in analyzer._pylint_json(args, timeout=60)
+        assert len(analyzer._workers) == 1
+        worker = analyzer._workers[0]
+        assert worker.replies == 2
+
+        # A crashed worker is replaced on the next run, which still succeeds
+        worker.process.kill()
+        worker.process.wait()
+        assert "unused-import" in analyzer._pylint_json(args, timeout=60)
+        assert analyzer._use_workers
+        assert len(analyzer._workers) == 1
+        assert analyzer._workers[0] is not worker
+        analyzer._workers[0].close()
+
+    def test_closed_workers_leave_no_exit_hook(self, monkeypatch):
+        """Test that a closed worker is no longer held by its exit hook."""
+        registered = []
+
+        def unregister(func):
+            # Like atexit.unregister, a function that is not registered is ignored
+            registered[:] = [hook for hook in registered if hook != func]
+
+        monkeypatch.setattr(pylint_analyzer.atexit, "register", registered.append)
+        monkeypatch.setattr(pylint_analyzer.atexit, "unregister", unregister)
+
+        workers = [pylint_analyzer._PylintWorker() for _ in range(3)]
+        assert len(registered) == 3
+        for worker in workers:
+            worker.close()
+            worker.close()
+        assert registered == []
@@ -0,0 +1,78 @@
+"""Tests for the web application's JSON API."""
+
+import pytest
+from app import app
+
+
+@pytest.fixture
+def client():
+    """A Flask test client for the web app."""
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+class TestAnalyzeEndpoints:
+    """Test cases for /api/analyze and /api/analyze_batch."""
+
+    def test_analyze(self, client):
+        """Test analyzing a single pasted file."""
+        response = client.post('/api/analyze', json={'code': "print('hi')\n", 'filename': 'hi.py'})
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['issues_count'] == 1
+        assert body['issues'][0]['file_path'] == 'hi.py'
+
+    @pytest.mark.parametrize("url", ['/api/analyze', '/api/analyze_batch'])
+    @pytest.mark.parametrize("body", [None, [1, 2], "code", 3])
+    def test_malformed_bodies(self, client, url, body):
+        """Test that bodies other than a JSON object are rejected with 400."""
+        response = client.post(url, json=body) if body is not None else client.post(url, data='not json')
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("payload", [
+        {'code': "print('hi')\n", 'filename': ['a.py']},
+        {'code': ''},
+        {'code': 42},
+    ])
+    def test_analyze_bad_fields(self, client, payload):
+        """Test that missing code and non-string fields are rejected with 400."""
+        assert client.post('/api/analyze', json=payload).status_code == 400
+
+    @pytest.mark.parametrize("files", [["a.py"], "a.py", {'a.py': '   '}])
+    def test_analyze_batch_bad_files(self, client, files):
+        """Test that files must map names to non-blank code."""
+        assert client.post('/api/analyze_batch', json={'files': files}).status_code == 400
+
+    def test_analyze_batch(self, client):
+        """Test analyzing several files as one change set."""
+        response = client.post('/api/analyze_batch', json={'files': {
+            'a.py': "print('a')\n",
+            'b.py': "x = 1  # TODO\n",
+        }})
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['file_stats'] == {'lines': 4, 'files': 2}
+        assert sorted(issue['file_path'] for issue in body['issues']) == ['a.py', 'b.py']
+
+
+class TestExportEndpoint:
+    """Test cases for /api/export."""
+
+    def test_export(self, client):
+        """Test that an analysis is streamed back as a text attachment."""
+        analysis_id = client.post(
+            '/api/analyze', json={'code': "print('hi')\n", 'filename': 'hi.py'}
+        ).get_json()['analysis_id']
+
+        response = client.get(f'/api/export/{analysis_id}')
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'text/plain'
+        assert f'analysis_{analysis_id}.txt' in response.headers['Content-Disposition']
+        report = response.get_data(as_text=True)
+        assert 'File: hi.py' in report
+        assert '1. LOW - hi.py:1' in report
+
+    def test_export_unknown_analysis(self, client):
+        """Test that an unknown analysis id is a 404."""
+        assert client.get('/api/export/missing').status_code == 404
@@ -0,0 +1,274 @@
+"""Tests for the git server providers."""
+
+import base64
+import json
+import os
+from unittest.mock import Mock
+
+import requests
+from pr_review_agent.providers import _http_cache, base, bitbucket, github
+from pr_review_agent.providers._http_cache import conditional_get
+from pr_review_agent.providers.base import ContentCache
+from pr_review_agent.providers.bitbucket import BitbucketProvider
+from pr_review_agent.providers.github import GitHubProvider
+
+
+def make_response(body, headers=None, status_code=200, url="https://api.github.com/"):
+    """A requests.Response carrying body as JSON."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode("utf-8")
+    response.headers.update(headers or {})
+    response.url = url
+    return response
+
+
+def graphql_pr(number, paths, has_next_page):
+    """One aliased pullRequest selection as GitHub's GraphQL API returns it."""
+    return {
+        "number": number,
+        "title": f"PR {number}",
+        "body": None,
+        "author": None,
+        "createdAt": "2024-01-02T03:04:05Z",
+        "updatedAt": "2024-01-03T03:04:05Z",
+        "baseRefName": "main",
+        "headRefName": f"feature-{number}",
+        "additions": 10,
+        "deletions": 5,
+        "commits": {"totalCount": 2},
+        "files": {"nodes": [{"path": path} for path in paths], "pageInfo": {"hasNextPage": has_next_page}},
+    }
+
+
+class TestWaitForRateLimit:
+    """Test cases for slowing down before the API rate limit runs out."""
+
+    def setup_method(self):
+        self.sleeps = []
+
+    def wait(self, monkeypatch, remaining, reset_in, header_prefix="X-"):
+        """Run the hook on a response with the given rate-limit headers, at a fixed time."""
+        monkeypatch.setattr(base.time, "time", lambda: 1_000_000.0)
+        monkeypatch.setattr(base.time, "sleep", self.sleeps.append)
+        base.wait_for_rate_limit(make_response({}, headers={
+            f"{header_prefix}RateLimit-Remaining": str(remaining),
+            f"{header_prefix}RateLimit-Reset": str(1_000_000 + reset_in),
+        }))
+
+    def test_waits_for_reset(self, monkeypatch, caplog):
+        """Test that a nearly used up limit waits until the reset and says so."""
+        self.wait(monkeypatch, remaining=2, reset_in=1800)
+        assert self.sleeps == [1800]
+        assert "waiting 1800s" in caplog.text
+
+    def test_gitlab_headers(self, monkeypatch):
+        """Test that GitLab's RateLimit-* headers are honoured too."""
+        self.wait(monkeypatch, remaining=0, reset_in=40, header_prefix="")
+        assert self.sleeps == [40]
+
+    def test_enough_requests_left(self, monkeypatch):
+        """Test that requests go ahead while the reserve is not reached."""
+        self.wait(monkeypatch, remaining=base.RATE_LIMIT_RESERVE, reset_in=1800)
+        assert self.sleeps == []
+
+    def test_wait_over_cap(self, monkeypatch, caplog):
+        """Test that a reset further off than the cap is not waited for, but logged."""
+        monkeypatch.setattr(base, "MAX_RATE_LIMIT_WAIT", 600)
+        self.wait(monkeypatch, remaining=1, reset_in=1800)
+        assert self.sleeps == []
+        assert "over the 600s cap" in caplog.text
+
+
+class TestContentCache:
+    """Test cases for the in-memory cache of file contents at commit ids."""
+
+    def test_commit_ids_only(self):
+        """Test that contents at commit ids are kept and those at branch names are not."""
+        cache = ContentCache()
+        cache.put("owner/repo", "a.py", "a" * 40, "x = 1\n")
+        cache.put("owner/repo", "a.py", "main", "x = 2\n")
+
+        assert cache.get("owner/repo", "a.py", "a" * 40) == "x = 1\n"
+        assert cache.get("owner/repo", "a.py", "main") is None
+        assert cache.get("other/repo", "a.py", "a" * 40) is None
+
+    def test_least_recently_used_evicted(self):
+        """Test that a full cache drops the entry unused for longest."""
+        cache = ContentCache(size=2)
+        cache.put("owner/repo", "a.py", "a" * 40, "a")
+        cache.put("owner/repo", "b.py", "a" * 40, "b")
+        cache.get("owner/repo", "a.py", "a" * 40)
+        cache.put("owner/repo", "c.py", "a" * 40, "c")
+
+        assert cache.get("owner/repo", "a.py", "a" * 40) == "a"
+        assert cache.get("owner/repo", "b.py", "a" * 40) is None
+        assert cache.get("owner/repo", "c.py", "a" * 40) == "c"
+
+    def test_provider_fetches_once(self):
+        """Test that a provider downloads a file at a commit only once."""
+        provider = GitHubProvider(token="token")
+        provider.session.get = Mock(return_value=make_response(
+            {"content": base64.b64encode(b"x = 1\n").decode("ascii")}
+        ))
+
+        for _ in range(3):
+            assert provider.get_file_content("owner/repo", "a.py", "b" * 40) == "x = 1\n"
+        assert provider.session.get.call_count == 1
+
+
+class TestConditionalGet:
+    """Test cases for ETag revalidation of provider API responses."""
+
+    def test_not_modified_returns_stored_body(self):
+        """Test that a 304 answer is replaced by the body stored with the ETag."""
+        session = requests.Session()
+        session.get = Mock(side_effect=[
+            make_response({"title": "Cached"}, headers={"ETag": '"v1"'}),
+            make_response(None, status_code=304),
+        ])
+
+        first = conditional_get(session, "https://api.github.com/repos/o/r/pulls/1")
+        second = conditional_get(session, "https://api.github.com/repos/o/r/pulls/1")
+
+        assert first.json() == {"title": "Cached"}
+        assert second.status_code == 200
+        assert second.json() == {"title": "Cached"}
+        assert second.headers["ETag"] == '"v1"'
+        assert "If-None-Match" not in session.get.call_args_list[0].kwargs["headers"]
+        assert session.get.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+
+    def test_entries_are_private(self, cache_dir):
+        """Test that stored responses are readable by the current user only."""
+        session = requests.Session()
+        session.get = Mock(return_value=make_response({"content": "secret"}, headers={"ETag": '"v1"'}))
+        conditional_get(session, "https://api.github.com/repos/o/r/contents/a.py")
+
+        http_dir = os.path.join(cache_dir, "http")
+        for directory, _, names in os.walk(http_dir):
+            assert os.stat(directory).st_mode & 0o777 == 0o700
+            for name in names:
+                assert os.stat(os.path.join(directory, name)).st_mode & 0o777 == 0o600
+
+    def test_disabled(self, monkeypatch, cache_dir):
+        """Test that with the cache off nothing is stored or revalidated."""
+        monkeypatch.setattr(_http_cache, "HTTP_CACHE_ENABLED", False)
+        session = requests.Session()
+        session.get = Mock(return_value=make_response({"title": "Fresh"}, headers={"ETag": '"v1"'}))
+        for _ in range(2):
+            assert conditional_get(session, "https://api.github.com/repos/o/r/pulls/1").json() == {"title": "Fresh"}
+
+        assert not os.path.exists(os.path.join(cache_dir, "http"))
+        assert all(not call.kwargs["headers"] for call in session.get.call_args_list)
+
+    def test_cache_is_pruned(self, monkeypatch, cache_dir):
+        """Test that old responses are deleted once the cache outgrows its budget."""
+        monkeypatch.setattr(_http_cache, "HTTP_CACHE_BYTES", 1000)
+        monkeypatch.setattr(_http_cache, "_written", None)
+        session = requests.Session()
+        session.get = Mock(side_effect=[
+            make_response("x" * 300, headers={"ETag": f'"{number}"'}) for number in range(20)
+        ])
+        for number in range(20):
+            conditional_get(session, f"https://api.github.com/repos/o/r/pulls/{number}")
+
+        sizes = [
+            os.path.getsize(os.path.join(directory, name))
+            for directory, _, names in os.walk(os.path.join(cache_dir, "http")) for name in names
+        ]
+        # Pruned after every quarter of the budget written, so it overshoots by at most that
+        assert sum(sizes) <= 1000 + 1000 // 4 + max(sizes)
+        assert len(sizes) < 20
+
+
+class TestGitHubProvider:
+    """Test cases for GitHubProvider with a mocked session."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.provider = GitHubProvider(token="token")
+        # Real session headers, fake requests
+        self.provider.session.get = Mock()
+        self.provider.session.post = Mock()
+
+    def test_get_pr_files_follows_pages(self):
+        """Test that every page of the file listing is fetched."""
+        base = "https://api.github.com/repos/owner/repo/pulls/7/files"
+        pages = {
+            None: make_response([{"filename": f"a{i}.py"} for i in range(100)],
+                                {"Link": f'<{base}?per_page=100&page=2>; rel="next"'}),
+            f"{base}?per_page=100&page=2": make_response([{"filename": "b.py"}]),
+        }
+        self.provider.session.get.side_effect = lambda url, params=None, headers=None: pages[
+            None if params else url
+        ]
+
+        files = self.provider.get_pr_files("owner/repo", 7)
+
+        assert len(files) == 101
+        assert files[-1] == "b.py"
+        first_call = self.provider.session.get.call_args_list[0]
+        assert first_call.kwargs["params"] == {"per_page": str(github.PAGE_LENGTH)}
+
+    def test_get_pr_infos_graphql(self):
+        """Test batched GraphQL lookups, completing long file lists over REST."""
+        long_paths = [f"src/f{i}.py" for i in range(github.GRAPHQL_FILES)]
+        self.provider.session.post.return_value = make_response({"data": {"repository": {
+            "pr0": graphql_pr(1, ["README.md"], False),
+            "pr1": graphql_pr(2, long_paths, True),
+        }}})
+        rest_paths = long_paths + ["src/last.py"]
+        self.provider.session.get.return_value = make_response([{"filename": path} for path in rest_paths])
+
+        first, second = self.provider.get_pr_infos("owner/repo", [1, 2])
+
+        query = self.provider.session.post.call_args.kwargs["json"]
+        assert query["variables"] == {"owner": "owner", "name": "repo"}
+        assert self.provider.session.post.call_args.args[0] == "https://api.github.com/graphql"
+        assert (first.number, first.author, first.description) == (1, "ghost", "")
+        assert first.files_changed == ["README.md"]
+        assert second.commits == 2
+        assert second.files_changed == rest_paths
+
+
+class TestBitbucketProvider:
+    """Test cases for BitbucketProvider pagination with a mocked session."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.provider = BitbucketProvider()
+        self.provider.session.get = Mock()
+        self.api = "https://api.bitbucket.org/2.0/repositories/owner/repo/pullrequests/7"
+
+    def serve(self, pages):
+        """Answer each URL with its page; the first request is the one sent with params."""
+        self.provider.session.get.side_effect = lambda url, params=None: make_response(pages[url])
+
+    def test_get_pr_files_follows_next(self):
+        """Test that every diffstat page is read and deleted files are skipped."""
+        self.serve({
+            f"{self.api}/diffstat": {
+                "values": [{"new": {"path": "a.py"}}, {"new": None}],
+                "next": f"{self.api}/diffstat?page=2",
+            },
+            f"{self.api}/diffstat?page=2": {"values": [{"new": {"path": "b.py"}}]},
+        })
+
+        assert self.provider.get_pr_files("owner/repo", 7) == ["a.py", "b.py"]
+        calls = self.provider.session.get.call_args_list
+        assert calls[0].kwargs["params"]["pagelen"] == bitbucket.PAGE_LENGTH
+        # The next link already carries the query parameters
+        assert calls[1].kwargs["params"] is None
+
+    def test_commit_count(self):
+        """Test that commits are counted from the size, or across pages without one."""
+        commit_pages = {
+            f"{self.api}/commits": {"values": [{"hash": "1"}, {"hash": "2"}], "next": f"{self.api}/commits?page=2"},
+            f"{self.api}/commits?page=2": {"values": [{"hash": "3"}]},
+        }
+        self.serve(commit_pages)
+        assert self.provider._get_commit_count("owner/repo", 7) == 3
+        assert [commit["hash"] for commit in self.provider.get_commits("owner/repo", 7)] == ["1", "2", "3"]
+
+        self.serve({f"{self.api}/commits": {"size": 42, "values": []}})
+        assert self.provider._get_commit_count("owner/repo", 7) == 42
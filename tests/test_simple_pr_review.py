@@ -0,0 +1,124 @@
+"""Tests for the dependency-free simple_pr_review module."""
+
+import os
+
+import pytest
+import simple_pr_review
+from simple_pr_review import analyze_file, analyze_files, count_lines, read_source
+
+
+class TestAnalyzeFile:
+    """Test cases for analyze_file and analyze_files."""
+
+    def test_cached_issues_are_copies(self):
+        """Test that changing returned issues does not change later results."""
+        issues = analyze_file("copies.py", "print('hi')\n")
+        issues[0].message = "Changed"
+        issues.clear()
+
+        again = analyze_file("copies.py", "print('hi')\n")
+        assert [issue.message for issue in again] == ["Debug print statement found"]
+
+    def test_analyze_files_in_worker_processes(self, monkeypatch):
+        """Test that a parallel batch matches file-by-file analysis."""
+        monkeypatch.setattr(simple_pr_review, "PARALLEL_MIN_CHARS", 0)
+        files = {f"module{i}.py": "x = 1\nprint(x)  # TODO\n" * (i + 1) for i in range(4)}
+        files["copy.py"] = files["module2.py"]
+
+        results = analyze_files(files)
+
+        assert list(results) == list(files)
+        for path, content in files.items():
+            expected = [(issue.line_number, issue.message) for issue in analyze_file(path, content)]
+            assert [(issue.line_number, issue.message) for issue in results[path]] == expected
+            assert {issue.file_path for issue in results[path]} == {path}
+
+
+class TestDiskCache:
+    """Results for large files are kept on disk across runs."""
+
+    SOURCE = "x = 1\nprint(x)  # TODO\n"
+
+    def entries(self):
+        """Paths of the stored entries."""
+        return [
+            os.path.join(directory, name)
+            for directory, _, names in os.walk(simple_pr_review.CACHE_DIR) for name in names
+        ]
+
+    def rerun(self, monkeypatch):
+        """Analyze SOURCE again as a new process would, counting analyzer runs."""
+        runs = []
+        analyze = simple_pr_review.SimpleCodeAnalyzer.analyze
+
+        def counting_analyze(analyzer, file_path, content):
+            runs.append(file_path)
+            return analyze(analyzer, file_path, content)
+
+        simple_pr_review._analysis_cache.clear()
+        monkeypatch.setattr(simple_pr_review.SimpleCodeAnalyzer, "analyze", counting_analyze)
+        issues = analyze_file("other.py", self.SOURCE)
+        return issues, runs
+
+    def test_large_files_are_stored(self, monkeypatch):
+        """Test that a large file's issues are read back from disk under a new path."""
+        monkeypatch.setattr(simple_pr_review, "DISK_CACHE_MIN_CHARS", len(self.SOURCE))
+        first = analyze_file("big.py", self.SOURCE)
+        assert len(self.entries()) == 1
+
+        issues, runs = self.rerun(monkeypatch)
+        assert runs == []
+        assert [(issue.file_path, issue.line_number, issue.message) for issue in issues] == [
+            ("other.py", issue.line_number, issue.message) for issue in first
+        ]
+
+    def test_small_files_are_not_stored(self):
+        """Test that files below the size threshold stay in memory only."""
+        analyze_file("small.py", self.SOURCE)
+        assert self.entries() == []
+
+    def test_corrupt_entry_is_a_miss(self, monkeypatch):
+        """Test that an unreadable entry is re-analyzed and rewritten."""
+        monkeypatch.setattr(simple_pr_review, "DISK_CACHE_MIN_CHARS", len(self.SOURCE))
+        analyze_file("big.py", self.SOURCE)
+        for garbage in ("{not json", "[[1, 2]]"):
+            with open(self.entries()[0], "w") as entry:
+                entry.write(garbage)
+
+            issues, runs = self.rerun(monkeypatch)
+            assert runs == ["other.py"]
+            assert len(issues) == 2
+
+
+class TestCountLines:
+    """Test cases for count_lines."""
+
+    def test_counts(self):
+        """Test total and non-blank line counts, with whitespace-only lines blank."""
+        assert count_lines("a = 1\n\n   \n\tb = 2\n") == (5, 2)
+
+    def test_matches_line_loop(self):
+        """Test that the counts match counting split lines one by one."""
+        for content in ["", "x", "x\n", "\n\n", " \t\n\u00a0\nx\r\ny", "a\n  \nb\n\n"]:
+            lines = content.split("\n")
+            assert count_lines(content) == (len(lines), sum(1 for line in lines if line.strip()))
+
+
+class TestReadSource:
+    """Test cases for read_source."""
+
+    def test_matches_text_mode(self, tmp_path):
+        """Test that the content equals a universal-newlines text mode read."""
+        path = tmp_path / "mixed.py"
+        path.write_bytes("# caf\u00e9\r\nx = 1\ry = 2\n\r\n".encode("utf-8"))
+
+        with open(path, encoding="utf-8") as text_file:
+            expected = text_file.read()
+        assert read_source(str(path)) == expected == "# caf\u00e9\nx = 1\ny = 2\n\n"
+
+    def test_invalid_utf8(self, tmp_path):
+        """Test that undecodable files raise like a text mode read does."""
+        path = tmp_path / "latin1.py"
+        path.write_bytes(b"# caf\xe9\n")
+        with pytest.raises(UnicodeDecodeError):
+            read_source(str(path))